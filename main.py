@@ -71,6 +71,10 @@ def main():
         
         logger.info("主界面已启动")
         
+        # 主界面显示后在后台预加载运动学库，首次使用运动学功能时无需等待导入
+        from core.lazy_kinematics import preload_kinematics_async
+        preload_kinematics_async()
+        
         # 运行应用程序
         exit_code = app.exec_()
         
@@ -0,0 +1,59 @@
+"""
+示教序列数值内核
+
+功能：
+- 关键帧位置矩阵 (N, 关节数) 的逐关节移动平均平滑
+- 安装numba时按关节并行编译执行，否则使用NumPy前缀和实现
+"""
+
+import numpy as np
+
+from utils.numba_compat import njit, prange, NUMBA_AVAILABLE
+
+
+@njit(parallel=True, cache=True)
+def _smooth_columns_jit(P, half_window):
+    """逐列居中移动平均（边界处窗口截断），各关节并行"""
+    n, m = P.shape
+    out = np.empty_like(P)
+    for j in prange(m):
+        for i in range(n):
+            lo = max(0, i - half_window)
+            hi = min(n, i + half_window + 1)
+            acc = 0.0
+            for k in range(lo, hi):
+                acc += P[k, j]
+            out[i, j] = acc / (hi - lo)
+    return out
+
+
+def _smooth_columns_numpy(P: np.ndarray, half_window: int) -> np.ndarray:
+    """逐列居中移动平均的NumPy实现（前缀和，一次处理全部关节）"""
+    n = P.shape[0]
+    csum = np.zeros((n + 1, P.shape[1]), dtype=np.float64)
+    np.cumsum(P, axis=0, out=csum[1:])
+    idx = np.arange(n)
+    lo = np.maximum(idx - half_window, 0)
+    hi = np.minimum(idx + half_window + 1, n)
+    return (csum[hi] - csum[lo]) / (hi - lo)[:, None]
+
+
+def smooth_moving_average(P: np.ndarray, window_size: int) -> np.ndarray:
+    """
+    对位置矩阵逐关节做移动平均
+
+    Args:
+        P: 位置矩阵，形状 (N, 关节数)
+        window_size: 窗口大小，<=1 时不平滑
+
+    Returns:
+        平滑后的 float64 矩阵，形状与 P 相同
+    """
+    P = np.ascontiguousarray(P, dtype=np.float64)
+    if window_size <= 1 or P.shape[0] == 0:
+        return P.copy()
+
+    half_window = window_size // 2
+    if NUMBA_AVAILABLE:
+        return _smooth_columns_jit(P, half_window)
+    return _smooth_columns_numpy(P, half_window)
@@ -335,6 +335,7 @@ class ScriptEngine:
             'QUINTIC': InterpolationType.QUINTIC,
             'TRAPEZOIDAL': InterpolationType.TRAPEZOIDAL,
             'S_CURVE': InterpolationType.S_CURVE,
+            'NATURAL_SPLINE': InterpolationType.NATURAL_SPLINE,
         }
     
     def _safe_print(self, *args, **kwargs):
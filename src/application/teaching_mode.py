@@ -12,21 +12,116 @@
 - 高级示教数据管理
 """
 
+import re
+import sys
 import time
 import json
 import numpy as np
+from scipy import interpolate
 from typing import List, Dict, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 from pathlib import Path
 from enum import Enum
 
+try:
+    import msgpack  # 可选依赖：二进制序列格式
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+try:
+    import orjson  # 可选依赖：更快的JSON编解码
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 from utils.logger import get_logger, log_performance
 from utils.config_manager import get_config_manager
 from utils.message_bus import get_message_bus, Topics, MessagePriority
 from core.trajectory_planner import get_trajectory_planner, InterpolationType, TrajectoryConstraints
+from application._sequence_kernels import smooth_moving_average
 
 logger = get_logger(__name__)
 
+# 关键帧示教模式标签（驻留字符串，所有关键帧共享同一对象）
+_MODE_DRAG = sys.intern("drag_teaching")
+_MODE_POS = sys.intern("position_recording")
+_MODE_AUTO = sys.intern("auto_recording")
+_MODE_MANUAL = sys.intern("manual")
+_MODE_INTERP = sys.intern("interpolated")
+_MODE_IMPORTED = sys.intern("imported")
+
+# 10个关节全部激活时的位掩码
+_ALL_JOINTS_MASK = (1 << 10) - 1
+
+# CSV导入/导出列名（顺序: 时间戳、名称、10个位置、10个速度、10个电流）
+_CSV_POS_COLUMNS = tuple(f'joint_{i}_pos' for i in range(10))
+_CSV_VEL_COLUMNS = tuple(f'joint_{i}_vel' for i in range(10))
+_CSV_CUR_COLUMNS = tuple(f'joint_{i}_cur' for i in range(10))
+_CSV_HEADERS = ('timestamp', 'name') + _CSV_POS_COLUMNS + _CSV_VEL_COLUMNS + _CSV_CUR_COLUMNS
+
+# 关键帧数值通道的存储精度：位置为编码器原始值，电流为协议中的16位无符号mA值
+# （超出int16范围，故用int32），速度保留float32即可
+_POS_DTYPE = np.int32
+_VEL_DTYPE = np.float32
+_CUR_DTYPE = np.int32
+
+
+def _joints_from_mask(mask: int) -> List[int]:
+    """将关节位掩码展开为关节ID列表"""
+    return [i for i in range(10) if (mask >> i) & 1]
+
+
+def _readonly_view(view: np.ndarray) -> np.ndarray:
+    """将切片视图标记为只读（仅影响该视图，底层连续存储仍可写）"""
+    view.setflags(write=False)
+    return view
+
+
+# 运动/速度控制器实例：首次使用时导入并缓存（避免导入期加载硬件相关模块）
+_motion_controller = None
+_velocity_controller = None
+
+
+def _get_motion_controller():
+    """获取并缓存全局运动控制器实例"""
+    global _motion_controller
+    if _motion_controller is None:
+        from core.motion_controller import get_motion_controller
+        _motion_controller = get_motion_controller()
+    return _motion_controller
+
+
+def _get_velocity_controller():
+    """获取并缓存全局速度控制器实例"""
+    global _velocity_controller
+    if _velocity_controller is None:
+        from core.velocity_controller import get_velocity_controller
+        _velocity_controller = get_velocity_controller()
+    return _velocity_controller
+
+
+# 序列文件开头是 "meta" 元数据块，list_sequences 只读取并解析文件头部
+_META_HEAD_BYTES = 2048
+_META_HEAD_RE = re.compile(r'\s*\{\s*"meta"\s*:\s*')
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _dumps_json(obj: Any) -> bytes:
+    """序列化为UTF-8 JSON字节（安装orjson时使用orjson）"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _loads_json(payload: bytes) -> Any:
+    """解析UTF-8 JSON字节（安装orjson时使用orjson）"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
 
 class TeachingState(Enum):
     """示教状态"""
@@ -45,7 +140,7 @@ class TeachingMode(Enum):
     KEYFRAME_EDITING = "keyframe_editing"     # 关键帧编辑
 
 
-@dataclass
+@dataclass(slots=True)
 class KeyFrame:
     """关键帧"""
     timestamp: float
@@ -60,13 +155,26 @@ class KeyFrame:
     teaching_mode: Optional[str] = None            # 示教模式
     
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
-        return asdict(self)
+        """转换为字典（列表字段共享引用，不做深拷贝）"""
+        return {
+            'timestamp': self.timestamp,
+            'positions': self.positions,
+            'velocities': self.velocities,
+            'currents': self.currents,
+            'name': self.name,
+            'description': self.description,
+            'joint_stiffness': self.joint_stiffness,
+            'force_feedback': self.force_feedback,
+            'teaching_mode': self.teaching_mode
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'KeyFrame':
         """从字典创建"""
-        return cls(**data)
+        keyframe = cls(**data)
+        if keyframe.teaching_mode:
+            keyframe.teaching_mode = sys.intern(keyframe.teaching_mode)
+        return keyframe
     
     def copy(self) -> 'KeyFrame':
         """创建副本"""
@@ -106,11 +214,11 @@ class KeyFrame:
             velocities=interp_velocities,
             currents=self.currents.copy(),  # 电流不插值
             name=f"插值_{ratio:.2f}",
-            teaching_mode="interpolated"
+            teaching_mode=_MODE_INTERP
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class TeachingSequence:
     """示教序列"""
     name: str
@@ -124,6 +232,15 @@ class TeachingSequence:
     optimization_level: int = 0                    # 优化级别 (0-3)
     smoothness_factor: float = 1.0                 # 平滑因子
     velocity_scaling: float = 1.0                  # 速度缩放
+    # 回放插值器缓存（关键帧变更后失效）
+    _interp_pos: Optional[Any] = field(default=None, init=False, repr=False, compare=False)
+    _interp_vel: Optional[Any] = field(default=None, init=False, repr=False, compare=False)
+    # 数值通道的连续存储（SoA，容量倍增）；_buf_count < 0 表示需按关键帧重建
+    _buf_t: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _buf_pos: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _buf_vel: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _buf_cur: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _buf_count: int = field(default=-1, init=False, repr=False, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -157,16 +274,308 @@ class TeachingSequence:
             velocity_scaling=data.get('velocity_scaling', 1.0)
         )
     
+    def to_msgpack(self) -> bytes:
+        """
+        序列化为MessagePack二进制格式
+        
+        位置/速度/电流/时间戳按小端 int32/float64 打包成连续二进制块，
+        加载时可直接用 np.frombuffer 还原，比JSON文本数组更小、更快。
+        """
+        if msgpack is None:
+            raise RuntimeError("msgpack未安装，无法使用二进制序列格式")
+        
+        keyframes = self.keyframes
+        count = len(keyframes)
+        joints = len(keyframes[0].positions) if keyframes else 10
+        
+        return msgpack.packb({
+            'format_version': 1,
+            'name': self.name,
+            'description': self.description,
+            'created_at': self.created_at,
+            'modified_at': self.modified_at,
+            'metadata': self.metadata or {},
+            'teaching_mode_type': self.teaching_mode_type,
+            'optimization_level': self.optimization_level,
+            'smoothness_factor': self.smoothness_factor,
+            'velocity_scaling': self.velocity_scaling,
+            'count': count,
+            'joints': joints,
+            'timestamps': np.array([kf.timestamp for kf in keyframes], dtype='<f8').tobytes(),
+            'positions': np.array([kf.positions for kf in keyframes], dtype='<i4').tobytes(),
+            'velocities': np.array([kf.velocities for kf in keyframes], dtype='<f8').tobytes(),
+            'currents': np.array([kf.currents for kf in keyframes], dtype='<i4').tobytes(),
+            'names': [kf.name for kf in keyframes],
+            'descriptions': [kf.description for kf in keyframes],
+            'teaching_modes': [kf.teaching_mode for kf in keyframes],
+            'joint_stiffness': [kf.joint_stiffness for kf in keyframes],
+            'force_feedback': [kf.force_feedback for kf in keyframes]
+        }, use_bin_type=True)
+    
+    @classmethod
+    def from_msgpack(cls, payload: bytes) -> 'TeachingSequence':
+        """从MessagePack二进制数据创建"""
+        if msgpack is None:
+            raise RuntimeError("msgpack未安装，无法使用二进制序列格式")
+        
+        data = msgpack.unpackb(payload, raw=False)
+        count = data['count']
+        shape = (count, data['joints'])
+        
+        timestamps = np.frombuffer(data['timestamps'], dtype='<f8').tolist()
+        positions = np.frombuffer(data['positions'], dtype='<i4').reshape(shape).tolist()
+        velocities = np.frombuffer(data['velocities'], dtype='<f8').reshape(shape).tolist()
+        currents = np.frombuffer(data['currents'], dtype='<i4').reshape(shape).tolist()
+        
+        keyframes = [
+            KeyFrame(
+                timestamp=timestamps[i],
+                positions=positions[i],
+                velocities=velocities[i],
+                currents=currents[i],
+                name=data['names'][i],
+                description=data['descriptions'][i],
+                joint_stiffness=data['joint_stiffness'][i],
+                force_feedback=data['force_feedback'][i],
+                teaching_mode=sys.intern(data['teaching_modes'][i]) if data['teaching_modes'][i] else None
+            )
+            for i in range(count)
+        ]
+        
+        return cls(
+            name=data['name'],
+            description=data['description'],
+            keyframes=keyframes,
+            created_at=data['created_at'],
+            modified_at=data['modified_at'],
+            metadata=data.get('metadata', {}),
+            teaching_mode_type=data.get('teaching_mode_type'),
+            optimization_level=data.get('optimization_level', 0),
+            smoothness_factor=data.get('smoothness_factor', 1.0),
+            velocity_scaling=data.get('velocity_scaling', 1.0)
+        )
+
+    def save_npz(self, filepath) -> None:
+        """
+        以压缩的NumPy归档格式保存
+        
+        数值通道由关键帧列表直接构建（整数为int64，含小数为float64），不经过
+        窄类型的连续存储，保证与JSON一样无损往返；名称等非数值字段以JSON字符串
+        单独存放，加载时无需 allow_pickle。
+        """
+        header = {
+            'format_version': 1,
+            'name': self.name,
+            'description': self.description,
+            'created_at': self.created_at,
+            'modified_at': self.modified_at,
+            'metadata': self.metadata or {},
+            'teaching_mode_type': self.teaching_mode_type,
+            'optimization_level': self.optimization_level,
+            'smoothness_factor': self.smoothness_factor,
+            'velocity_scaling': self.velocity_scaling,
+            'names': [kf.name for kf in self.keyframes],
+            'descriptions': [kf.description for kf in self.keyframes],
+            'teaching_modes': [kf.teaching_mode for kf in self.keyframes],
+            'joint_stiffness': [kf.joint_stiffness for kf in self.keyframes],
+            'force_feedback': [kf.force_feedback for kf in self.keyframes]
+        }
+        
+        np.savez_compressed(
+            filepath,
+            header=np.array(json.dumps(header, ensure_ascii=False)),
+            timestamps=np.array([kf.timestamp for kf in self.keyframes], dtype=np.float64),
+            positions=np.array([kf.positions for kf in self.keyframes]),
+            velocities=np.array([kf.velocities for kf in self.keyframes], dtype=np.float64),
+            currents=np.array([kf.currents for kf in self.keyframes])
+        )
+        
+    @classmethod
+    def load_npz(cls, filepath) -> 'TeachingSequence':
+        """从压缩的NumPy归档创建"""
+        with np.load(filepath, allow_pickle=False) as archive:
+            header = json.loads(archive['header'].item())
+            timestamps = archive['timestamps'].tolist()
+            positions = archive['positions'].tolist()
+            velocities = archive['velocities'].tolist()
+            currents = archive['currents'].tolist()
+        
+        keyframes = [
+            KeyFrame(
+                timestamp=timestamps[i],
+                positions=positions[i],
+                velocities=velocities[i],
+                currents=currents[i],
+                name=header['names'][i],
+                description=header['descriptions'][i],
+                joint_stiffness=header['joint_stiffness'][i],
+                force_feedback=header['force_feedback'][i],
+                teaching_mode=sys.intern(header['teaching_modes'][i]) if header['teaching_modes'][i] else None
+            )
+            for i in range(len(timestamps))
+        ]
+        
+        return cls(
+            name=header['name'],
+            description=header['description'],
+            keyframes=keyframes,
+            created_at=header['created_at'],
+            modified_at=header['modified_at'],
+            metadata=header.get('metadata', {}),
+            teaching_mode_type=header.get('teaching_mode_type'),
+            optimization_level=header.get('optimization_level', 0),
+            smoothness_factor=header.get('smoothness_factor', 1.0),
+            velocity_scaling=header.get('velocity_scaling', 1.0)
+        )
+        
+    def mark_modified(self):
+        """标记序列已修改：更新修改时间，使回放插值器和连续数组缓存失效"""
+        self._touch()
+        self._buf_count = -1
+    
+    def _touch(self):
+        """更新修改时间并使回放插值器缓存失效（追加关键帧时连续数组增量更新，无需重建）"""
+        self.modified_at = time.time()
+        self._interp_pos = None
+        self._interp_vel = None
+    
     def add_keyframe(self, keyframe: KeyFrame):
         """添加关键帧"""
         self.keyframes.append(keyframe)
-        self.modified_at = time.time()
+        self._touch()
+        self._append_to_buffers([keyframe])
+    
+    def add_keyframes_bulk(self, keyframes: List[KeyFrame]):
+        """批量添加关键帧（整批只更新一次修改时间）"""
+        self.keyframes.extend(keyframes)
+        self._touch()
+        self._append_to_buffers(keyframes)
+    
+    def record_state(self, timestamp: float, positions: np.ndarray, velocities: np.ndarray,
+                     currents: np.ndarray, force_feedback: Optional[np.ndarray] = None,
+                     name: Optional[str] = None, description: Optional[str] = None,
+                     teaching_mode: Optional[str] = None) -> KeyFrame:
+        """
+        以状态数组追加关键帧
+        
+        状态数组直接写入连续存储的下一行（行赋值即拷贝到预分配内存，调用方
+        无需先 .copy()）；KeyFrame 仅为对外接口生成列表字段。
+        
+        Returns:
+            新追加的关键帧
+        """
+        keyframe = KeyFrame(
+            timestamp=timestamp,
+            positions=positions.tolist(),
+            velocities=velocities.tolist(),
+            currents=currents.tolist(),
+            name=name,
+            description=description,
+            force_feedback=force_feedback.tolist() if force_feedback is not None else None,
+            teaching_mode=teaching_mode
+        )
+        
+        row = self._ensure_buffers()
+        self.keyframes.append(keyframe)
+        self._touch()
+        
+        try:
+            if row == len(self._buf_t):
+                self._allocate_buffers(2 * row, self._buf_pos.shape[1])
+            self._buf_t[row] = timestamp
+            self._buf_pos[row] = positions
+            self._buf_vel[row] = velocities
+            self._buf_cur[row] = currents
+            self._buf_count = row + 1
+        except ValueError:
+            # 关节数与已有关键帧不一致：下次访问时整体重建
+            self._buf_count = -1
+        
+        return keyframe
+    
+    def timestamps_array(self) -> np.ndarray:
+        """全部关键帧时间戳 (N,)，返回连续存储的只读视图"""
+        count = self._ensure_buffers()
+        return _readonly_view(self._buf_t[:count])
+    
+    def positions_array(self) -> np.ndarray:
+        """全部关键帧位置 (N, 10)，返回连续存储的只读视图"""
+        count = self._ensure_buffers()
+        return _readonly_view(self._buf_pos[:count])
+    
+    def velocities_array(self) -> np.ndarray:
+        """全部关键帧速度 (N, 10)，返回连续存储的只读视图"""
+        count = self._ensure_buffers()
+        return _readonly_view(self._buf_vel[:count])
+    
+    def currents_array(self) -> np.ndarray:
+        """全部关键帧电流 (N, 10)，返回连续存储的只读视图"""
+        count = self._ensure_buffers()
+        return _readonly_view(self._buf_cur[:count])
+    
+    def _ensure_buffers(self) -> int:
+        """确保连续数组与关键帧列表一致，必要时整体重建，返回有效行数"""
+        if self._buf_count >= 0:
+            return self._buf_count
+        
+        count = len(self.keyframes)
+        joints = len(self.keyframes[0].positions) if count else 10
+        self._allocate_buffers(max(16, 1 << max(count - 1, 0).bit_length()), joints)
+        
+        if count:
+            self._buf_t[:count] = [kf.timestamp for kf in self.keyframes]
+            self._buf_pos[:count] = [kf.positions for kf in self.keyframes]
+            self._buf_vel[:count] = [kf.velocities for kf in self.keyframes]
+            self._buf_cur[:count] = [kf.currents for kf in self.keyframes]
+        
+        self._buf_count = count
+        return count
+    
+    def _allocate_buffers(self, capacity: int, joints: int):
+        """按容量分配连续数组，保留已有的有效行"""
+        count = max(self._buf_count, 0)
+        buf_t = np.empty(capacity, dtype=np.float64)
+        buf_pos = np.empty((capacity, joints), dtype=_POS_DTYPE)
+        buf_vel = np.empty((capacity, joints), dtype=_VEL_DTYPE)
+        buf_cur = np.empty((capacity, joints), dtype=_CUR_DTYPE)
+        
+        if count:
+            buf_t[:count] = self._buf_t[:count]
+            buf_pos[:count] = self._buf_pos[:count]
+            buf_vel[:count] = self._buf_vel[:count]
+            buf_cur[:count] = self._buf_cur[:count]
+        
+        self._buf_t, self._buf_pos, self._buf_vel, self._buf_cur = buf_t, buf_pos, buf_vel, buf_cur
+    
+    def _append_to_buffers(self, keyframes: List[KeyFrame]):
+        """把新追加的关键帧写入连续数组末尾（数组尚未建立时留待首次访问重建）"""
+        count = self._buf_count
+        if count < 0:
+            return
+        
+        new_count = count + len(keyframes)
+        capacity = len(self._buf_t)
+        if new_count > capacity:
+            while capacity < new_count:
+                capacity *= 2
+            self._allocate_buffers(capacity, self._buf_pos.shape[1])
+        
+        try:
+            for row, kf in enumerate(keyframes, start=count):
+                self._buf_t[row] = kf.timestamp
+                self._buf_pos[row] = kf.positions
+                self._buf_vel[row] = kf.velocities
+                self._buf_cur[row] = kf.currents
+            self._buf_count = new_count
+        except (TypeError, ValueError):
+            # 关节数不一致等异常数据：放弃增量更新，下次访问时整体重建
+            self._buf_count = -1
     
     def insert_keyframe(self, index: int, keyframe: KeyFrame) -> bool:
         """在指定位置插入关键帧"""
         if 0 <= index <= len(self.keyframes):
             self.keyframes.insert(index, keyframe)
-            self.modified_at = time.time()
+            self.mark_modified()
             return True
         return False
     
@@ -174,7 +583,7 @@ class TeachingSequence:
         """更新关键帧"""
         if 0 <= index < len(self.keyframes):
             self.keyframes[index] = keyframe
-            self.modified_at = time.time()
+            self.mark_modified()
             return True
         return False
     
@@ -182,7 +591,7 @@ class TeachingSequence:
         """删除关键帧"""
         if 0 <= index < len(self.keyframes):
             self.keyframes.pop(index)
-            self.modified_at = time.time()
+            self.mark_modified()
             return True
         return False
     
@@ -211,6 +620,51 @@ class TeachingSequence:
         else:
             return self.keyframes[-1]
     
+    def build_playback_interpolator(self) -> bool:
+        """
+        构建整段回放用的批量插值器
+        
+        插值器按关键帧一次性构建并缓存，之后可在整组时间点上一次求值，
+        无需逐点调用 get_keyframe_at_time。关键帧变更后缓存自动失效。
+        
+        Returns:
+            是否构建成功（关键帧少于2个时无法构建）
+        """
+        if self._interp_pos is not None:
+            return True
+        if len(self.keyframes) < 2:
+            return False
+        
+        timestamps = self.timestamps_array()
+        positions = self.positions_array()
+        velocities = self.velocities_array()
+        
+        # 超出时间范围时保持首/尾关键帧，与 get_keyframe_at_time 行为一致
+        self._interp_pos = interpolate.interp1d(
+            timestamps, positions, axis=0, kind='linear', assume_sorted=True,
+            bounds_error=False, fill_value=(positions[0], positions[-1])
+        )
+        self._interp_vel = interpolate.interp1d(
+            timestamps, velocities, axis=0, kind='linear', assume_sorted=True,
+            bounds_error=False, fill_value=(velocities[0], velocities[-1])
+        )
+        return True
+    
+    def sample_playback(self, timestamps) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        在一组时间点上批量采样位置和速度
+        
+        Args:
+            timestamps: 时间点数组
+            
+        Returns:
+            (positions, velocities)，形状均为 (N, 10)；关键帧不足时返回None
+        """
+        if not self.build_playback_interpolator():
+            return None
+        t = np.asarray(timestamps, dtype=np.float64)
+        return self._interp_pos(t), self._interp_vel(t)
+    
     def optimize_trajectory(self, optimization_level: int = 1) -> bool:
         """优化轨迹"""
         if len(self.keyframes) < 3:
@@ -228,7 +682,7 @@ class TeachingSequence:
                 self._optimize_velocities()
             
             self.optimization_level = optimization_level
-            self.modified_at = time.time()
+            self.mark_modified()
             return True
             
         except Exception as e:
@@ -265,15 +719,13 @@ class TeachingSequence:
         if len(self.keyframes) < 3:
             return
         
-        # 使用移动平均平滑位置
+        # 使用移动平均平滑位置（全部关节一次处理）
         window_size = min(3, len(self.keyframes) // 2)
         
-        for joint_idx in range(10):  # 10个关节
-            positions = [kf.positions[joint_idx] for kf in self.keyframes]
-            smoothed_positions = self._moving_average(positions, window_size)
-            
-            for i, smoothed_pos in enumerate(smoothed_positions):
-                self.keyframes[i].positions[joint_idx] = int(smoothed_pos)
+        smoothed = np.trunc(smooth_moving_average(self.positions_array(), window_size)).astype(np.int64)
+        
+        for kf, row in zip(self.keyframes, smoothed.tolist()):
+            kf.positions[:] = row
         
         logger.info("轨迹平滑处理完成")
     
@@ -295,22 +747,6 @@ class TeachingSequence:
                     curr_kf.velocities[joint_idx] = velocity * self.velocity_scaling
         
         logger.info("速度优化完成")
-    
-    def _moving_average(self, data: List[float], window_size: int) -> List[float]:
-        """移动平均"""
-        if window_size <= 1:
-            return data
-        
-        smoothed = []
-        half_window = window_size // 2
-        
-        for i in range(len(data)):
-            start_idx = max(0, i - half_window)
-            end_idx = min(len(data), i + half_window + 1)
-            window_data = data[start_idx:end_idx]
-            smoothed.append(sum(window_data) / len(window_data))
-        
-        return smoothed
 
 
 class TeachingModeManager:
@@ -341,20 +777,25 @@ class TeachingModeManager:
         # 数据存储
         self.sequences_dir = Path("data/sequences")
         self.sequences_dir.mkdir(parents=True, exist_ok=True)
+        self._sequence_meta_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}  # 文件名 -> ((mtime_ns, 文件大小), 摘要)
         
         # 备份目录
         self.backup_dir = Path("data/sequences/backup")
         self.backup_dir.mkdir(parents=True, exist_ok=True)
         
         # 当前机器人状态
-        self.current_positions = [1500] * 10
-        self.current_velocities = [0.0] * 10
-        self.current_currents = [0] * 10
-        self.current_forces = [0.0] * 10  # 力传感器数据
+        self.current_positions = np.full(10, 1500, dtype=np.int32)
+        self.current_velocities = np.zeros(10, dtype=np.float64)
+        self.current_currents = np.zeros(10, dtype=np.int32)
+        self.current_forces = np.zeros(10, dtype=np.float64)  # 力传感器数据
         
         # 拖拽示教状态
-        self.drag_start_positions = [1500] * 10
-        self.drag_active_joints = set()  # 激活的拖拽关节
+        self.drag_start_positions = np.full(10, 1500, dtype=np.int32)
+        self.drag_active_mask: int = 0  # 激活的拖拽关节（位掩码，bit i 对应关节 i）
+        
+        # 自上一关键帧以来各关节的带符号累计位置变化（状态回调中增量更新，录制关键帧后清零）
+        # 按关节累计净位移而非逐次累加|Δ|，静止时的编码器抖动相互抵消，不会触发录制
+        self._pos_delta_since_last_keyframe = np.zeros(10, dtype=np.int64)
         
         # 订阅机器人状态更新
         self.message_bus.subscribe(Topics.ROBOT_STATE, self._on_robot_state_update)
@@ -412,27 +853,27 @@ class TeachingModeManager:
                 keyframes=[],
                 created_at=time.time(),
                 modified_at=time.time(),
-                teaching_mode_type="drag_teaching"
+                teaching_mode_type=_MODE_DRAG
             )
             
             # 设置激活关节
             if active_joints is None:
-                self.drag_active_joints = set(range(10))  # 全部关节
+                self.drag_active_mask = _ALL_JOINTS_MASK  # 全部关节
             else:
-                self.drag_active_joints = set(active_joints)
+                mask = 0
+                for joint_id in active_joints:
+                    if 0 <= joint_id < 10:
+                        mask |= 1 << joint_id
+                self.drag_active_mask = mask
             
             # 记录起始位置
             self.drag_start_positions = self.current_positions.copy()
             
-            start_keyframe = KeyFrame(
-                timestamp=0.0,
-                positions=self.current_positions.copy(),
-                velocities=self.current_velocities.copy(),
-                currents=self.current_currents.copy(),
-                name="拖拽起始位置",
-                teaching_mode="drag_teaching"
+            self._record_current_state(
+                0.0,
+                "拖拽起始位置",
+                _MODE_DRAG
             )
-            self.current_sequence.add_keyframe(start_keyframe)
             
             self.state = TeachingState.DRAG_TEACHING
             self.recording_start_time = time.time()
@@ -440,14 +881,15 @@ class TeachingModeManager:
             # 启用拖拽模式（降低关节刚度）
             self._enable_drag_mode()
             
-            logger.info(f"开始拖拽示教: {sequence_name}, 激活关节: {self.drag_active_joints}")
+            active_joint_ids = _joints_from_mask(self.drag_active_mask)
+            logger.info(f"开始拖拽示教: {sequence_name}, 激活关节: {active_joint_ids}")
             
             # 发布事件
             self.message_bus.publish(
                 Topics.DRAG_TEACHING_STARTED,
                 {
                     'sequence_name': sequence_name,
-                    'active_joints': list(self.drag_active_joints)
+                    'active_joints': active_joint_ids
                 },
                 MessagePriority.NORMAL
             )
@@ -468,21 +910,17 @@ class TeachingModeManager:
             # 记录结束位置
             if self.current_sequence:
                 current_time = time.time() - self.recording_start_time
-                end_keyframe = KeyFrame(
-                    timestamp=current_time,
-                    positions=self.current_positions.copy(),
-                    velocities=self.current_velocities.copy(),
-                    currents=self.current_currents.copy(),
-                    name="拖拽结束位置",
-                    teaching_mode="drag_teaching"
+                self._record_current_state(
+                    current_time,
+                    "拖拽结束位置",
+                    _MODE_DRAG
                 )
-                self.current_sequence.add_keyframe(end_keyframe)
             
             # 禁用拖拽模式（恢复关节刚度）
             self._disable_drag_mode()
             
             self.state = TeachingState.IDLE
-            self.drag_active_joints.clear()
+            self.drag_active_mask = 0
             
             logger.info(f"停止拖拽示教，共记录 {len(self.current_sequence.keyframes)} 个关键帧")
             
@@ -506,8 +944,7 @@ class TeachingModeManager:
         """启用拖拽模式"""
         try:
             # 降低激活关节的刚度
-            from core.motion_controller import get_motion_controller
-            motion_controller = get_motion_controller()
+            motion_controller = _get_motion_controller()
             
             # 这里可以发送降低刚度的指令
             # 具体实现取决于硬件协议
@@ -520,8 +957,7 @@ class TeachingModeManager:
         """禁用拖拽模式"""
         try:
             # 恢复关节刚度
-            from core.motion_controller import get_motion_controller
-            motion_controller = get_motion_controller()
+            motion_controller = _get_motion_controller()
             
             # 这里可以发送恢复刚度的指令
             logger.info("拖拽模式已禁用，关节刚度恢复")
@@ -568,7 +1004,7 @@ class TeachingModeManager:
             if new_description is not None:
                 keyframe.description = new_description
             
-            sequence.modified_at = time.time()
+            sequence.mark_modified()
             
             logger.info(f"关键帧 {keyframe_index} 编辑完成")
             
@@ -680,15 +1116,33 @@ class TeachingModeManager:
             self.state = TeachingState.IDLE
             return False
     
-    def backup_sequence(self, sequence: TeachingSequence) -> bool:
-        """备份序列"""
-        try:
-            timestamp = int(time.time())
-            backup_filename = f"{sequence.name}_backup_{timestamp}.json"
-            backup_path = self.backup_dir / backup_filename
+    def backup_sequence(self, sequence: TeachingSequence, fmt: str = "json") -> bool:
+        """
+        备份序列
+        
+        Args:
+            sequence: 要备份的序列
+            fmt: 备份格式，"json"、"msgpack"（需安装msgpack）或 "npz"（压缩NumPy归档）
             
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                json.dump(sequence.to_dict(), f, ensure_ascii=False, indent=2)
+        Returns:
+            是否备份成功
+        """
+        try:
+            # 纳秒时间戳，避免同一秒内的多次备份互相覆盖
+            timestamp = time.time_ns()
+            
+            if fmt == "msgpack":
+                backup_path = self.backup_dir / f"{sequence.name}_backup_{timestamp}.msgpack"
+                payload = sequence.to_msgpack()
+                with open(backup_path, 'wb') as f:
+                    f.write(payload)
+            elif fmt == "npz":
+                backup_path = self.backup_dir / f"{sequence.name}_backup_{timestamp}.npz"
+                sequence.save_npz(backup_path)
+            else:
+                backup_path = self.backup_dir / f"{sequence.name}_backup_{timestamp}.json"
+                with open(backup_path, 'w', encoding='utf-8') as f:
+                    json.dump(sequence.to_dict(), f, ensure_ascii=False, indent=2)
             
             logger.info(f"序列已备份: {backup_path}")
             return True
@@ -702,10 +1156,15 @@ class TeachingModeManager:
         try:
             backup_path = self.backup_dir / backup_filename
             
-            with open(backup_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            sequence = TeachingSequence.from_dict(data)
+            if backup_path.suffix == ".msgpack":
+                with open(backup_path, 'rb') as f:
+                    sequence = TeachingSequence.from_msgpack(f.read())
+            elif backup_path.suffix == ".npz":
+                sequence = TeachingSequence.load_npz(backup_path)
+            else:
+                with open(backup_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                sequence = TeachingSequence.from_dict(data)
             logger.info(f"序列已从备份恢复: {sequence.name}")
             return sequence
             
@@ -722,9 +1181,7 @@ class TeachingModeManager:
                 writer = csv.writer(csvfile)
                 
                 # 写入标题行
-                headers = ['timestamp', 'name'] + [f'joint_{i}_pos' for i in range(10)] + \
-                         [f'joint_{i}_vel' for i in range(10)] + [f'joint_{i}_cur' for i in range(10)]
-                writer.writerow(headers)
+                writer.writerow(_CSV_HEADERS)
                 
                 # 写入数据行
                 for kf in sequence.keyframes:
@@ -752,9 +1209,9 @@ class TeachingModeManager:
                     timestamp = float(row['timestamp'])
                     name = row.get('name', '')
                     
-                    positions = [int(row[f'joint_{i}_pos']) for i in range(10)]
-                    velocities = [float(row[f'joint_{i}_vel']) for i in range(10)]
-                    currents = [int(row[f'joint_{i}_cur']) for i in range(10)]
+                    positions = [int(row[key]) for key in _CSV_POS_COLUMNS]
+                    velocities = [float(row[key]) for key in _CSV_VEL_COLUMNS]
+                    currents = [int(row[key]) for key in _CSV_CUR_COLUMNS]
                     
                     keyframe = KeyFrame(
                         timestamp=timestamp,
@@ -762,18 +1219,20 @@ class TeachingModeManager:
                         velocities=velocities,
                         currents=currents,
                         name=name,
-                        teaching_mode="imported"
+                        teaching_mode=_MODE_IMPORTED
                     )
                     keyframes.append(keyframe)
             
+            now = time.time()
             sequence = TeachingSequence(
                 name=sequence_name,
                 description=f"从CSV导入: {filepath}",
-                keyframes=keyframes,
-                created_at=time.time(),
-                modified_at=time.time(),
-                teaching_mode_type="imported"
+                keyframes=[],
+                created_at=now,
+                modified_at=now,
+                teaching_mode_type=_MODE_IMPORTED
             )
+            sequence.add_keyframes_bulk(keyframes)
             
             logger.info(f"序列已从CSV导入: {sequence_name}, {len(keyframes)}个关键帧")
             return sequence
@@ -799,19 +1258,15 @@ class TeachingModeManager:
                 keyframes=[],
                 created_at=time.time(),
                 modified_at=time.time(),
-                teaching_mode_type="position_recording"
+                teaching_mode_type=_MODE_POS
             )
             
             # 记录起始位置
-            start_keyframe = KeyFrame(
-                timestamp=0.0,
-                positions=self.current_positions.copy(),
-                velocities=self.current_velocities.copy(),
-                currents=self.current_currents.copy(),
-                name="起始位置",
-                teaching_mode="position_recording"
+            self._record_current_state(
+                0.0,
+                "起始位置",
+                _MODE_POS
             )
-            self.current_sequence.add_keyframe(start_keyframe)
             
             self.state = TeachingState.RECORDING
             self.recording_start_time = time.time()
@@ -846,15 +1301,11 @@ class TeachingModeManager:
             # 记录结束位置
             if self.current_sequence:
                 current_time = time.time() - self.recording_start_time
-                end_keyframe = KeyFrame(
-                    timestamp=current_time,
-                    positions=self.current_positions.copy(),
-                    velocities=self.current_velocities.copy(),
-                    currents=self.current_currents.copy(),
-                    name="结束位置",
-                    teaching_mode="position_recording"
+                self._record_current_state(
+                    current_time,
+                    "结束位置",
+                    _MODE_POS
                 )
-                self.current_sequence.add_keyframe(end_keyframe)
             
             self.state = TeachingState.IDLE
             
@@ -888,18 +1339,13 @@ class TeachingModeManager:
                 return False
             
             current_time = time.time() - self.recording_start_time
-            keyframe = KeyFrame(
-                timestamp=current_time,
-                positions=self.current_positions.copy(),
-                velocities=self.current_velocities.copy(),
-                currents=self.current_currents.copy(),
-                name=name or f"关键帧{len(self.current_sequence.keyframes)}",
-                description=description,
-                teaching_mode="manual"
+            keyframe = self._record_current_state(
+                current_time,
+                name or f"关键帧{len(self.current_sequence.keyframes)}",
+                _MODE_MANUAL,
+                description=description
             )
             
-            self.current_sequence.add_keyframe(keyframe)
-            
             logger.info(f"手动添加关键帧: {keyframe.name}")
             
             # 发布事件
@@ -946,8 +1392,7 @@ class TeachingModeManager:
                     durations.append(max(time_diff / velocity_scaling, 0.5))  # 最小0.5秒，应用速度缩放
             
             # 创建轨迹约束
-            from core.velocity_controller import get_velocity_controller
-            velocity_controller = get_velocity_controller()
+            velocity_controller = _get_velocity_controller()
             velocity_params = velocity_controller.get_current_parameters()
             
             constraints = TrajectoryConstraints(
@@ -965,8 +1410,7 @@ class TeachingModeManager:
             )
             
             # 通过运动控制器执行轨迹
-            from core.motion_controller import get_motion_controller
-            motion_controller = get_motion_controller()
+            motion_controller = _get_motion_controller()
             
             self.state = TeachingState.PLAYING
             
@@ -1001,8 +1445,7 @@ class TeachingModeManager:
         """停止回放"""
         try:
             if self.state == TeachingState.PLAYING:
-                from core.motion_controller import get_motion_controller
-                motion_controller = get_motion_controller()
+                motion_controller = _get_motion_controller()
                 motion_controller.stop()
                 
                 self.state = TeachingState.IDLE
@@ -1028,9 +1471,19 @@ class TeachingModeManager:
             
             filepath = self.sequences_dir / filename
             
-            # 保存为JSON
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(sequence.to_dict(), f, ensure_ascii=False, indent=2)
+            # 保存为JSON：开头写入小的元数据块，列出序列时无需解析关键帧
+            data = {
+                'meta': {
+                    'name': sequence.name,
+                    'description': sequence.description,
+                    'keyframes_count': len(sequence.keyframes),
+                    'created_at': sequence.created_at,
+                    'modified_at': sequence.modified_at
+                },
+                **sequence.to_dict()
+            }
+            with open(filepath, 'wb') as f:
+                f.write(_dumps_json(data))
             
             logger.info(f"序列已保存: {filepath}")
             return True
@@ -1042,8 +1495,8 @@ class TeachingModeManager:
     def load_sequence(self, filepath: str) -> Optional[TeachingSequence]:
         """从文件加载序列"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(filepath, 'rb') as f:
+                data = _loads_json(f.read())
             
             sequence = TeachingSequence.from_dict(data)
             logger.info(f"序列已加载: {sequence.name}")
@@ -1056,21 +1509,31 @@ class TeachingModeManager:
     def list_sequences(self) -> List[Dict[str, Any]]:
         """列出所有保存的序列"""
         sequences = []
+        meta_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
         
         try:
             for filepath in self.sequences_dir.glob("*.json"):
                 try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    sequences.append({
-                        'filename': filepath.name,
-                        'name': data.get('name', '未知'),
-                        'description': data.get('description', ''),
-                        'keyframes_count': len(data.get('keyframes', [])),
-                        'created_at': data.get('created_at', 0),
-                        'modified_at': data.get('modified_at', 0)
-                    })
+                    # 文件未修改时直接复用上次读取的摘要，只需一次 stat
+                    st = filepath.stat()
+                    cache_key = (st.st_mtime_ns, st.st_size)
+                    cached = self._sequence_meta_cache.get(filepath.name)
+                    if cached is not None and cached[0] == cache_key:
+                        entry = cached[1]
+                    else:
+                        meta = self._read_sequence_meta(filepath)
+                        entry = {
+                            'filename': filepath.name,
+                            'name': meta.get('name', '未知'),
+                            'description': meta.get('description', ''),
+                            'keyframes_count': meta.get('keyframes_count', 0),
+                            'created_at': meta.get('created_at', st.st_mtime),
+                            # 文件中缺少修改时间时以文件系统时间代替
+                            'modified_at': meta.get('modified_at') or st.st_mtime
+                        }
+
+                    meta_cache[filepath.name] = (cache_key, entry)
+                    sequences.append(dict(entry))
                     
                 except Exception as e:
                     logger.warning(f"读取序列文件失败 {filepath}: {e}")
@@ -1078,10 +1541,43 @@ class TeachingModeManager:
         except Exception as e:
             logger.error(f"列出序列失败: {e}")
         
+        self._sequence_meta_cache = meta_cache
+        
         # 按修改时间排序
         sequences.sort(key=lambda x: x['modified_at'], reverse=True)
         return sequences
     
+    def _read_sequence_meta(self, filepath: Path) -> Dict[str, Any]:
+        """
+        读取序列文件摘要
+        
+        新格式文件只解析开头的 "meta" 块；旧格式文件或元数据超出文件头部时
+        回退为完整解析。
+        """
+        with open(filepath, 'rb') as f:
+            head = f.read(_META_HEAD_BYTES)
+        
+        text = head.decode('utf-8', errors='ignore')
+        match = _META_HEAD_RE.match(text)
+        if match:
+            try:
+                meta, _ = _JSON_DECODER.raw_decode(text, match.end())
+                return meta
+            except ValueError:
+                pass
+        
+        data = _loads_json(filepath.read_bytes())
+        if 'meta' in data:
+            return data['meta']
+        
+        return {
+            'name': data.get('name', '未知'),
+            'description': data.get('description', ''),
+            'keyframes_count': len(data.get('keyframes', [])),
+            'created_at': data.get('created_at', 0),
+            'modified_at': data.get('modified_at', 0)
+        }
+    
     def get_state(self) -> TeachingState:
         """获取当前状态"""
         return self.state
@@ -1135,11 +1631,13 @@ class TeachingModeManager:
                     } for joint in data.joints
                 ]
             
-            # 更新当前状态
+            # 更新当前状态，同时累计自上一关键帧以来的位置变化
             for joint_data in joints:
                 joint_id = joint_data.get('id')
                 if 0 <= joint_id < 10:
+                    previous = int(self.current_positions[joint_id])
                     self.current_positions[joint_id] = joint_data.get('position', 0)
+                    self._pos_delta_since_last_keyframe[joint_id] += int(self.current_positions[joint_id]) - previous
                     self.current_velocities[joint_id] = joint_data.get('velocity', 0.0)
                     self.current_currents[joint_id] = joint_data.get('current', 0)
             
@@ -1158,6 +1656,22 @@ class TeachingModeManager:
         except Exception as e:
             logger.error(f"处理机器人状态更新失败: {e}")
     
+    def _record_current_state(self, timestamp: float, name: str, teaching_mode: str,
+                              description: Optional[str] = None,
+                              with_forces: bool = False) -> KeyFrame:
+        """以当前机器人状态向当前序列追加关键帧"""
+        self._pos_delta_since_last_keyframe[:] = 0
+        return self.current_sequence.record_state(
+            timestamp,
+            self.current_positions,
+            self.current_velocities,
+            self.current_currents,
+            force_feedback=self.current_forces if with_forces else None,
+            name=name,
+            description=description,
+            teaching_mode=teaching_mode
+        )
+    
     def _auto_record_keyframe(self):
         """自动录制关键帧"""
         try:
@@ -1166,29 +1680,18 @@ class TeachingModeManager:
             
             current_time = time.time() - self.recording_start_time
             
-            # 检查是否有显著变化
+            # 检查是否有显著变化（状态回调中已累计自上一关键帧以来的位置变化）
             if len(self.current_sequence.keyframes) > 0:
-                last_keyframe = self.current_sequence.keyframes[-1]
-                
-                # 计算位置变化
-                position_change = sum(abs(curr - last) for curr, last in 
-                                    zip(self.current_positions, last_keyframe.positions))
-                
                 # 如果变化太小，跳过录制
-                if position_change < 50:  # 阈值可配置
+                if np.abs(self._pos_delta_since_last_keyframe).sum() < 50:  # 阈值可配置
                     return
             
-            keyframe = KeyFrame(
-                timestamp=current_time,
-                positions=self.current_positions.copy(),
-                velocities=self.current_velocities.copy(),
-                currents=self.current_currents.copy(),
-                name=f"自动_{len(self.current_sequence.keyframes)}",
-                teaching_mode="auto_recording"
+            self._record_current_state(
+                current_time,
+                f"自动_{len(self.current_sequence.keyframes)}",
+                _MODE_AUTO
             )
             
-            self.current_sequence.add_keyframe(keyframe)
-            
         except Exception as e:
             logger.error(f"自动录制关键帧失败: {e}")
     
@@ -1200,33 +1703,20 @@ class TeachingModeManager:
             
             current_time = time.time() - self.recording_start_time
             
-            # 检查激活关节是否有显著变化
+            # 检查激活关节是否有显著变化（只统计激活关节的位置变化）
             if len(self.current_sequence.keyframes) > 0:
-                last_keyframe = self.current_sequence.keyframes[-1]
-                
-                # 只检查激活关节的位置变化
-                position_change = 0
-                for joint_id in self.drag_active_joints:
-                    if joint_id < len(self.current_positions):
-                        change = abs(self.current_positions[joint_id] - last_keyframe.positions[joint_id])
-                        position_change += change
-                
+                active = _joints_from_mask(self.drag_active_mask)
                 # 如果变化太小，跳过录制
-                if position_change < self.drag_threshold:
+                if np.abs(self._pos_delta_since_last_keyframe[active]).sum() < self.drag_threshold:
                     return
             
-            keyframe = KeyFrame(
-                timestamp=current_time,
-                positions=self.current_positions.copy(),
-                velocities=self.current_velocities.copy(),
-                currents=self.current_currents.copy(),
-                force_feedback=self.current_forces.copy(),
-                name=f"拖拽_{len(self.current_sequence.keyframes)}",
-                teaching_mode="drag_teaching"
+            self._record_current_state(
+                current_time,
+                f"拖拽_{len(self.current_sequence.keyframes)}",
+                _MODE_DRAG,
+                with_forces=True
             )
             
-            self.current_sequence.add_keyframe(keyframe)
-            
         except Exception as e:
             logger.error(f"自动录制拖拽关键帧失败: {e}")
 
@@ -0,0 +1,37 @@
+"""
+标定数值内核
+
+功能：
+- 用户空间位置 → 硬件空间位置转换并限制在硬件限位内（加偏移与限位一次完成）
+
+安装numba时使用编译版本（单次循环直接写入输出数组，无中间临时数组），
+否则使用等价的NumPy实现。输入输出均为一维 int32 ndarray。
+"""
+
+import numpy as np
+
+from utils.numba_compat import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True)
+def _user_to_hw_clamped_jit(user, hw_min, hw_max, out):
+    for i in range(user.shape[0]):
+        v = user[i] + hw_min[i]
+        if v < hw_min[i]:
+            v = hw_min[i]
+        elif v > hw_max[i]:
+            v = hw_max[i]
+        out[i] = v
+    return out
+
+
+def _user_to_hw_clamped_np(user: np.ndarray, hw_min: np.ndarray, hw_max: np.ndarray,
+                           out: np.ndarray) -> np.ndarray:
+    np.add(user, hw_min, out=out)
+    return np.clip(out, hw_min, hw_max, out=out)
+
+
+if NUMBA_AVAILABLE:
+    user_to_hw_clamped = _user_to_hw_clamped_jit
+else:
+    user_to_hw_clamped = _user_to_hw_clamped_np
@@ -0,0 +1,147 @@
+"""
+轨迹插值数值内核
+
+功能：
+- 按时间查找轨迹区间（从上次区间向后推进少量区间，时间回退或大幅跳跃时二分查找）
+- 区间内位置/速度/加速度线性插值（三者合并为一个数组一次完成），结果写入调用方预分配的输出数组
+- 三次Hermite位置插值（由区间两端的位置与速度确定，用于非线性插值生成的轨迹）
+
+安装numba时使用编译版本，否则使用等价的NumPy实现。
+时间戳为一维 float64 ndarray；位置/速度/加速度合并存放为 PVA [N, 3, J] 浮点 ndarray（float32 或 float64），
+各区间的增量 dPVA [N-1, 3, J] 与时长倒数 inv_dt [N-1]（时长为0的区间为0）在加载轨迹时预先计算。
+插值内核签名统一为 (t, last_i, ts, inv_dt, PVA, dPVA, ...附加数组, out)，out 为 [3, J]，
+返回 (区间下标, 是否插值)，调用方保证 N >= 2 且 ts[0] <= t <= ts[-1]。
+"""
+
+import numpy as np
+
+from utils.numba_compat import njit, NUMBA_AVAILABLE
+
+# 顺序推进的最大区间数，超过则视为大幅跳跃（丢帧、暂停恢复、定位），改用二分查找
+_MAX_SCAN = 4
+
+
+@njit(cache=True)
+def _locate_jit(ts, t, last_i):
+    n = ts.shape[0]
+    i = last_i
+    if i > n - 2 or (i > 0 and t <= ts[i]):
+        i = np.searchsorted(ts, t) - 1
+        if i < 0:
+            i = 0
+        elif i > n - 2:
+            i = n - 2
+    else:
+        end = min(i + _MAX_SCAN, n - 2)
+        while i < end and ts[i + 1] < t:
+            i += 1
+        if i < n - 2 and ts[i + 1] < t:
+            i = np.searchsorted(ts, t) - 1
+            if i > n - 2:
+                i = n - 2
+    return i
+
+
+@njit(cache=True, fastmath=True)
+def _interp_linear_jit(t, last_i, ts, inv_dt, PVA, dPVA, out):
+    i = _locate_jit(ts, t, last_i)
+    if inv_dt[i] == 0:
+        return i, False
+
+    alpha = (t - ts[i]) * inv_dt[i]
+    for k in range(3):
+        for j in range(PVA.shape[2]):
+            out[k, j] = PVA[i, k, j] + alpha * dPVA[i, k, j]
+    return i, True
+
+
+@njit(cache=True, fastmath=True)
+def _interp_hermite_jit(t, last_i, ts, inv_dt, PVA, dPVA, C2, C3, out):
+    i = _locate_jit(ts, t, last_i)
+    if inv_dt[i] == 0:
+        return i, False
+
+    s = t - ts[i]
+    alpha = s * inv_dt[i]
+    for j in range(PVA.shape[2]):
+        out[0, j] = PVA[i, 0, j] + s * (PVA[i, 1, j] + s * (C2[i, j] + s * C3[i, j]))
+    for k in range(1, 3):
+        for j in range(PVA.shape[2]):
+            out[k, j] = PVA[i, k, j] + alpha * dPVA[i, k, j]
+    return i, True
+
+
+def _locate_np(ts: np.ndarray, t: float, last_i: int) -> int:
+    n = len(ts)
+    i = last_i
+    if i > n - 2 or (i > 0 and t <= ts[i]):
+        i = int(np.searchsorted(ts, t)) - 1
+        i = max(0, min(i, n - 2))
+    else:
+        end = min(i + _MAX_SCAN, n - 2)
+        while i < end and ts[i + 1] < t:
+            i += 1
+        if i < n - 2 and ts[i + 1] < t:
+            i = min(int(np.searchsorted(ts, t)) - 1, n - 2)
+    return i
+
+
+def _interp_linear_np(t, last_i, ts, inv_dt, PVA, dPVA, out):
+    i = _locate_np(ts, t, last_i)
+    if inv_dt[i] == 0:
+        return i, False
+
+    alpha = (t - ts[i]) * inv_dt[i]
+    np.multiply(dPVA[i], alpha, out=out)
+    np.add(out, PVA[i], out=out)
+    return i, True
+
+
+def _interp_hermite_np(t, last_i, ts, inv_dt, PVA, dPVA, C2, C3, out):
+    i = _locate_np(ts, t, last_i)
+    if inv_dt[i] == 0:
+        return i, False
+
+    s = t - ts[i]
+    alpha = s * inv_dt[i]
+    np.multiply(dPVA[i], alpha, out=out)
+    np.add(out, PVA[i], out=out)
+    # 位置按 Horner 形式求值：P + s*(V + s*(C2 + s*C3))
+    out_p = out[0]
+    np.multiply(C3[i], s, out=out_p)
+    np.add(out_p, C2[i], out=out_p)
+    np.multiply(out_p, s, out=out_p)
+    np.add(out_p, PVA[i, 1], out=out_p)
+    np.multiply(out_p, s, out=out_p)
+    np.add(out_p, PVA[i, 0], out=out_p)
+    return i, True
+
+
+def hermite_coefficients(P: np.ndarray, V: np.ndarray, inv_dt: np.ndarray):
+    """
+    计算各区间三次Hermite位置多项式的二次、三次项系数
+
+    区间内 p(s) = P[i] + V[i]*s + C2[i]*s^2 + C3[i]*s^3，s 为距区间起点的时间
+
+    Args:
+        P: 位置 [N, J]
+        V: 速度 [N, J]
+        inv_dt: 区间时长倒数 [N-1]
+
+    Returns:
+        (C2, C3)，形状均为 [N-1, J]
+    """
+    inv = inv_dt[:, None]
+    slope = np.diff(P, axis=0) * inv
+    V0, V1 = V[:-1], V[1:]
+    C2 = (3.0 * slope - 2.0 * V0 - V1) * inv
+    C3 = (V0 + V1 - 2.0 * slope) * inv * inv
+    return C2, C3
+
+
+if NUMBA_AVAILABLE:
+    interp_linear = _interp_linear_jit
+    interp_hermite = _interp_hermite_jit
+else:
+    interp_linear = _interp_linear_np
+    interp_hermite = _interp_hermite_np
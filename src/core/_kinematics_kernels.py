@@ -0,0 +1,350 @@
+"""
+运动学数值内核
+
+功能：
+- 标准DH串联链正运动学（单组，及一次求解 B 组关节角输出 [B, 4, 4] 末端变换矩阵的批量版本）
+- 单组关节角正运动学与基坐标系几何雅可比一次遍历完成
+- 位姿误差（位置差 + 姿态误差轴角）
+- 阻尼最小二乘（Levenberg-Marquardt）逆运动学，整个迭代在内核中完成；
+  误差增大时拒绝该步并增大阻尼（λ·a1），误差减小时接受并减小阻尼（λ/a2），阻尼限制在 [lambda_min, lambda_max]；
+  每步结果限制在关节限位 [q_lo, q_hi] 内；已在限位上且步长指向限位外的关节本步固定不动，
+  其余关节重新求解步长（避免截断后的步长方向失效导致停滞）
+
+安装numba时使用编译版本（逐连杆在 3x4 块上原地累乘，无中间临时数组；批量正运动学按样本并行），
+否则使用等价的NumPy实现。
+连杆常量（关节偏移、a、d、cos(alpha)、sin(alpha)）为一维 float64 ndarray，由调用方预先计算；
+关节角 qs 为 [B, n]（单组为 [n]）float64，基座/工具变换为 [4, 4] float64。
+"""
+
+import math
+import numpy as np
+
+from utils.numba_compat import njit, prange, NUMBA_AVAILABLE
+
+
+@njit(cache=True, fastmath=True)
+def _compose_dh_jit(T, theta, a, d, ca, sa, tmp):
+    # T[:3] <- T[:3] · (Rz(theta) Tz(d) Tx(a) Rx(alpha))，累积变换只需前三行，末行恒为 [0, 0, 0, 1]
+    ct = math.cos(theta)
+    st = math.sin(theta)
+    for r in range(3):
+        t0 = T[r, 0]
+        t1 = T[r, 1]
+        t2 = T[r, 2]
+        tmp[r, 0] = t0 * ct + t1 * st
+        tmp[r, 1] = -t0 * st * ca + t1 * ct * ca + t2 * sa
+        tmp[r, 2] = t0 * st * sa - t1 * ct * sa + t2 * ca
+        tmp[r, 3] = t0 * a * ct + t1 * a * st + t2 * d + T[r, 3]
+    T[:3, :] = tmp
+
+
+@njit(cache=True, fastmath=True)
+def _apply_tool_jit(T, tool, out):
+    for r in range(3):
+        for c in range(4):
+            out[r, c] = (T[r, 0] * tool[0, c] + T[r, 1] * tool[1, c]
+                         + T[r, 2] * tool[2, c] + T[r, 3] * tool[3, c])
+    out[3, 0] = 0.0
+    out[3, 1] = 0.0
+    out[3, 2] = 0.0
+    out[3, 3] = 1.0
+
+
+@njit(cache=True, fastmath=True)
+def _fkine_jit(q, offset, a, d, cos_alpha, sin_alpha, base, tool, out):
+    T = base[:3].copy()
+    tmp = np.empty((3, 4))
+    for i in range(q.shape[0]):
+        _compose_dh_jit(T, q[i] + offset[i], a[i], d[i], cos_alpha[i], sin_alpha[i], tmp)
+    _apply_tool_jit(T, tool, out)
+    return out
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _fkine_batch_jit(qs, offset, a, d, cos_alpha, sin_alpha, base, tool, out):
+    for b in prange(qs.shape[0]):
+        T = base[:3].copy()
+        tmp = np.empty((3, 4))
+        for i in range(qs.shape[1]):
+            _compose_dh_jit(T, qs[b, i] + offset[i], a[i], d[i], cos_alpha[i], sin_alpha[i], tmp)
+        _apply_tool_jit(T, tool, out[b])
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def _fk_jacobian_jit(q, offset, a, d, cos_alpha, sin_alpha, base, tool, T_out, J_out):
+    n = q.shape[0]
+    zs = np.empty((n, 3))
+    ps = np.empty((n, 3))
+    T = base[:3].copy()
+    tmp = np.empty((3, 4))
+    for i in range(n):
+        # 关节i绕第 i-1 坐标系的z轴旋转
+        for r in range(3):
+            zs[i, r] = T[r, 2]
+            ps[i, r] = T[r, 3]
+        _compose_dh_jit(T, q[i] + offset[i], a[i], d[i], cos_alpha[i], sin_alpha[i], tmp)
+    _apply_tool_jit(T, tool, T_out)
+
+    # J[:, i] = [z_i × (p_e - p_i); z_i]
+    for i in range(n):
+        dx = T_out[0, 3] - ps[i, 0]
+        dy = T_out[1, 3] - ps[i, 1]
+        dz = T_out[2, 3] - ps[i, 2]
+        J_out[0, i] = zs[i, 1] * dz - zs[i, 2] * dy
+        J_out[1, i] = zs[i, 2] * dx - zs[i, 0] * dz
+        J_out[2, i] = zs[i, 0] * dy - zs[i, 1] * dx
+        J_out[3, i] = zs[i, 0]
+        J_out[4, i] = zs[i, 1]
+        J_out[5, i] = zs[i, 2]
+
+
+@njit(cache=True, fastmath=True)
+def _pose_error_jit(T, T_target, e):
+    for r in range(3):
+        e[r] = T_target[r, 3] - T[r, 3]
+
+    # 姿态误差 R = R_target · R^T 的轴角表示
+    R = np.empty((3, 3))
+    for r in range(3):
+        for c in range(3):
+            R[r, c] = T_target[r, 0] * T[c, 0] + T_target[r, 1] * T[c, 1] + T_target[r, 2] * T[c, 2]
+    lx = R[2, 1] - R[1, 2]
+    ly = R[0, 2] - R[2, 0]
+    lz = R[1, 0] - R[0, 1]
+    ln = math.sqrt(lx * lx + ly * ly + lz * lz)
+    trace = R[0, 0] + R[1, 1] + R[2, 2]
+    if ln > 1e-12:
+        scale = math.atan2(ln, trace - 1.0) / ln
+        e[3] = scale * lx
+        e[4] = scale * ly
+        e[5] = scale * lz
+    elif trace > 0:
+        e[3] = 0.0
+        e[4] = 0.0
+        e[5] = 0.0
+    else:
+        e[3] = math.pi / 2 * (R[0, 0] + 1.0)
+        e[4] = math.pi / 2 * (R[1, 1] + 1.0)
+        e[5] = math.pi / 2 * (R[2, 2] + 1.0)
+
+
+@njit(cache=True, fastmath=True)
+def _lm_step_jit(J, e, lam, A, g, dq):
+    # 正规方程 (J^T J + λI) dq = J^T e：系数矩阵对称正定，原地Cholesky分解后前代、回代求解，
+    # 小规模（10x10）时比通用LU求解少去主元与临时数组开销
+    n = J.shape[1]
+    for i in range(n):
+        acc = 0.0
+        for k in range(6):
+            acc += J[k, i] * e[k]
+        g[i] = acc
+        for j in range(i + 1):
+            acc = 0.0
+            for k in range(6):
+                acc += J[k, i] * J[k, j]
+            A[i, j] = acc
+        A[i, i] += lam
+
+    # A = L L^T，L 存放在 A 的下三角
+    for j in range(n):
+        acc = A[j, j]
+        for k in range(j):
+            acc -= A[j, k] * A[j, k]
+        A[j, j] = math.sqrt(acc)
+        for i in range(j + 1, n):
+            acc = A[i, j]
+            for k in range(j):
+                acc -= A[i, k] * A[j, k]
+            A[i, j] = acc / A[j, j]
+
+    # L y = g，L^T dq = y
+    for i in range(n):
+        acc = g[i]
+        for k in range(i):
+            acc -= A[i, k] * dq[k]
+        dq[i] = acc / A[i, i]
+    for i in range(n - 1, -1, -1):
+        acc = dq[i]
+        for k in range(i + 1, n):
+            acc -= A[k, i] * dq[k]
+        dq[i] = acc / A[i, i]
+
+
+@njit(cache=True)
+def _block_at_limits_jit(q, dq, q_lo, q_hi, Jw):
+    # 已在限位上且步长指向限位外的关节：将其雅可比列置零（该关节步长为0），返回是否有新固定的关节
+    blocked = False
+    for i in range(q.shape[0]):
+        if (q[i] <= q_lo[i] and dq[i] < 0.0) or (q[i] >= q_hi[i] and dq[i] > 0.0):
+            for k in range(6):
+                Jw[k, i] = 0.0
+            blocked = True
+    return blocked
+
+
+@njit(cache=True, fastmath=True)
+def _ik_lm_jit(T_target, q0, offset, a, d, cos_alpha, sin_alpha, base, tool,
+               q_lo, q_hi, damping, lambda_min, lambda_max, a1, a2, max_iterations, tol, q):
+    n = q0.shape[0]
+    q[:] = q0
+    T = np.empty((4, 4))
+    J = np.empty((6, n))
+    e = np.empty(6)
+    q_new = np.empty(n)
+    J_new = np.empty((6, n))
+    e_new = np.empty(6)
+    Jw = np.empty((6, n))
+    A = np.empty((n, n))
+    g = np.empty(n)
+    dq = np.empty(n)
+    _fk_jacobian_jit(q, offset, a, d, cos_alpha, sin_alpha, base, tool, T, J)
+    _pose_error_jit(T, T_target, e)
+    E = 0.5 * np.dot(e, e)
+    lam = damping
+    for it in range(max_iterations):
+        if E < tol:
+            return it, True, E
+
+        Jw[:, :] = J
+        _lm_step_jit(Jw, e, lam, A, g, dq)
+        while _block_at_limits_jit(q, dq, q_lo, q_hi, Jw):
+            _lm_step_jit(Jw, e, lam, A, g, dq)
+        for i in range(n):
+            q_new[i] = min(max(q[i] + dq[i], q_lo[i]), q_hi[i])
+        _fk_jacobian_jit(q_new, offset, a, d, cos_alpha, sin_alpha, base, tool, T, J_new)
+        _pose_error_jit(T, T_target, e_new)
+        E_new = 0.5 * np.dot(e_new, e_new)
+        if E_new < E:
+            q[:] = q_new
+            J[:, :] = J_new
+            e[:] = e_new
+            E = E_new
+            lam = max(lam / a2, lambda_min)
+        else:
+            lam = min(lam * a1, lambda_max)
+    return max_iterations, E < tol, E
+
+
+def _link_transforms_np(theta, a, d, cos_alpha, sin_alpha):
+    # 各连杆DH变换 [..., n, 4, 4]
+    ct = np.cos(theta)
+    st = np.sin(theta)
+    L = np.zeros(theta.shape + (4, 4))
+    L[..., 0, 0] = ct
+    L[..., 0, 1] = -st * cos_alpha
+    L[..., 0, 2] = st * sin_alpha
+    L[..., 0, 3] = a * ct
+    L[..., 1, 0] = st
+    L[..., 1, 1] = ct * cos_alpha
+    L[..., 1, 2] = -ct * sin_alpha
+    L[..., 1, 3] = a * st
+    L[..., 2, 1] = sin_alpha
+    L[..., 2, 2] = cos_alpha
+    L[..., 2, 3] = d
+    L[..., 3, 3] = 1.0
+    return L
+
+
+def _fkine_np(q, offset, a, d, cos_alpha, sin_alpha, base, tool, out):
+    L = _link_transforms_np(q + offset, a, d, cos_alpha, sin_alpha)
+    T = base
+    for i in range(q.shape[0]):
+        T = T @ L[i]
+    return np.matmul(T, tool, out=out)
+
+
+def _fkine_batch_np(qs, offset, a, d, cos_alpha, sin_alpha, base, tool, out):
+    L = _link_transforms_np(qs + offset, a, d, cos_alpha, sin_alpha)
+    T = np.broadcast_to(base, out.shape).copy()
+    for i in range(qs.shape[1]):
+        np.matmul(T, L[:, i], out=T)
+    return np.matmul(T, tool, out=out)
+
+
+def _fk_jacobian_np(q, offset, a, d, cos_alpha, sin_alpha, base, tool, T_out, J_out):
+    L = _link_transforms_np(q + offset, a, d, cos_alpha, sin_alpha)
+    n = q.shape[0]
+    zs = np.empty((n, 3))
+    ps = np.empty((n, 3))
+    T = base.copy()
+    for i in range(n):
+        zs[i] = T[:3, 2]
+        ps[i] = T[:3, 3]
+        T = T @ L[i]
+    np.matmul(T, tool, out=T_out)
+
+    J_out[:3] = np.cross(zs, T_out[:3, 3] - ps).T
+    J_out[3:] = zs.T
+
+
+def _pose_error_np(T, T_target, e):
+    e[:3] = T_target[:3, 3] - T[:3, 3]
+
+    R = T_target[:3, :3] @ T[:3, :3].T
+    li = np.array([R[2, 1] - R[1, 2], R[0, 2] - R[2, 0], R[1, 0] - R[0, 1]])
+    ln = np.linalg.norm(li)
+    trace = np.trace(R)
+    if ln > 1e-12:
+        e[3:] = math.atan2(ln, trace - 1.0) * li / ln
+    elif trace > 0:
+        e[3:] = 0.0
+    else:
+        e[3:] = math.pi / 2 * (np.diag(R) + 1.0)
+
+
+def _ik_lm_np(T_target, q0, offset, a, d, cos_alpha, sin_alpha, base, tool,
+              q_lo, q_hi, damping, lambda_min, lambda_max, a1, a2, max_iterations, tol, q):
+    n = q0.shape[0]
+    q[:] = q0
+    T = np.empty((4, 4))
+    J = np.empty((6, n))
+    e = np.empty(6)
+    J_new = np.empty((6, n))
+    e_new = np.empty(6)
+    _fk_jacobian_np(q, offset, a, d, cos_alpha, sin_alpha, base, tool, T, J)
+    _pose_error_np(T, T_target, e)
+    E = 0.5 * float(e @ e)
+    lam = damping
+    for it in range(max_iterations):
+        if E < tol:
+            return it, True, E
+
+        # 只对未固定的关节求解；已在限位上且步长指向限位外的关节固定后重新求解
+        free = np.ones(n, dtype=np.bool_)
+        dq = np.zeros(n)
+        while True:
+            Jf = J[:, free]
+            dq[free] = np.linalg.solve(Jf.T @ Jf + lam * np.eye(Jf.shape[1]), Jf.T @ e)
+            blocked = free & (((q <= q_lo) & (dq < 0.0)) | ((q >= q_hi) & (dq > 0.0)))
+            if not blocked.any():
+                break
+            free &= ~blocked
+            dq[blocked] = 0.0
+        q_new = np.clip(q + dq, q_lo, q_hi)
+        _fk_jacobian_np(q_new, offset, a, d, cos_alpha, sin_alpha, base, tool, T, J_new)
+        _pose_error_np(T, T_target, e_new)
+        E_new = 0.5 * float(e_new @ e_new)
+        if E_new < E:
+            q[:] = q_new
+            J, J_new = J_new, J
+            e, e_new = e_new, e
+            E = E_new
+            lam = max(lam / a2, lambda_min)
+        else:
+            lam = min(lam * a1, lambda_max)
+    return max_iterations, E < tol, E
+
+
+if NUMBA_AVAILABLE:
+    fkine = _fkine_jit
+    fkine_batch = _fkine_batch_jit
+    fk_jacobian = _fk_jacobian_jit
+    pose_error = _pose_error_jit
+    ik_lm = _ik_lm_jit
+else:
+    fkine = _fkine_np
+    fkine_batch = _fkine_batch_np
+    fk_jacobian = _fk_jacobian_np
+    pose_error = _pose_error_np
+    ik_lm = _ik_lm_np
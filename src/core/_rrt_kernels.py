@@ -0,0 +1,119 @@
+"""
+RRT规划数值内核
+
+功能：
+- 关节配置间欧氏距离
+- 按步长向目标配置扩展（steer）
+- 线段上等间隔插值采样（用于碰撞检查）
+- 10自由度专用的距离/扩展内核（固定循环长度，编译器可完全展开并向量化）
+
+安装numba时使用编译版本，否则使用等价的NumPy实现。
+输入输出均为一维 float64 ndarray，调用方无需再做 list/ndarray 转换。
+"""
+
+import math
+import numpy as np
+
+from utils.numba_compat import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True, fastmath=True)
+def _distance_jit(a, b):
+    acc = 0.0
+    for i in range(a.shape[0]):
+        d = a[i] - b[i]
+        acc += d * d
+    return math.sqrt(acc)
+
+
+@njit(cache=True, fastmath=True)
+def _steer_jit(from_config, to_config, step_size):
+    dist = _distance_jit(from_config, to_config)
+    if dist <= step_size:
+        return to_config.copy()
+
+    scale = step_size / dist
+    out = np.empty_like(from_config)
+    for i in range(from_config.shape[0]):
+        out[i] = from_config[i] + scale * (to_config[i] - from_config[i])
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def _segment_samples_jit(config1, config2, num_checks):
+    dof = config1.shape[0]
+    out = np.empty((num_checks + 1, dof))
+    for k in range(num_checks + 1):
+        alpha = k / num_checks
+        for i in range(dof):
+            out[k, i] = config1[i] + alpha * (config2[i] - config1[i])
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def _distance10_jit(a, b):
+    acc = 0.0
+    for i in range(10):
+        d = a[i] - b[i]
+        acc += d * d
+    return math.sqrt(acc)
+
+
+@njit(cache=True, fastmath=True)
+def _steer10_jit(from_config, to_config, step_size):
+    dist = _distance10_jit(from_config, to_config)
+    if dist <= step_size:
+        return to_config.copy()
+
+    scale = step_size / dist
+    out = np.empty(10)
+    for i in range(10):
+        out[i] = from_config[i] + scale * (to_config[i] - from_config[i])
+    return out
+
+
+def _distance_np(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.linalg.norm(a - b))
+
+
+def _steer_np(from_config: np.ndarray, to_config: np.ndarray, step_size: float) -> np.ndarray:
+    direction = to_config - from_config
+    dist = np.linalg.norm(direction)
+    if dist <= step_size:
+        return to_config.copy()
+    return from_config + (step_size / dist) * direction
+
+
+def _segment_samples_np(config1: np.ndarray, config2: np.ndarray, num_checks: int) -> np.ndarray:
+    alphas = np.linspace(0.0, 1.0, num_checks + 1)[:, None]
+    return config1 + alphas * (config2 - config1)
+
+
+if NUMBA_AVAILABLE:
+    distance = _distance_jit
+    steer = _steer_jit
+    segment_samples = _segment_samples_jit
+    distance10 = _distance10_jit
+    steer10 = _steer10_jit
+else:
+    distance = _distance_np
+    steer = _steer_np
+    segment_samples = _segment_samples_np
+    # NumPy实现与维数无关，无需专用版本
+    distance10 = _distance_np
+    steer10 = _steer_np
+
+
+def kernels_for_dof(dof: int):
+    """
+    按自由度选择距离/扩展内核
+
+    Args:
+        dof: 关节配置维数
+
+    Returns:
+        (distance, steer)，10自由度时返回专用版本
+    """
+    if dof == 10:
+        return distance10, steer10
+    return distance, steer
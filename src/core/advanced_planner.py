@@ -10,8 +10,9 @@
 """
 
 import numpy as np
-import math
-from typing import List, Dict, Optional, Tuple, Callable, Any
+from scipy.spatial import cKDTree
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Callable, Any
 from dataclasses import dataclass
 from enum import Enum
 import time
@@ -19,6 +20,7 @@ import time
 from utils.logger import get_logger, log_performance
 from core.kinematics_solver import get_kinematics_solver, Pose6D, KinematicsResult
 from core.trajectory_planner import Trajectory, TrajectoryPoint, TrajectoryConstraints
+from core import _rrt_kernels
 
 logger = get_logger(__name__)
 
@@ -26,6 +28,7 @@ logger = get_logger(__name__)
 class PlanningAlgorithm(Enum):
     """规划算法类型"""
     RRT = "rrt"
+    RRT_CONNECT = "rrt_connect"
     RRT_STAR = "rrt_star"
     A_STAR = "a_star"
     DIJKSTRA = "dijkstra"
@@ -56,17 +59,34 @@ class CollisionChecker:
     
     def __init__(self):
         """初始化碰撞检测器"""
-        self.obstacles: List[Obstacle] = []
+        self.obstacles: List[Obstacle] = []  # 仅为接口兼容保留
         self.kinematics_solver = get_kinematics_solver()
         
+        # 障碍物SoA数组：盒子中心/半尺寸、球心/半径平方，在增删障碍物时维护
+        self._box_c = np.empty((0, 3), dtype=np.float64)
+        self._box_h = np.empty((0, 3), dtype=np.float64)
+        self._sph_c = np.empty((0, 3), dtype=np.float64)
+        self._sph_r2 = np.empty(0, dtype=np.float64)
+        
+        # 末端位置缓存：量化关节配置 -> 末端位置，超出容量时淘汰最早插入项
+        self.fk_cache_size = 32768
+        self.fk_cache_resolution = 1024  # 量化分辨率（每弧度格数）
+        self._fk_cache: OrderedDict = OrderedDict()
+        
+        # 所有障碍物的总包围盒，无障碍物时为None
+        self._obstacles_aabb_min: Optional[np.ndarray] = None
+        self._obstacles_aabb_max: Optional[np.ndarray] = None
+        
     def add_obstacle(self, obstacle: Obstacle):
         """添加障碍物"""
         self.obstacles.append(obstacle)
+        self._append_obstacle_arrays(obstacle)
         logger.info(f"添加障碍物: {obstacle.type} at {obstacle.center}")
     
     def remove_all_obstacles(self):
         """移除所有障碍物"""
         self.obstacles.clear()
+        self._rebuild_obstacle_arrays()
         logger.info("已清除所有障碍物")
     
     def check_collision(self, joint_angles: List[float]) -> bool:
@@ -79,50 +99,298 @@ class CollisionChecker:
         Returns:
             是否碰撞
         """
+        # 只需末端位置：走批量路径，省去 Pose6D 欧拉角转换与 list/ndarray 往返
+        configs = np.asarray(joint_angles, dtype=np.float64)[None]
+        return bool(self.check_collision_configs(configs)[0])
+    
+    def check_collision_configs(self, configs) -> np.ndarray:
+        """
+        批量检查一组关节配置是否碰撞
+        
+        Args:
+            configs: 关节配置矩阵 (M, dof)
+            
+        Returns:
+            每个配置是否碰撞，形状 (M,) 的bool数组
+        """
+        configs = np.asarray(configs, dtype=np.float64)
         if not self.kinematics_solver.is_enabled():
-            return False  # 无法检测，假设无碰撞
+            return np.zeros(len(configs), dtype=bool)  # 无法检测，假设无碰撞
+        
+        end_points = self._end_effector_positions(configs)
+        if end_points is None:
+            return np.ones(len(configs), dtype=bool)  # 运动学求解失败，认为碰撞
+        
+        return self.check_collision_batch(end_points)
+    
+    def check_segment_collision(self, config1, config2, num_checks: int = 10) -> bool:
+        """
+        检查关节空间直线段（num_checks+1 个等间隔插值点）是否碰撞
+        
+        先做扫掠包围盒保守判断：线段上任一点的末端位置与较近端点的距离不超过
+        ½·Σ reach_i·|Δq_i|，两端点末端位置的包围盒外扩该半径后若与障碍物
+        总包围盒不相交，则整段无碰撞，中间插值点无需正运动学。
+        
+        Args:
+            config1: 线段起点关节配置
+            config2: 线段终点关节配置
+            num_checks: 插值段数
+            
+        Returns:
+            是否碰撞
+        """
+        config1 = np.asarray(config1, dtype=np.float64)
+        config2 = np.asarray(config2, dtype=np.float64)
         
-        # 计算末端执行器位置
-        fk_result = self.kinematics_solver.forward_kinematics(joint_angles)
-        if not fk_result.success:
+        if not self.kinematics_solver.is_enabled() or self._obstacles_aabb_min is None:
+            return False  # 无法检测或无障碍物
+        
+        end_points = self._end_effector_positions(np.stack([config1, config2]))
+        if end_points is None:
             return True  # 运动学求解失败，认为碰撞
         
-        pose = fk_result.end_effector_pose
-        end_effector_pos = [pose.x, pose.y, pose.z]
+        reach = self.kinematics_solver.joint_reach()
+        if reach is not None:
+            radius = 0.5 * float(np.abs(config2 - config1) @ reach)
+            swept_min = end_points.min(axis=0) - radius
+            swept_max = end_points.max(axis=0) + radius
+            if np.any((swept_max < self._obstacles_aabb_min) | (swept_min > self._obstacles_aabb_max)):
+                return False
+        
+        # 包围盒相交：端点复用已算的正运动学，再批量检测中间插值点
+        if self.check_collision_batch(end_points).any():
+            return True
+        
+        interior = _rrt_kernels.segment_samples(config1, config2, num_checks)[1:-1]
+        return bool(len(interior) and self.check_collision_configs(interior).any())
+    
+    def check_segments_collision(self, start_config, end_configs, num_checks: int = 10) -> np.ndarray:
+        """
+        批量检查从同一起点出发的多条关节空间直线段是否碰撞
+        
+        所有线段的插值点一次广播生成 (M, num_checks+1, dof)，展平后统一检测。
+        
+        Args:
+            start_config: 公共起点关节配置
+            end_configs: 各线段终点关节配置 (M, dof)
+            num_checks: 每条线段的插值段数
+            
+        Returns:
+            每条线段是否碰撞，形状 (M,) 的bool数组
+        """
+        start_config = np.asarray(start_config, dtype=np.float64)
+        end_configs = np.atleast_2d(np.asarray(end_configs, dtype=np.float64))
+        
+        if self._obstacles_aabb_min is None:
+            return np.zeros(len(end_configs), dtype=bool)  # 无障碍物
         
-        # 检查与障碍物的碰撞
-        for obstacle in self.obstacles:
-            if self._check_point_obstacle_collision(end_effector_pos, obstacle):
-                return True
+        alphas = np.linspace(0.0, 1.0, num_checks + 1)[None, :, None]
+        samples = start_config + alphas * (end_configs[:, None, :] - start_config)
         
-        return False
+        hit = self.check_collision_configs(samples.reshape(-1, len(start_config)))
+        return hit.reshape(len(end_configs), num_checks + 1).any(axis=1)
     
-    def _check_point_obstacle_collision(self, point: List[float], obstacle: Obstacle) -> bool:
-        """检查点与障碍物的碰撞"""
+    def _end_effector_positions(self, configs: np.ndarray) -> Optional[np.ndarray]:
+        """
+        批量计算末端位置，按量化关节配置缓存
+        
+        树扩展与路径优化会反复检测相同节点，命中缓存的配置跳过正运动学，
+        其余配置合并为一次批量求解。
+        
+        Returns:
+            末端位置矩阵 (M, 3)，正运动学失败时返回None
+        """
+        configs = np.atleast_2d(configs)
+        keys = np.round(configs * self.fk_cache_resolution).astype(np.int64)
+        positions = np.empty((len(configs), 3), dtype=np.float64)
+        
+        missing = []
+        for row, key in enumerate(keys):
+            cached = self._fk_cache.get(key.tobytes())
+            if cached is None:
+                missing.append(row)
+            else:
+                positions[row] = cached
+        
+        if missing:
+            transforms = self.kinematics_solver.forward_kinematics_batch(configs[missing])
+            if transforms is None:
+                return None
+            
+            positions[missing] = transforms[:, :3, 3]
+            for row in missing:
+                self._fk_cache[keys[row].tobytes()] = positions[row].copy()
+            while len(self._fk_cache) > self.fk_cache_size:
+                self._fk_cache.popitem(last=False)
+        
+        return positions
+    
+    def check_collision_batch(self, points_xyz: np.ndarray) -> np.ndarray:
+        """
+        批量检查末端位置点是否落入障碍物
+        
+        Args:
+            points_xyz: 位置点矩阵 (M, 3)
+            
+        Returns:
+            每个点是否碰撞，形状 (M,) 的bool数组
+        """
+        points = np.asarray(points_xyz, dtype=np.float64).reshape(-1, 3)
+        
+        hit = np.zeros(len(points), dtype=bool)
+        if len(self._box_c):
+            inside = np.abs(points[:, None, :] - self._box_c[None]) <= self._box_h[None]
+            hit |= inside.all(axis=2).any(axis=1)
+        if len(self._sph_c):
+            dist_sq = ((points[:, None, :] - self._sph_c[None]) ** 2).sum(axis=-1)
+            hit |= (dist_sq <= self._sph_r2[None]).any(axis=1)
+        return hit
+    
+    def _rebuild_obstacle_arrays(self):
+        """根据障碍物列表重建盒子/球体SoA数组（圆柱等其他类型不参与检测）"""
+        boxes = [o for o in self.obstacles if o.type == "box"]
+        spheres = [o for o in self.obstacles if o.type == "sphere"]
+        
+        self._box_c = np.array([o.center for o in boxes], dtype=np.float64).reshape(-1, 3)
+        self._box_h = np.array([o.size for o in boxes], dtype=np.float64).reshape(-1, 3) / 2
+        self._sph_c = np.array([o.center for o in spheres], dtype=np.float64).reshape(-1, 3)
+        self._sph_r2 = (np.array([o.size[0] for o in spheres], dtype=np.float64) / 2) ** 2
+        
+        if len(self._box_c) or len(self._sph_c):
+            sphere_radii = np.sqrt(self._sph_r2)[:, None]
+            self._obstacles_aabb_min = np.vstack([self._box_c - self._box_h,
+                                                  self._sph_c - sphere_radii]).min(axis=0)
+            self._obstacles_aabb_max = np.vstack([self._box_c + self._box_h,
+                                                  self._sph_c + sphere_radii]).max(axis=0)
+        else:
+            self._obstacles_aabb_min = None
+            self._obstacles_aabb_max = None
+    
+    def _append_obstacle_arrays(self, obstacle: Obstacle):
+        """把新障碍物的半尺寸/半径平方一次算好追加到SoA数组，并扩展障碍物总包围盒"""
+        center = np.asarray(obstacle.center, dtype=np.float64).reshape(1, 3)
         if obstacle.type == "box":
-            return self._check_point_box_collision(point, obstacle)
+            half_size = np.asarray(obstacle.size, dtype=np.float64).reshape(1, 3) / 2
+            self._box_c = np.vstack([self._box_c, center])
+            self._box_h = np.vstack([self._box_h, half_size])
         elif obstacle.type == "sphere":
-            return self._check_point_sphere_collision(point, obstacle)
+            radius = obstacle.size[0] / 2
+            half_size = np.full((1, 3), radius)
+            self._sph_c = np.vstack([self._sph_c, center])
+            self._sph_r2 = np.append(self._sph_r2, radius * radius)
         else:
-            return False
-    
-    def _check_point_box_collision(self, point: List[float], obstacle: Obstacle) -> bool:
-        """检查点与盒子的碰撞"""
-        center = obstacle.center
-        size = obstacle.size
+            return  # 圆柱等其他类型不参与检测
         
-        for i in range(3):
-            if abs(point[i] - center[i]) > size[i] / 2:
-                return False
-        return True
+        lo = (center - half_size)[0]
+        hi = (center + half_size)[0]
+        if self._obstacles_aabb_min is None:
+            self._obstacles_aabb_min, self._obstacles_aabb_max = lo, hi
+        else:
+            self._obstacles_aabb_min = np.minimum(self._obstacles_aabb_min, lo)
+            self._obstacles_aabb_max = np.maximum(self._obstacles_aabb_max, hi)
+
+
+class RRTTree:
+    """
+    RRT树（SoA存储）
+    
+    配置矩阵、父节点索引、累计代价按节点行存放，容量不足时倍增；
+    最近邻查询由批量重建的KD树回答。
+    """
+    
+    def __init__(self, dof: int = 10, initial_capacity: int = 1024):
+        """初始化RRT树存储"""
+        self.initial_capacity = initial_capacity
+        self._allocate(initial_capacity, dof)
+        self.node_count = 0
+        
+        # 最近邻KD树：只索引前 _kdtree_size 个节点，新增节点积累到一定数量后批量重建
+        self._kdtree: Optional[cKDTree] = None
+        self._kdtree_size = 0
+    
+    def reset(self, root_config: np.ndarray):
+        """以给定配置为根重置树"""
+        dof = len(root_config)
+        if self.configs.shape[1] != dof:
+            # 三个数组同时重新分配，保持容量一致
+            self._allocate(len(self.parents), dof)
+        
+        self.configs[0] = root_config
+        self.parents[0] = -1
+        self.costs[0] = 0.0
+        self.node_count = 1
+        self._kdtree = None
+        self._kdtree_size = 0
     
-    def _check_point_sphere_collision(self, point: List[float], obstacle: Obstacle) -> bool:
-        """检查点与球体的碰撞"""
-        center = obstacle.center
-        radius = obstacle.size[0] / 2  # 假设size[0]是直径
+    def _allocate(self, capacity: int, dof: int):
+        """按容量与自由度分配节点存储（不保留已有节点）"""
+        self.configs = np.empty((capacity, dof), dtype=np.float64)
+        self.parents = np.empty(capacity, dtype=np.int32)
+        self.costs = np.empty(capacity, dtype=np.float64)
+    
+    def add_node(self, config: np.ndarray, parent_id: int, cost: float) -> int:
+        """添加节点，返回新节点索引"""
+        node_id = self.node_count
+        if node_id == len(self.parents):
+            self._grow()
+        
+        self.configs[node_id] = config
+        self.parents[node_id] = parent_id
+        self.costs[node_id] = cost
+        self.node_count += 1
+        return node_id
+    
+    def _grow(self):
+        """存储容量倍增"""
+        capacity = len(self.parents) * 2
+        
+        configs = np.empty((capacity, self.configs.shape[1]), dtype=np.float64)
+        configs[:self.node_count] = self.configs[:self.node_count]
+        parents = np.empty(capacity, dtype=np.int32)
+        parents[:self.node_count] = self.parents[:self.node_count]
+        costs = np.empty(capacity, dtype=np.float64)
+        costs[:self.node_count] = self.costs[:self.node_count]
+        
+        self.configs, self.parents, self.costs = configs, parents, costs
+    
+    def nearest(self, target_config: np.ndarray) -> int:
+        """
+        找到最近的树节点
+        
+        已索引的前缀用KD树查询（O(log N)），尚未索引的少量新节点暴力比较；
+        未索引节点数超过 max(64, N/4) 时重建KD树。
+        """
+        node_count = self.node_count
+        if node_count - self._kdtree_size > max(64, node_count // 4):
+            self._kdtree = cKDTree(self.configs[:node_count])
+            self._kdtree_size = node_count
+        
+        nearest_id = 0
+        min_dist_sq = np.inf
+        
+        if self._kdtree is not None:
+            distance, index = self._kdtree.query(target_config, k=1)
+            nearest_id = int(index)
+            min_dist_sq = distance * distance
+        
+        if self._kdtree_size < node_count:
+            diffs = self.configs[self._kdtree_size:node_count] - target_config
+            dist_sq = np.einsum('ij,ij->i', diffs, diffs)
+            tail_id = int(np.argmin(dist_sq))
+            if dist_sq[tail_id] < min_dist_sq:
+                nearest_id = self._kdtree_size + tail_id
         
-        distance = math.sqrt(sum((point[i] - center[i])**2 for i in range(3)))
-        return distance <= radius
+        return nearest_id
+    
+    def branch(self, node_id: int) -> List[List[float]]:
+        """沿父节点索引回溯，返回从根到指定节点的配置序列"""
+        branch = []
+        while node_id >= 0:
+            branch.append(self.configs[node_id].tolist())
+            node_id = int(self.parents[node_id])
+        
+        branch.reverse()
+        return branch
 
 
 class RRTPlanner:
@@ -139,6 +407,19 @@ class RRTPlanner:
         self.goal_tolerance = 0.1
         self.goal_sample_rate = 0.1  # 10%概率采样目标
         
+        # RRT树：起点树；RRT-Connect额外使用以目标为根的第二棵树
+        self.initial_capacity = 1024
+        self._tree = RRTTree(10, self.initial_capacity)
+        self._goal_tree = RRTTree(10, self.initial_capacity)
+        
+        # 采样用随机数发生器与关节限位（每次规划开始时缓存一次）
+        self._rng = np.random.default_rng()
+        self._lo: Optional[np.ndarray] = None
+        self._hi: Optional[np.ndarray] = None
+        
+        # 距离/扩展内核，每次规划开始时按配置维数选择（10自由度使用专用版本）
+        self._distance_kernel, self._steer_kernel = _rrt_kernels.kernels_for_dof(10)
+        
     @log_performance
     def plan(self, start_config: List[float], goal_config: List[float]) -> PlanningResult:
         """
@@ -154,63 +435,125 @@ class RRTPlanner:
         start_time = time.time()
         
         try:
-            # 检查起始和目标配置
-            if self.collision_checker.check_collision(start_config):
-                return PlanningResult(
-                    success=False,
-                    error_message="起始配置发生碰撞",
-                    computation_time=time.time() - start_time
-                )
+            # 整个规划过程统一使用 float64 ndarray，避免循环内 list/ndarray 往返转换
+            start_config = np.asarray(start_config, dtype=np.float64)
+            goal_config = np.asarray(goal_config, dtype=np.float64)
             
-            if self.collision_checker.check_collision(goal_config):
-                return PlanningResult(
-                    success=False,
-                    error_message="目标配置发生碰撞",
-                    computation_time=time.time() - start_time
-                )
+            error_result = self._check_endpoints(start_config, goal_config, start_time)
+            if error_result is not None:
+                return error_result
             
             # 初始化RRT树
-            tree = {0: {'config': start_config, 'parent': None, 'cost': 0.0}}
-            node_count = 1
+            tree = self._tree
+            tree.reset(start_config)
+            self._cache_joint_limits(len(start_config))
+            self._distance_kernel, self._steer_kernel = _rrt_kernels.kernels_for_dof(len(start_config))
             
             for iteration in range(self.max_iterations):
                 # 采样随机配置
-                if np.random.random() < self.goal_sample_rate:
+                if self._rng.random() < self.goal_sample_rate:
                     rand_config = goal_config
                 else:
                     rand_config = self._sample_random_config()
                 
-                # 找到最近节点
-                nearest_id = self._find_nearest_node(tree, rand_config)
-                nearest_config = tree[nearest_id]['config']
-                
                 # 扩展树
-                new_config = self._steer(nearest_config, rand_config)
+                new_id = self._extend(tree, rand_config)
+                if new_id < 0:
+                    continue
                 
-                # 检查路径是否无碰撞
-                if self._is_path_collision_free(nearest_config, new_config):
-                    # 添加新节点
-                    cost = tree[nearest_id]['cost'] + self._distance(nearest_config, new_config)
-                    tree[node_count] = {
-                        'config': new_config,
-                        'parent': nearest_id,
-                        'cost': cost
-                    }
+                # 检查是否到达目标
+                new_config = tree.configs[new_id]
+                if self._distance(new_config, goal_config) < self.goal_tolerance:
+                    # 构建路径
+                    path = tree.branch(new_id)
+                    path.append(goal_config.tolist())
                     
-                    # 检查是否到达目标
-                    if self._distance(new_config, goal_config) < self.goal_tolerance:
-                        # 构建路径
-                        path = self._build_path(tree, node_count, goal_config)
+                    return PlanningResult(
+                        success=True,
+                        path=path,
+                        cost=float(tree.costs[new_id]),
+                        computation_time=time.time() - start_time,
+                        iterations=iteration + 1
+                    )
+            
+            # 未找到路径
+            return PlanningResult(
+                success=False,
+                error_message="超过最大迭代次数",
+                computation_time=time.time() - start_time,
+                iterations=self.max_iterations
+            )
+            
+        except Exception as e:
+            logger.error(f"RRT规划失败: {e}")
+            return PlanningResult(
+                success=False,
+                error_message=str(e),
+                computation_time=time.time() - start_time
+            )
+    
+    @log_performance
+    def plan_connect(self, start_config: List[float], goal_config: List[float]) -> PlanningResult:
+        """
+        RRT-Connect双向路径规划
+        
+        起点树与目标树交替扩展：一棵树向采样点扩展一步，另一棵树随即
+        朝新节点连续扩展直至到达或受阻；两树相遇时拼接路径。
+        
+        Args:
+            start_config: 起始关节配置
+            goal_config: 目标关节配置
+            
+        Returns:
+            规划结果
+        """
+        start_time = time.time()
+        
+        try:
+            start_config = np.asarray(start_config, dtype=np.float64)
+            goal_config = np.asarray(goal_config, dtype=np.float64)
+            
+            error_result = self._check_endpoints(start_config, goal_config, start_time)
+            if error_result is not None:
+                return error_result
+            
+            # 初始化双向树
+            start_tree, goal_tree = self._tree, self._goal_tree
+            start_tree.reset(start_config)
+            goal_tree.reset(goal_config)
+            self._cache_joint_limits(len(start_config))
+            self._distance_kernel, self._steer_kernel = _rrt_kernels.kernels_for_dof(len(start_config))
+            
+            tree_a, tree_b = start_tree, goal_tree
+            for iteration in range(self.max_iterations):
+                # 采样随机配置（以一定概率偏向另一棵树的根）
+                if self._rng.random() < self.goal_sample_rate:
+                    rand_config = tree_b.configs[0]
+                else:
+                    rand_config = self._sample_random_config()
+                
+                new_id = self._extend(tree_a, rand_config)
+                if new_id >= 0:
+                    connect_id, reached = self._connect(tree_b, tree_a.configs[new_id])
+                    if reached:
+                        # 两树相遇：起点树分支 + 目标树分支（反向，去掉重复的相遇点）
+                        if tree_a is start_tree:
+                            start_id, goal_id = new_id, connect_id
+                        else:
+                            start_id, goal_id = connect_id, new_id
+                        
+                        path = start_tree.branch(start_id) + goal_tree.branch(goal_id)[::-1][1:]
+                        cost = start_tree.costs[start_id] + goal_tree.costs[goal_id]
                         
                         return PlanningResult(
                             success=True,
                             path=path,
-                            cost=cost,
+                            cost=float(cost),
                             computation_time=time.time() - start_time,
                             iterations=iteration + 1
                         )
-                    
-                    node_count += 1
+                
+                tree_a, tree_b = tree_b, tree_a
             
             # 未找到路径
             return PlanningResult(
@@ -221,91 +564,95 @@ class RRTPlanner:
             )
             
         except Exception as e:
-            logger.error(f"RRT规划失败: {e}")
+            logger.error(f"RRT-Connect规划失败: {e}")
             return PlanningResult(
                 success=False,
                 error_message=str(e),
                 computation_time=time.time() - start_time
             )
     
-    def _sample_random_config(self) -> List[float]:
-        """采样随机关节配置"""
-        config = []
+    def _check_endpoints(self, start_config: np.ndarray, goal_config: np.ndarray,
+                         start_time: float) -> Optional[PlanningResult]:
+        """检查起始和目标配置，发生碰撞时返回失败结果"""
+        if self.collision_checker.check_collision(start_config):
+            return PlanningResult(
+                success=False,
+                error_message="起始配置发生碰撞",
+                computation_time=time.time() - start_time
+            )
         
-        # 获取关节限位
-        if self.kinematics_solver.is_enabled():
-            robot_info = self.kinematics_solver.get_robot_info()
-            joint_limits = robot_info.get('joint_limits', [])
-        else:
-            joint_limits = []
+        if self.collision_checker.check_collision(goal_config):
+            return PlanningResult(
+                success=False,
+                error_message="目标配置发生碰撞",
+                computation_time=time.time() - start_time
+            )
         
-        for i in range(10):
-            if i < len(joint_limits):
-                min_limit, max_limit = joint_limits[i]
-                angle = np.random.uniform(min_limit, max_limit)
-            else:
-                angle = np.random.uniform(-np.pi, np.pi)
-            config.append(angle)
+        return None
+    
+    def _extend(self, tree: RRTTree, target_config: np.ndarray) -> int:
+        """树向目标配置扩展一步，返回新节点索引；受阻时返回-1"""
+        nearest_id = tree.nearest(target_config)
+        nearest_config = tree.configs[nearest_id]
+        new_config = self._steer(nearest_config, target_config)
+        
+        if not self._is_path_collision_free(nearest_config, new_config):
+            return -1
         
-        return config
+        cost = tree.costs[nearest_id] + self._distance(nearest_config, new_config)
+        return tree.add_node(new_config, nearest_id, cost)
     
-    def _find_nearest_node(self, tree: Dict, target_config: List[float]) -> int:
-        """找到最近的树节点"""
-        min_distance = float('inf')
-        nearest_id = 0
+    def _connect(self, tree: RRTTree, target_config: np.ndarray) -> Tuple[int, bool]:
+        """
+        树朝目标配置连续扩展，直至到达或受阻
+        
+        Returns:
+            (最后到达的节点索引, 是否到达目标配置)
+        """
+        node_id = tree.nearest(target_config)
+        while True:
+            current_config = tree.configs[node_id]
+            new_config = self._steer(current_config, target_config)
+            if not self._is_path_collision_free(current_config, new_config):
+                return node_id, False
+            
+            step = self._distance(current_config, new_config)
+            node_id = tree.add_node(new_config, node_id, tree.costs[node_id] + step)
+            
+            # steer 在距离不超过步长时直接返回目标配置
+            if self._distance(new_config, target_config) == 0.0:
+                return node_id, True
+    
+    def _cache_joint_limits(self, dof: int = 10):
+        """缓存关节限位上下界，缺失的关节默认 ±π"""
+        lo = np.full(dof, -np.pi, dtype=np.float64)
+        hi = np.full(dof, np.pi, dtype=np.float64)
         
-        for node_id, node_data in tree.items():
-            distance = self._distance(node_data['config'], target_config)
-            if distance < min_distance:
-                min_distance = distance
-                nearest_id = node_id
+        if self.kinematics_solver.is_enabled():
+            joint_limits = self.kinematics_solver.get_robot_info().get('joint_limits', [])
+            for i, (min_limit, max_limit) in enumerate(joint_limits[:dof]):
+                lo[i] = min_limit
+                hi[i] = max_limit
         
-        return nearest_id
+        self._lo, self._hi = lo, hi
     
-    def _distance(self, config1: List[float], config2: List[float]) -> float:
+    def _sample_random_config(self) -> np.ndarray:
+        """采样随机关节配置"""
+        if self._lo is None:
+            self._cache_joint_limits()
+        return self._rng.uniform(self._lo, self._hi)
+    
+    def _distance(self, config1: np.ndarray, config2: np.ndarray) -> float:
         """计算关节配置间的距离"""
-        return math.sqrt(sum((a - b)**2 for a, b in zip(config1, config2)))
+        return self._distance_kernel(config1, config2)
     
-    def _steer(self, from_config: List[float], to_config: List[float]) -> List[float]:
+    def _steer(self, from_config: np.ndarray, to_config: np.ndarray) -> np.ndarray:
         """从一个配置向另一个配置扩展"""
-        direction = np.array(to_config) - np.array(from_config)
-        distance = np.linalg.norm(direction)
-        
-        if distance <= self.step_size:
-            return to_config
-        
-        unit_direction = direction / distance
-        new_config = np.array(from_config) + self.step_size * unit_direction
-        
-        return new_config.tolist()
+        return self._steer_kernel(from_config, to_config, self.step_size)
     
-    def _is_path_collision_free(self, config1: List[float], config2: List[float]) -> bool:
+    def _is_path_collision_free(self, config1: np.ndarray, config2: np.ndarray) -> bool:
         """检查两个配置间的路径是否无碰撞"""
-        # 简单的线性插值检查
-        num_checks = 10
-        
-        for i in range(num_checks + 1):
-            alpha = i / num_checks
-            intermediate_config = [
-                c1 + alpha * (c2 - c1) for c1, c2 in zip(config1, config2)
-            ]
-            
-            if self.collision_checker.check_collision(intermediate_config):
-                return False
-        
-        return True
-    
-    def _build_path(self, tree: Dict, goal_node_id: int, goal_config: List[float]) -> List[List[float]]:
-        """构建从起点到终点的路径"""
-        path = [goal_config]
-        current_id = goal_node_id
-        
-        while current_id is not None:
-            path.append(tree[current_id]['config'])
-            current_id = tree[current_id]['parent']
-        
-        path.reverse()
-        return path
+        return not self.collision_checker.check_segment_collision(config1, config2, num_checks=10)
 
 
 class AdvancedMotionPlanner:
@@ -396,6 +743,8 @@ class AdvancedMotionPlanner:
         try:
             if algorithm == PlanningAlgorithm.RRT:
                 return self.rrt_planner.plan(start_config, goal_config)
+            elif algorithm == PlanningAlgorithm.RRT_CONNECT:
+                return self.rrt_planner.plan_connect(start_config, goal_config)
             else:
                 return PlanningResult(
                     success=False,
@@ -423,22 +772,25 @@ class AdvancedMotionPlanner:
             return path
         
         try:
-            # 简单的路径平滑
+            # 简单的路径平滑：从每个点出发，跳到可无碰撞直连的最远点
+            waypoints = np.asarray(path, dtype=np.float64)
             optimized_path = [path[0]]  # 起点
             
             i = 0
             while i < len(path) - 1:
-                # 尝试直接连接到更远的点
-                for j in range(len(path) - 1, i + 1, -1):
-                    if self.collision_checker._is_path_collision_free(path[i], path[j]):
-                        optimized_path.append(path[j])
-                        i = j
-                        break
+                # 一次批量检测 i -> i+2..N-1 的所有候选捷径
+                candidates = waypoints[i + 2:]
+                valid_ids = []
+                if len(candidates):
+                    hit = self.collision_checker.check_segments_collision(waypoints[i], candidates)
+                    valid_ids = np.flatnonzero(~hit)
+                
+                if len(valid_ids):
+                    i = i + 2 + int(valid_ids[-1])
                 else:
                     # 无法跳跃，添加下一个点
                     i += 1
-                    if i < len(path):
-                        optimized_path.append(path[i])
+                optimized_path.append(path[i])
             
             logger.info(f"路径优化: {len(path)} -> {len(optimized_path)} 个点")
             return optimized_path
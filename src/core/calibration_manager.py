@@ -10,23 +10,46 @@
 """
 
 import time
+import queue
+import atexit
 import threading
 from typing import List, Dict, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
-from datetime import datetime
+from dataclasses import dataclass
+import numpy as np
 import yaml
 import os
+import hashlib
+
+try:
+    # libyaml C实现，解析/序列化比纯Python实现快一个数量级
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
 
 from utils.logger import get_logger, log_performance
 from utils.config_manager import get_config_manager
 from utils.message_bus import get_message_bus, Topics, MessagePriority
+from utils.rwlock import RWLock
+from core import _calibration_kernels
 from hardware.serial_manager import get_serial_manager
-from hardware.protocol_handler import get_protocol_handler
+from hardware.protocol_handler import get_protocol_handler, BoardID
 
 logger = get_logger(__name__)
 
+# 当前秒的格式化时间缓存 (整数秒, 字符串)，同一秒内重复调用直接复用
+_now_cache: Tuple[int, str] = (-1, "")
+
+
+def _fmt_now() -> str:
+    """当前本地时间，格式 YYYY-MM-DD HH:MM:SS"""
+    global _now_cache
+    now = int(time.time())
+    if now != _now_cache[0]:
+        _now_cache = (now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)))
+    return _now_cache[1]
 
-@dataclass
+
+@dataclass(slots=True)
 class CalibrationData:
     """标定数据"""
     calibrated_at: str
@@ -44,15 +67,35 @@ class CalibrationData:
             self.max_positions = [3000] * 10
 
 
-@dataclass
+def _to_dict(cd: CalibrationData) -> Dict[str, Any]:
+    """标定数据转字典（字段均为基本类型，直接构造，比 asdict 的递归深拷贝快）"""
+    return {
+        'calibrated_at': cd.calibrated_at,
+        'calibration_method': cd.calibration_method,
+        'zero_offsets': list(cd.zero_offsets),
+        'max_positions': list(cd.max_positions),
+        'is_calibrated': cd.is_calibrated,
+        'operator': cd.operator,
+        'notes': cd.notes,
+    }
+
+
+@dataclass(slots=True, frozen=True)
 class CalibrationResult:
-    """标定结果"""
+    """标定结果（不可变，可安全共享）"""
     success: bool
     positions: Optional[List[int]] = None
     error_message: Optional[str] = None
     timestamp: Optional[str] = None
 
 
+# 10个关节全部收到时的位掩码
+_ALL_JOINTS_MASK = (1 << 10) - 1
+
+# 串口未连接时的结果（空闲时最常见的返回值，共享同一不可变实例）
+_RESULT_NOT_CONNECTED = CalibrationResult(success=False, error_message="串口未连接，请先连接硬件")
+
+
 class CalibrationManager:
     """标定管理器"""
     
@@ -65,18 +108,54 @@ class CalibrationManager:
         
         # 标定数据
         self.calibration_data = CalibrationData(
-            calibrated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            calibrated_at=_fmt_now()
         )
         
+        # 标定数据的数组/限位表形式与摘要缓存，每次标定数据变更后重建（版本号递增）
+        self._rev = 0
+        self._summary_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+        self._zero_np = np.zeros(10, dtype=np.int32)
+        self._max_np = np.full(10, 3000, dtype=np.int32)
+        self._zero_tuple: Tuple[int, ...] = ()
+        self._max_tuple: Tuple[int, ...] = ()
+        self._joint_limits_tuple: Tuple[Tuple[int, int], ...] = ()
+        self._hardware_limits_tuple: Tuple[Tuple[int, int], ...] = ()
+        self._hw_bounds = np.empty((2, 10), dtype=np.int32)  # 第0行硬件下限，第1行硬件上限
+        self._on_calibration_changed()
+        
+        # 预先调用一次转换内核：安装numba时在此完成编译，避免首个控制周期卡顿
+        self.apply_calibration_fast(np.zeros(10, dtype=np.int32))
+        
         # 状态管理
         self.is_calibrating = False
-        self.calibration_lock = threading.RLock()
+        # 标定数据读写锁：高频读取（位置转换、限位查询）可并行，修改时独占；不可重入
+        self._rw = RWLock()
+        
+        # 关节状态反馈：状态回调直接写入位置数组并更新位掩码，全部关节到齐时置位事件，
+        # 读取位置时只需等待一次事件
+        self._status_lock = threading.Lock()
+        self._all_joints_received_event = threading.Event()
+        self._live_positions = np.zeros(10, dtype=np.int32)
+        self._received_mask = 0  # 已收到的关节位掩码，bit i 对应关节 i
+        self.message_bus.subscribe(Topics.ROBOT_STATE, self._on_robot_state)
+        
+        # 标定历史后台写入：保存时只入队记录，后台线程合并积压记录后一次写盘
+        self._history_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._history_thread = threading.Thread(
+            target=self._history_writer_loop, name="CalibrationHistoryWriter", daemon=True
+        )
+        self._history_thread.start()
+        # 写入线程为守护线程，程序退出时先等待已入队的历史记录写盘，避免丢失
+        atexit.register(self.flush_history)
         
         # 配置文件路径
         self.config_dir = "config"
         self.calibration_file = os.path.join(self.config_dir, "calibration_data.yaml")
         self.history_file = os.path.join(self.config_dir, "calibration_history.yaml")
         
+        self._last_written_hash: Optional[bytes] = None  # 上次写入的标定文件内容摘要
+        self._last_pushed_config: Optional[Tuple] = None  # 上次同步到主配置的 (标定数据, 用户限位, 硬件限位)
+        
         # 确保配置目录存在
         os.makedirs(self.config_dir, exist_ok=True)
         
@@ -100,79 +179,82 @@ class CalibrationManager:
         Returns:
             标定结果
         """
-        with self.calibration_lock:
-            try:
-                # 检查连接
-                if not self.serial_manager.is_connected():
-                    return CalibrationResult(
-                        success=False,
-                        error_message="串口未连接，请先连接硬件"
-                    )
-                
-                logger.info("开始读取当前关节位置")
-                
-                # 发送状态查询指令
-                query_command = self.protocol_handler.encode_status_query()
+        # 等待反馈期间不持有标定锁，避免阻塞其他标定操作
+        try:
+            # 检查连接
+            if not self.serial_manager.is_connected():
+                return _RESULT_NOT_CONNECTED
+            
+            logger.info("开始读取当前关节位置")
+            
+            # 丢弃查询之前收到的状态
+            with self._status_lock:
+                self._received_mask = 0
+                self._all_joints_received_event.clear()
+            
+            # 发送状态查询指令（手臂板与手腕板分别查询）
+            for board_id in (BoardID.ARM_BOARD, BoardID.WRIST_BOARD):
+                query_command = self.protocol_handler.encode_query_command(board_id)
                 self.serial_manager.send_data(query_command)
-                
-                # 等待接收反馈数据
-                positions = []
-                start_time = time.time()
-                received_joints = set()
-                
-                while len(received_joints) < 10 and (time.time() - start_time) < timeout:
-                    # 检查是否有新的状态数据
-                    # 这里需要从消息总线获取最新的关节状态
-                    # 实际实现中需要根据具体的协议处理逻辑调整
-                    
-                    # 模拟接收数据的过程
-                    time.sleep(0.1)
-                    
-                    # 从协议处理器获取最新状态
-                    latest_status = self._get_latest_joint_status()
-                    if latest_status:
-                        for joint_id, position in latest_status.items():
-                            if joint_id not in received_joints:
-                                received_joints.add(joint_id)
-                                if len(positions) <= joint_id:
-                                    positions.extend([0] * (joint_id + 1 - len(positions)))
-                                positions[joint_id] = position
-                
-                # 检查是否成功接收所有关节数据
-                if len(received_joints) < 10:
-                    missing_joints = set(range(10)) - received_joints
-                    return CalibrationResult(
-                        success=False,
-                        error_message=f"读取超时，缺少关节数据: {list(missing_joints)}"
-                    )
-                
-                # 确保位置数组长度为10
-                while len(positions) < 10:
-                    positions.append(1500)  # 默认中位
-                
-                logger.info(f"成功读取关节位置: {positions}")
-                
-                return CalibrationResult(
-                    success=True,
-                    positions=positions[:10],  # 确保只返回10个关节
-                    timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                )
-                
-            except Exception as e:
-                logger.error(f"读取关节位置失败: {e}")
+            
+            # 等待全部关节反馈到齐（由状态回调置位）
+            self._all_joints_received_event.wait(timeout)
+            
+            with self._status_lock:
+                received_mask = self._received_mask
+                positions = self._live_positions.tolist()
+            
+            # 检查是否成功接收所有关节数据
+            if received_mask != _ALL_JOINTS_MASK:
+                missing_joints = [i for i in range(10) if not (received_mask >> i) & 1]
                 return CalibrationResult(
                     success=False,
-                    error_message=f"读取失败: {str(e)}"
+                    error_message=f"读取超时，缺少关节数据: {missing_joints}"
                 )
+            
+            logger.info(f"成功读取关节位置: {positions}")
+            
+            return CalibrationResult(
+                success=True,
+                positions=positions,
+                timestamp=_fmt_now()
+            )
+            
+        except Exception as e:
+            logger.error(f"读取关节位置失败: {e}")
+            return CalibrationResult(
+                success=False,
+                error_message=f"读取失败: {str(e)}"
+            )
     
-    def _get_latest_joint_status(self) -> Optional[Dict[int, int]]:
-        """获取最新的关节状态（模拟实现）"""
-        # 这里应该从实际的硬件状态获取数据
-        # 为了演示，返回模拟数据
-        return {
-            0: 1523, 1: 1487, 2: 1501, 3: 1495, 4: 1512,
-            5: 1488, 6: 1502, 7: 1497, 8: 1505, 9: 1493
-        }
+    def _on_robot_state(self, message):
+        """机器人状态回调：记录各关节最新位置，全部关节到齐时唤醒等待中的读取"""
+        try:
+            data = message.data
+            if not isinstance(data, dict):
+                return
+            
+            if 'joints' in data:
+                joints = [(joint.get('id'), joint.get('position')) for joint in data['joints']]
+            elif 'data' in data and hasattr(data['data'], 'joints'):
+                joints = [(joint.joint_id, joint.position) for joint in data['data'].joints]
+            else:
+                return
+            
+            with self._status_lock:
+                received_mask = self._received_mask
+                for joint_id, position in joints:
+                    if joint_id is not None and 0 <= joint_id < 10:
+                        bit = 1 << joint_id
+                        if not received_mask & bit:
+                            received_mask |= bit
+                            self._live_positions[joint_id] = position
+                self._received_mask = received_mask
+                if received_mask == _ALL_JOINTS_MASK:
+                    self._all_joints_received_event.set()
+            
+        except Exception as e:
+            logger.error(f"处理关节状态失败: {e}")
     
     def set_zero_positions(self, positions: List[int], notes: str = "") -> bool:
         """
@@ -185,42 +267,44 @@ class CalibrationManager:
         Returns:
             是否成功
         """
-        with self.calibration_lock:
-            try:
-                # 验证数据
-                if len(positions) != 10:
-                    logger.error(f"位置数据长度错误: {len(positions)} != 10")
+        try:
+            # 验证数据
+            if len(positions) != 10:
+                logger.error(f"位置数据长度错误: {len(positions)} != 10")
+                return False
+            
+            # 验证位置合理性
+            for i, pos in enumerate(positions):
+                if pos < 0 or pos > 4095:  # 假设硬件范围0-4095
+                    logger.error(f"关节{i}位置超出范围: {pos}")
                     return False
-                
-                # 验证位置合理性
-                for i, pos in enumerate(positions):
-                    if pos < 0 or pos > 4095:  # 假设硬件范围0-4095
-                        logger.error(f"关节{i}位置超出范围: {pos}")
-                        return False
-                
-                # 更新标定数据
+            
+            # 更新标定数据（仅修改数据时持锁）
+            with self._rw.gen_wlock():
                 self.calibration_data.zero_offsets = positions.copy()
-                self.calibration_data.calibrated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                self.calibration_data.calibrated_at = _fmt_now()
                 self.calibration_data.notes = notes
-                
-                logger.info(f"设置归零位置: {positions}")
-                
-                # 发布标定更新事件
-                self.message_bus.publish(
-                    Topics.CALIBRATION_UPDATED,
-                    {
-                        'type': 'zero_positions',
-                        'positions': positions,
-                        'timestamp': self.calibration_data.calibrated_at
-                    },
-                    MessagePriority.HIGH
-                )
-                
-                return True
-                
-            except Exception as e:
-                logger.error(f"设置归零位置失败: {e}")
-                return False
+                self._on_calibration_changed()
+                calibrated_at = self.calibration_data.calibrated_at
+            
+            logger.info(f"设置归零位置: {positions}")
+            
+            # 发布标定更新事件
+            self.message_bus.publish(
+                Topics.CALIBRATION_UPDATED,
+                {
+                    'type': 'zero_positions',
+                    'positions': positions,
+                    'timestamp': calibrated_at
+                },
+                MessagePriority.HIGH
+            )
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"设置归零位置失败: {e}")
+            return False
     
     def set_max_positions(self, positions: List[int], notes: str = "") -> bool:
         """
@@ -233,50 +317,51 @@ class CalibrationManager:
         Returns:
             是否成功
         """
-        with self.calibration_lock:
-            try:
-                # 验证数据
-                if len(positions) != 10:
-                    logger.error(f"位置数据长度错误: {len(positions)} != 10")
+        try:
+            # 验证数据
+            if len(positions) != 10:
+                logger.error(f"位置数据长度错误: {len(positions)} != 10")
+                return False
+            
+            # 最大行程依赖当前0位，计算与更新在同一次持锁内完成
+            with self._rw.gen_wlock():
+                # 计算相对于0位的最大行程（整体相减，只在有非法关节时报告第一个）
+                travel = np.asarray(positions, dtype=np.int32) - self._zero_np
+                bad = np.flatnonzero(travel <= 0)
+                if bad.size:
+                    i = bad[0]
+                    logger.error(f"关节{i}最大位置小于等于0位: "
+                                 f"{positions[i]} <= {self.calibration_data.zero_offsets[i]}")
                     return False
-                
-                # 计算相对于0位的最大行程
-                max_positions = []
-                for i, pos in enumerate(positions):
-                    zero_offset = self.calibration_data.zero_offsets[i]
-                    max_travel = pos - zero_offset
-                    
-                    if max_travel <= 0:
-                        logger.error(f"关节{i}最大位置小于等于0位: {pos} <= {zero_offset}")
-                        return False
-                    
-                    max_positions.append(max_travel)
+                max_positions = travel.tolist()
                 
                 # 更新标定数据
                 self.calibration_data.max_positions = max_positions
                 self.calibration_data.is_calibrated = True
-                self.calibration_data.calibrated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                self.calibration_data.calibrated_at = _fmt_now()
                 if notes:
                     self.calibration_data.notes += f"; {notes}"
-                
-                logger.info(f"设置最大位置: {max_positions}")
-                
-                # 发布标定更新事件
-                self.message_bus.publish(
-                    Topics.CALIBRATION_UPDATED,
-                    {
-                        'type': 'max_positions',
-                        'positions': max_positions,
-                        'timestamp': self.calibration_data.calibrated_at
-                    },
-                    MessagePriority.HIGH
-                )
-                
-                return True
-                
-            except Exception as e:
-                logger.error(f"设置最大位置失败: {e}")
-                return False
+                self._on_calibration_changed()
+                calibrated_at = self.calibration_data.calibrated_at
+            
+            logger.info(f"设置最大位置: {max_positions}")
+            
+            # 发布标定更新事件
+            self.message_bus.publish(
+                Topics.CALIBRATION_UPDATED,
+                {
+                    'type': 'max_positions',
+                    'positions': max_positions,
+                    'timestamp': calibrated_at
+                },
+                MessagePriority.HIGH
+            )
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"设置最大位置失败: {e}")
+            return False
     
     def apply_calibration(self, user_positions: List[int]) -> List[int]:
         """
@@ -288,17 +373,41 @@ class CalibrationManager:
         Returns:
             硬件空间位置（绝对位置）
         """
-        hardware_positions = []
+        return self.apply_calibration_np(user_positions).tolist()
+    
+    def apply_calibration_np(self, user_positions) -> np.ndarray:
+        """
+        将用户空间位置转换为硬件空间位置（数组版本，无列表往返）
         
-        for i, user_pos in enumerate(user_positions):
-            if i < len(self.calibration_data.zero_offsets):
-                hardware_pos = user_pos + self.calibration_data.zero_offsets[i]
-            else:
-                hardware_pos = user_pos
+        Args:
+            user_positions: 用户空间位置数组
             
-            hardware_positions.append(hardware_pos)
+        Returns:
+            硬件空间位置数组
+        """
+        user_positions = np.asarray(user_positions)
+        with self._rw.gen_rlock():
+            offsets = self._offsets_for(len(user_positions))
+        return user_positions + offsets
+    
+    def apply_calibration_fast(self, user_positions, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        将10个关节的用户空间位置转换为硬件空间位置，并限制在硬件限位内
         
-        return hardware_positions
+        加偏移与限位在同一内核中完成，供高频控制循环使用。
+        
+        Args:
+            user_positions: 用户空间位置数组 (10,)
+            out: 可选的输出数组 (10,) int32，传入时结果直接写入其中
+            
+        Returns:
+            限位后的硬件空间位置数组 (int32)
+        """
+        user_positions = np.asarray(user_positions, dtype=np.int32)
+        if out is None:
+            out = np.empty(10, dtype=np.int32)
+        bounds = self._hw_bounds
+        return _calibration_kernels.user_to_hw_clamped(user_positions, bounds[0], bounds[1], out)
     
     def reverse_calibration(self, hardware_positions: List[int]) -> List[int]:
         """
@@ -310,17 +419,42 @@ class CalibrationManager:
         Returns:
             用户空间位置（相对于0位）
         """
-        user_positions = []
+        return self.reverse_calibration_np(hardware_positions).tolist()
+    
+    def reverse_calibration_np(self, hardware_positions) -> np.ndarray:
+        """
+        将硬件空间位置转换为用户空间位置（数组版本，无列表往返）
         
-        for i, hardware_pos in enumerate(hardware_positions):
-            if i < len(self.calibration_data.zero_offsets):
-                user_pos = hardware_pos - self.calibration_data.zero_offsets[i]
-            else:
-                user_pos = hardware_pos
+        Args:
+            hardware_positions: 硬件空间位置数组
             
-            user_positions.append(user_pos)
-        
-        return user_positions
+        Returns:
+            用户空间位置数组
+        """
+        hardware_positions = np.asarray(hardware_positions)
+        with self._rw.gen_rlock():
+            offsets = self._offsets_for(len(hardware_positions))
+        return hardware_positions - offsets
+    
+    def _offsets_for(self, count: int) -> np.ndarray:
+        """长度为 count 的0位偏移数组，超出已标定关节的部分偏移为0"""
+        if count == len(self._zero_np):
+            return self._zero_np
+        offsets = np.zeros(count, dtype=np.int32)
+        n = min(count, len(self._zero_np))
+        offsets[:n] = self._zero_np[:n]
+        return offsets
+    
+    def _on_calibration_changed(self):
+        """标定数据变更后重建数组与限位表，并使摘要缓存失效"""
+        self._zero_np = np.asarray(self.calibration_data.zero_offsets, dtype=np.int32)
+        self._max_np = np.asarray(self.calibration_data.max_positions, dtype=np.int32)
+        self._zero_tuple = tuple(self.calibration_data.zero_offsets)
+        self._max_tuple = tuple(self.calibration_data.max_positions)
+        self._joint_limits_tuple = tuple(self._joint_limits(i) for i in range(10))
+        self._hardware_limits_tuple = tuple(self._hardware_limits(i) for i in range(10))
+        self._hw_bounds = np.array(self._hardware_limits_tuple, dtype=np.int32).T.copy()
+        self._rev += 1
     
     def get_joint_limits(self, joint_id: int) -> Tuple[int, int]:
         """
@@ -332,6 +466,13 @@ class CalibrationManager:
         Returns:
             (最小位置, 最大位置) 在用户空间
         """
+        # 限位表为不可变元组，整体替换，读取无需加锁
+        if 0 <= joint_id < 10:
+            return self._joint_limits_tuple[joint_id]
+        return (0, 3000)
+    
+    def _joint_limits(self, joint_id: int) -> Tuple[int, int]:
+        """用户空间限位（调用方负责加锁）"""
         if joint_id < 0 or joint_id >= 10:
             return (0, 3000)
         
@@ -350,6 +491,25 @@ class CalibrationManager:
         Returns:
             (最小位置, 最大位置) 在硬件空间
         """
+        if 0 <= joint_id < 10:
+            return self._hardware_limits_tuple[joint_id]
+        return (0, 4095)
+    
+    def clamp_hardware(self, hardware_positions) -> np.ndarray:
+        """
+        将10个关节的硬件空间位置限制在各自的硬件限位内
+        
+        Args:
+            hardware_positions: 硬件空间位置数组 (10,)
+            
+        Returns:
+            限位后的硬件空间位置数组
+        """
+        bounds = self._hw_bounds  # 上下限在同一数组中整体替换，保证读到同一版本
+        return np.clip(hardware_positions, bounds[0], bounds[1])
+    
+    def _hardware_limits(self, joint_id: int) -> Tuple[int, int]:
+        """硬件空间限位（调用方负责加锁）"""
         if joint_id < 0 or joint_id >= 10:
             return (0, 4095)
         
@@ -364,17 +524,29 @@ class CalibrationManager:
     def save_calibration(self) -> bool:
         """保存标定数据到配置文件"""
         try:
-            # 保存当前标定数据
-            calibration_dict = asdict(self.calibration_data)
+            # 保存当前标定数据（在读锁内取快照，写盘与历史记录使用同一份数据）
+            with self._rw.gen_rlock():
+                calibration_dict = _to_dict(self.calibration_data)
             
-            with open(self.calibration_file, 'w', encoding='utf-8') as f:
-                yaml.dump(calibration_dict, f, default_flow_style=False, allow_unicode=True)
+            content = yaml.dump(calibration_dict, Dumper=_YamlDumper, default_flow_style=False, allow_unicode=True)
+            digest = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+            
+            # 内容未变化且文件仍在时跳过标定文件写盘（历史记录与主配置照常处理）
+            if digest == self._last_written_hash and os.path.exists(self.calibration_file):
+                logger.debug("标定数据未变化，跳过写入标定文件")
+            else:
+                # 先写临时文件再替换，写入过程中断不会留下空文件
+                tmp_file = self.calibration_file + ".tmp"
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                os.replace(tmp_file, self.calibration_file)
+                self._last_written_hash = digest
             
-            # 保存到历史记录
-            self._save_to_history()
+            # 保存到历史记录（后台写入）
+            self._save_to_history(calibration_dict)
             
-            # 更新主配置文件
-            self._update_main_config()
+            # 更新主配置文件（内部与上次同步内容比较，未变化时不写盘；上次写入失败时会重试）
+            self._update_main_config(calibration_dict)
             
             logger.info(f"标定数据已保存到: {self.calibration_file}")
             return True
@@ -386,15 +558,18 @@ class CalibrationManager:
     def load_calibration(self) -> bool:
         """从配置文件加载标定数据"""
         try:
-            if not os.path.exists(self.calibration_file):
+            try:
+                with open(self.calibration_file, 'rb') as f:
+                    data = yaml.load(f, Loader=_YamlLoader)
+            except FileNotFoundError:
                 logger.info("标定文件不存在，使用默认标定数据")
                 return False
             
-            with open(self.calibration_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-            
             if data:
-                self.calibration_data = CalibrationData(**data)
+                calibration_data = CalibrationData(**data)
+                with self._rw.gen_wlock():
+                    self.calibration_data = calibration_data
+                    self._on_calibration_changed()
                 logger.info("标定数据加载成功")
                 return True
             else:
@@ -405,20 +580,45 @@ class CalibrationManager:
             logger.error(f"加载标定数据失败: {e}")
             return False
     
-    def _save_to_history(self):
-        """保存到标定历史"""
+    def _save_to_history(self, record: Dict[str, Any]):
+        """将标定记录加入历史写入队列，由后台线程写盘"""
+        self._history_queue.put(record)
+    
+    def flush_history(self):
+        """等待已入队的标定历史全部写盘"""
+        self._history_queue.join()
+    
+    def _history_writer_loop(self):
+        """标定历史写入线程：取出所有积压记录，合并为一次读改写"""
+        while True:
+            records = [self._history_queue.get()]
+            while True:
+                try:
+                    records.append(self._history_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                self._write_history(records)
+            finally:
+                for _ in records:
+                    self._history_queue.task_done()
+    
+    def _write_history(self, records: List[Dict[str, Any]]):
+        """追加标定记录到历史文件（先写临时文件再替换，写入过程中断不会损坏原文件）"""
         try:
             # 加载现有历史
             history = []
-            if os.path.exists(self.history_file):
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    history_data = yaml.safe_load(f)
-                    if history_data and 'calibration_records' in history_data:
-                        history = history_data['calibration_records']
+            try:
+                with open(self.history_file, 'rb') as f:
+                    history_data = yaml.load(f, Loader=_YamlLoader)
+                if history_data and 'calibration_records' in history_data:
+                    history = history_data['calibration_records']
+            except FileNotFoundError:
+                pass
             
-            # 添加当前记录
-            current_record = asdict(self.calibration_data)
-            history.append(current_record)
+            # 添加新记录
+            history.extend(records)
             
             # 保持最近20条记录
             if len(history) > 20:
@@ -426,63 +626,104 @@ class CalibrationManager:
             
             # 保存历史
             history_data = {'calibration_records': history}
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                yaml.dump(history_data, f, default_flow_style=False, allow_unicode=True)
+            tmp_file = self.history_file + ".tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                yaml.dump(history_data, f, Dumper=_YamlDumper, default_flow_style=False, allow_unicode=True)
+            os.replace(tmp_file, self.history_file)
             
-            logger.info("标定历史已更新")
+            logger.info(f"标定历史已更新: 新增{len(records)}条记录")
             
         except Exception as e:
             logger.error(f"保存标定历史失败: {e}")
     
-    def _update_main_config(self):
-        """更新主配置文件中的标定相关配置"""
+    def _update_main_config(self, calibration_dict: Dict[str, Any]):
+        """
+        更新主配置文件中的标定相关配置
+        
+        与上次写入主配置的内容相同时直接返回；否则只在加载到的配置确实
+        需要修改时才写盘。
+        """
         try:
+            joint_limits = self._joint_limits_tuple
+            hardware_limits = self._hardware_limits_tuple
+            pushed = (calibration_dict, joint_limits, hardware_limits)
+            if pushed == self._last_pushed_config:
+                return
+            
             config = self.config_manager.load_config()
+            changed = False
             
             # 更新标定部分
-            config['calibration'] = asdict(self.calibration_data)
+            if config.get('calibration') != calibration_dict:
+                config['calibration'] = calibration_dict
+                changed = True
             
             # 更新关节限位
             if 'joints' in config:
                 for i, joint_config in enumerate(config['joints']):
                     if i < 10:
-                        min_pos, max_pos = self.get_joint_limits(i)
-                        hardware_min, hardware_max = self.get_hardware_limits(i)
+                        min_pos, max_pos = joint_limits[i]
+                        hardware_min, hardware_max = hardware_limits[i]
                         
-                        joint_config['limits']['min_position'] = min_pos
-                        joint_config['limits']['max_position'] = max_pos
-                        joint_config['limits']['hardware_min'] = hardware_min
-                        joint_config['limits']['hardware_max'] = hardware_max
+                        limits = joint_config['limits']
+                        updated = {
+                            'min_position': min_pos,
+                            'max_position': max_pos,
+                            'hardware_min': hardware_min,
+                            'hardware_max': hardware_max
+                        }
+                        if any(limits.get(key) != value for key, value in updated.items()):
+                            limits.update(updated)
+                            changed = True
             
             # 保存配置
-            self.config_manager.save_config(config)
+            if changed and not self.config_manager.save_config(config):
+                return
             
-            logger.info("主配置文件已更新")
+            self._last_pushed_config = pushed
+            if changed:
+                logger.info("主配置文件已更新")
             
         except Exception as e:
             logger.error(f"更新主配置文件失败: {e}")
     
     def get_calibration_summary(self) -> Dict[str, Any]:
-        """获取标定摘要信息"""
-        return {
-            'is_calibrated': self.calibration_data.is_calibrated,
-            'calibrated_at': self.calibration_data.calibrated_at,
-            'calibration_method': self.calibration_data.calibration_method,
-            'operator': self.calibration_data.operator,
-            'notes': self.calibration_data.notes,
-            'zero_offsets': self.calibration_data.zero_offsets.copy(),
-            'max_positions': self.calibration_data.max_positions.copy(),
-            'joint_ranges': [self.get_joint_limits(i) for i in range(10)],
-            'hardware_ranges': [self.get_hardware_limits(i) for i in range(10)]
-        }
+        """
+        获取标定摘要信息
+        
+        偏移与限位均以不可变元组返回，无需防御性拷贝；标定数据未变更时复用
+        上次生成的摘要。
+        """
+        cached = self._summary_cache
+        if cached is not None and cached[0] == self._rev:
+            return dict(cached[1])
+        
+        with self._rw.gen_rlock():
+            rev = self._rev
+            summary = {
+                'is_calibrated': self.calibration_data.is_calibrated,
+                'calibrated_at': self.calibration_data.calibrated_at,
+                'calibration_method': self.calibration_data.calibration_method,
+                'operator': self.calibration_data.operator,
+                'notes': self.calibration_data.notes,
+                'zero_offsets': self._zero_tuple,
+                'max_positions': self._max_tuple,
+                'joint_ranges': self._joint_limits_tuple,
+                'hardware_ranges': self._hardware_limits_tuple
+            }
+        
+        self._summary_cache = (rev, summary)
+        return dict(summary)
     
     def reset_calibration(self):
         """重置标定数据"""
-        with self.calibration_lock:
-            self.calibration_data = CalibrationData(
-                calibrated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            )
-            logger.info("标定数据已重置")
+        calibration_data = CalibrationData(
+            calibrated_at=_fmt_now()
+        )
+        with self._rw.gen_wlock():
+            self.calibration_data = calibration_data
+            self._on_calibration_changed()
+        logger.info("标定数据已重置")
     
     def validate_calibration_data(self) -> Tuple[bool, List[str]]:
         """验证标定数据的合理性"""
@@ -495,25 +736,21 @@ class CalibrationManager:
         if len(self.calibration_data.max_positions) != 10:
             errors.append(f"最大位置数量错误: {len(self.calibration_data.max_positions)} != 10")
         
-        # 检查数值合理性
-        for i in range(min(10, len(self.calibration_data.zero_offsets))):
-            zero_offset = self.calibration_data.zero_offsets[i]
-            if zero_offset < 0 or zero_offset > 4095:
-                errors.append(f"关节{i}归零偏移超出范围: {zero_offset}")
+        # 检查数值合理性（整体比较，只为越界的关节生成错误信息）
+        zero_offsets = np.asarray(self.calibration_data.zero_offsets[:10], dtype=np.int64)
+        max_positions = np.asarray(self.calibration_data.max_positions[:10], dtype=np.int64)
         
-        for i in range(min(10, len(self.calibration_data.max_positions))):
-            max_pos = self.calibration_data.max_positions[i]
-            if max_pos <= 0 or max_pos > 4095:
-                errors.append(f"关节{i}最大位置超出范围: {max_pos}")
+        for i in np.flatnonzero((zero_offsets < 0) | (zero_offsets > 4095)):
+            errors.append(f"关节{i}归零偏移超出范围: {zero_offsets[i]}")
+        
+        for i in np.flatnonzero((max_positions <= 0) | (max_positions > 4095)):
+            errors.append(f"关节{i}最大位置超出范围: {max_positions[i]}")
         
         # 检查逻辑一致性
-        for i in range(min(10, len(self.calibration_data.zero_offsets), len(self.calibration_data.max_positions))):
-            zero_offset = self.calibration_data.zero_offsets[i]
-            max_pos = self.calibration_data.max_positions[i]
-            hardware_max = zero_offset + max_pos
-            
-            if hardware_max > 4095:
-                errors.append(f"关节{i}硬件最大位置超限: {hardware_max} > 4095")
+        n = min(len(zero_offsets), len(max_positions))
+        hardware_max = zero_offsets[:n] + max_positions[:n]
+        for i in np.flatnonzero(hardware_max > 4095):
+            errors.append(f"关节{i}硬件最大位置超限: {hardware_max[i]} > 4095")
         
         return len(errors) == 0, errors
 
@@ -12,8 +12,8 @@
 import numpy as np
 import threading
 import time
-from typing import List, Dict, Optional, Callable, Any
-from dataclasses import dataclass
+from typing import List, Dict, Optional, Callable, Any, Tuple
+from dataclasses import dataclass, replace
 from enum import Enum
 from queue import Queue, Empty
 from collections import deque
@@ -21,7 +21,8 @@ from collections import deque
 from utils.logger import get_logger, log_performance
 from utils.config_manager import get_config_manager
 from utils.message_bus import get_message_bus, Topics, MessagePriority
-from core.trajectory_planner import Trajectory, TrajectoryPoint, get_trajectory_planner
+from core.trajectory_planner import Trajectory, TrajectoryPoint, InterpolationType, get_trajectory_planner
+from core import _interp_kernels
 
 logger = get_logger(__name__)
 
@@ -48,6 +49,61 @@ class InterpolatorStatus:
     last_error: Optional[str] = None
 
 
+# 控制周期采样环形缓冲容量
+_SAMPLE_RING_SIZE = 1024
+
+# 插值用轨迹数组的数据类型：位置最终取整为舵机指令，float32 精度足够且内存访问量减半；
+# 时间戳与区间时长倒数保持 float64，避免长轨迹上的时间误差
+_SAMPLE_DTYPE = np.float32
+
+
+@dataclass(frozen=True, slots=True)
+class _TrajectorySnapshot:
+    """轨迹的列式存储（加载后不再修改，整体替换发布，读取无需加锁）"""
+    points: tuple               # 轨迹点（按下标访问用元组，deque 按下标访问需逐块查找）
+    ts: np.ndarray              # 时间戳 [N]
+    Pi: np.ndarray              # 位置取整 [N, J] int32（落在轨迹点上时直接作为位置指令）
+    sampler: Callable           # 插值内核（加载时按插值类型选定）
+    sampler_args: tuple         # 插值内核的轨迹数组参数（输出数组由调用方在末尾追加）
+
+
+def _build_snapshot(points, hermite: bool = False) -> _TrajectorySnapshot:
+    """
+    由轨迹点生成列式存储，并预先计算插值所需的各区间数据
+    
+    Args:
+        points: 轨迹点序列
+        hermite: 位置是否按三次Hermite插值（否则线性插值）
+    """
+    points = tuple(points)
+    ts = np.fromiter((p.timestamp for p in points), dtype=np.float64, count=len(points))
+    P = np.asarray([p.positions for p in points], dtype=np.float64)
+    V = np.asarray([p.velocities for p in points], dtype=np.float64)
+    A = np.asarray([p.accelerations for p in points], dtype=np.float64)
+    
+    dt = np.diff(ts)
+    inv_dt = np.divide(1.0, dt, out=np.zeros_like(dt), where=dt != 0)
+    
+    # 位置/速度/加速度合并为 [N, 3, J]，插值时一次遍历完成；
+    # 区间数据按 float64 计算后再转换，避免先转换再求差放大舍入误差
+    PVA = np.stack([P, V, A], axis=1) if len(points) else np.empty((0, 3, 0))
+    sampler_args = (ts, inv_dt, PVA.astype(_SAMPLE_DTYPE), np.diff(PVA, axis=0).astype(_SAMPLE_DTYPE))
+    
+    if hermite and len(points) >= 2:
+        C2, C3 = _interp_kernels.hermite_coefficients(P, V, inv_dt)
+        sampler = _interp_kernels.interp_hermite
+        sampler_args += (C2.astype(_SAMPLE_DTYPE), C3.astype(_SAMPLE_DTYPE))
+    else:
+        sampler = _interp_kernels.interp_linear
+    
+    return _TrajectorySnapshot(
+        points, ts, np.rint(P).astype(np.int32), sampler, sampler_args
+    )
+
+
+_EMPTY_SNAPSHOT = _build_snapshot(())
+
+
 class TrajectoryBuffer:
     """轨迹缓冲区"""
     
@@ -55,9 +111,19 @@ class TrajectoryBuffer:
         """初始化缓冲区"""
         self.max_size = max_size
         self.buffer = deque(maxlen=max_size)
-        self.lock = threading.RLock()
+        self.lock = threading.RLock()  # 只保护写操作与 current_index 的推进
         self.current_index = 0
         
+        # 当前轨迹的列式存储：加载时整体替换引用，只读查询取一次引用即可，无需加锁
+        self._snapshot = _EMPTY_SNAPSHOT
+        self._last_i = 0  # 上次查询所在区间，控制循环按时间递增查询时从这里向后推进
+        
+        # 预先调用一次各插值内核：安装numba时在此完成编译，避免首个控制周期卡顿
+        warmup_points = (TrajectoryPoint(0.0, [0.0]), TrajectoryPoint(1.0, [1.0]))
+        for hermite in (False, True):
+            snap = _build_snapshot(warmup_points, hermite)
+            snap.sampler(0.5, 0, *snap.sampler_args, np.empty((3, 1)))
+        
     def add_trajectory(self, trajectory: Trajectory) -> bool:
         """添加轨迹到缓冲区"""
         with self.lock:
@@ -65,11 +131,17 @@ class TrajectoryBuffer:
                 # 清空现有缓冲区
                 self.buffer.clear()
                 self.current_index = 0
+                self._last_i = 0
                 
                 # 添加轨迹点
                 for point in trajectory.points:
                     self.buffer.append(point)
                 
+                # 按缓冲区中实际保留的点生成列式存储，一次赋值发布；
+                # 非线性插值生成的轨迹按区间两端位置与速度做三次Hermite插值，保留原曲线形状
+                hermite = trajectory.interpolation_type != InterpolationType.LINEAR
+                self._snapshot = _build_snapshot(self.buffer, hermite)
+                
                 logger.info(f"轨迹已加载到缓冲区: {len(trajectory.points)}个点")
                 return True
                 
@@ -80,92 +152,161 @@ class TrajectoryBuffer:
     def get_next_point(self) -> Optional[TrajectoryPoint]:
         """获取下一个轨迹点"""
         with self.lock:
-            if self.current_index < len(self.buffer):
-                point = self.buffer[self.current_index]
+            points = self._snapshot.points
+            if self.current_index < len(points):
+                point = points[self.current_index]
                 self.current_index += 1
                 return point
             return None
     
     def get_current_point(self) -> Optional[TrajectoryPoint]:
         """获取当前轨迹点"""
-        with self.lock:
-            if self.current_index > 0 and self.current_index <= len(self.buffer):
-                return self.buffer[self.current_index - 1]
-            return None
+        points = self._snapshot.points
+        index = self.current_index
+        if 0 < index <= len(points):
+            return points[index - 1]
+        return None
     
     def peek_next_point(self) -> Optional[TrajectoryPoint]:
         """预览下一个轨迹点（不移动索引）"""
-        with self.lock:
-            if self.current_index < len(self.buffer):
-                return self.buffer[self.current_index]
+        points = self._snapshot.points
+        index = self.current_index
+        if index < len(points):
+            return points[index]
+        return None
+    
+    def _sample(self, t: float, out: Optional[np.ndarray] = None,
+                advance: bool = True) -> Optional[Tuple[_TrajectorySnapshot, int, bool, np.ndarray]]:
+        """
+        按时间采样当前轨迹
+        
+        Args:
+            t: 时间
+            out: 插值结果输出数组 [3, J] float64；为None时按取到的快照新分配（各调用方互不共享输出数组）
+            advance: 是否把本次所在区间记为下次查询的起点；只应由控制循环的顺序采样使用，
+                其他调用方只读取起点、不写回，避免互相干扰
+        
+        Returns:
+            (快照, 下标, 是否插值, 输出数组)，缓冲区为空时返回None；
+            插值时结果在输出数组中，否则结果为下标处的轨迹点
+        """
+        snap = self._snapshot
+        n = len(snap.points)
+        if not n:
             return None
+        
+        if out is None:
+            out = np.empty((3, snap.Pi.shape[1]))
+        
+        ts = snap.ts
+        
+        # 时间超出轨迹范围（或只有一个点）时取最后一个点
+        if n < 2 or t < ts[0] or t > ts[-1]:
+            return snap, n - 1, False, out
+        
+        # 查找时间区间 ts[i] <= t <= ts[i+1] 并插值：时间递增时从上次区间向后推进，回退时二分查找
+        # 区间时长为0时取区间起点
+        i, interpolated = snap.sampler(t, self._last_i, *snap.sampler_args, out)
+        if advance:
+            self._last_i = i
+        return snap, i, interpolated, out
     
     def get_point_at_time(self, t: float) -> Optional[TrajectoryPoint]:
-        """获取指定时间的轨迹点（插值）"""
-        with self.lock:
-            if not self.buffer:
-                return None
+        """获取指定时间的轨迹点（插值，可在任意线程调用，不影响控制循环的区间推进）"""
+        sample = self._sample(t, advance=False)
+        if sample is None:
+            return None
+        
+        snap, i, interpolated, out = sample
+        if not interpolated:
+            return snap.points[i]
+        
+        positions, velocities, accelerations = out.tolist()
+        return TrajectoryPoint(t, positions, velocities, accelerations)
+    
+    def sample_state(self, t: float, out: np.ndarray) -> bool:
+        """
+        将指定时间的位置、速度、加速度写入调用方提供的数组（不构造轨迹点对象）
+        
+        Args:
+            t: 时间
+            out: 输出数组 [3, J] float64（C连续），各行依次为位置、速度、加速度；插值内核直接写入，无需中间拷贝
             
-            # 查找时间区间
-            for i in range(len(self.buffer) - 1):
-                p1, p2 = self.buffer[i], self.buffer[i + 1]
-                if p1.timestamp <= t <= p2.timestamp:
-                    # 线性插值
-                    if p2.timestamp == p1.timestamp:
-                        return p1
-                    
-                    alpha = (t - p1.timestamp) / (p2.timestamp - p1.timestamp)
-                    
-                    positions = []
-                    velocities = []
-                    accelerations = []
-                    
-                    for j in range(len(p1.positions)):
-                        pos = p1.positions[j] + alpha * (p2.positions[j] - p1.positions[j])
-                        vel = p1.velocities[j] + alpha * (p2.velocities[j] - p1.velocities[j])
-                        acc = p1.accelerations[j] + alpha * (p2.accelerations[j] - p1.accelerations[j])
-                        
-                        positions.append(pos)
-                        velocities.append(vel)
-                        accelerations.append(acc)
-                    
-                    return TrajectoryPoint(t, positions, velocities, accelerations)
+        Returns:
+            是否成功（缓冲区为空时返回False）
+        """
+        sample = self._sample(t, out)
+        if sample is None:
+            return False
+        
+        snap, i, interpolated, _ = sample
+        if not interpolated:
+            point = snap.points[i]
+            out[0] = point.positions
+            out[1] = point.velocities
+            out[2] = point.accelerations
+        return True
+    
+    def sample_positions(self, t: float, out: np.ndarray) -> bool:
+        """
+        将指定时间的插值位置写入调用方提供的数组（不构造轨迹点对象）
+        
+        Args:
+            t: 时间
+            out: 输出数组 [J]，整数数组时写入取整后的位置指令
             
-            # 返回最后一个点
-            return self.buffer[-1] if self.buffer else None
+        Returns:
+            是否成功（缓冲区为空时返回False）
+        """
+        sample = self._sample(t)
+        if sample is None:
+            return False
+        
+        snap, i, interpolated, pva = sample
+        integer = out.dtype.kind in 'iu'
+        if interpolated:
+            if integer:
+                np.rint(pva[0], out=out, casting='unsafe')
+            else:
+                np.copyto(out, pva[0])
+        elif integer:
+            np.copyto(out, snap.Pi[i])
+        else:
+            np.copyto(out, snap.points[i].positions)
+        return True
     
     def is_empty(self) -> bool:
         """检查缓冲区是否为空"""
-        with self.lock:
-            return len(self.buffer) == 0
+        return len(self.buffer) == 0
     
     def is_finished(self) -> bool:
         """检查是否已完成"""
-        with self.lock:
-            return self.current_index >= len(self.buffer)
+        return self.current_index >= len(self.buffer)
     
     def get_progress(self) -> float:
         """获取执行进度"""
-        with self.lock:
-            if not self.buffer:
-                return 0.0
-            return min(1.0, self.current_index / len(self.buffer))
+        count = len(self.buffer)
+        if not count:
+            return 0.0
+        return min(1.0, self.current_index / count)
     
     def reset(self):
         """重置缓冲区"""
         with self.lock:
             self.current_index = 0
+            self._last_i = 0
     
     def clear(self):
         """清空缓冲区"""
         with self.lock:
             self.buffer.clear()
             self.current_index = 0
+            self._last_i = 0
+            self._snapshot = _EMPTY_SNAPSHOT
     
     def size(self) -> int:
         """获取缓冲区大小"""
-        with self.lock:
-            return len(self.buffer)
+        return len(self.buffer)
 
 
 class Interpolator:
@@ -180,10 +321,15 @@ class Interpolator:
         # 控制参数 - 设置为10Hz (100ms周期)
         self.control_frequency = self.config.get('control', {}).get('frequency', 10)  # 10Hz
         self.control_period = 1.0 / self.control_frequency
+        # 周期末尾忙等的时长（秒）：先睡眠到截止时间前该时长，再忙等到截止时间，消除睡眠精度带来的抖动
+        self.spin_threshold = self.config.get('control', {}).get('spin_threshold', 0.0005)
+        # 实时轨迹点每隔多少个控制周期发布一次（降低消息总线负载）
+        self.publish_decimation = max(1, int(self.config.get('control', {}).get('publish_decimation', 5)))
+        self._publish_tick = 0
         
         logger.info(f"插值器初始化: 频率={self.control_frequency}Hz, 周期={self.control_period*1000:.1f}ms")
         
-        # 状态管理
+        # 状态管理：state 为单个引用，读取无需加锁；state_lock 只用于串行化状态转换（检查并修改）
         self.state = InterpolatorState.IDLE
         self.state_lock = threading.RLock()
         
@@ -194,18 +340,34 @@ class Interpolator:
         # 控制线程
         self.control_thread = None
         self.stop_event = threading.Event()
+        # 允许运行事件：暂停时清除，控制线程阻塞等待而不是空转；恢复、停止时置位唤醒
+        self._resume_event = threading.Event()
+        self._resume_event.set()
         
-        # 状态信息
+        # 状态信息：status 为状态转换时修改的工作副本，_status_snapshot 为对外发布的快照
+        # （每个控制周期及每次状态转换后整体替换，发布后不再修改，读取无需加锁）
         self.status = InterpolatorStatus(InterpolatorState.IDLE)
+        self._status_snapshot = replace(self.status)
         self.start_time = 0.0
         self.current_time = 0.0
+        self._pos_out = np.empty(0, dtype=np.int32)  # 位置指令输出数组（开始轨迹时按关节数分配）
+        
+        # 最近采样环形缓冲（单写多读）：控制线程每周期写入一条 (时间, [位置; 速度; 加速度])，
+        # 需要逐点数据的使用方通过 get_recent_samples 读取，无需经过消息总线；
+        # _sample_head 为累计写入条数，环形数组在开始轨迹时按关节数分配
+        self._sample_ring = (np.zeros(_SAMPLE_RING_SIZE), np.zeros((_SAMPLE_RING_SIZE, 3, 0)))
+        self._sample_head = 0
         
         # 回调函数
         self.position_callback: Optional[Callable[[List[float]], None]] = None
         self.status_callback: Optional[Callable[[InterpolatorStatus], None]] = None
         
         # 性能统计
-        self.loop_times = deque(maxlen=100)
+        # 最近100个循环耗时的环形缓冲，累计和随写入增量维护，求均值为 O(1)
+        self._loop_time_ring = np.zeros(100)
+        self._loop_time_sum = 0.0
+        self._loop_time_idx = 0
+        self._loop_time_count = 0
         self.last_loop_time = 0.0
         
         logger.info(f"插值引擎初始化完成: 控制频率={self.control_frequency}Hz")
@@ -232,8 +394,14 @@ class Interpolator:
                     return False
                 
                 # 重置状态
-                self.start_time = time.time()
+                self.start_time = time.monotonic()
                 self.current_time = 0.0
+                self._publish_tick = 0
+                joint_count = len(trajectory.points[0].positions) if trajectory.points else 0
+                if len(self._pos_out) != joint_count:
+                    self._pos_out = np.empty(joint_count, dtype=np.int32)
+                    self._sample_ring = (np.zeros(_SAMPLE_RING_SIZE), np.zeros((_SAMPLE_RING_SIZE, 3, joint_count)))
+                self._sample_head = 0
                 self.status.current_trajectory = trajectory.metadata.get('name', 'unnamed') if trajectory.metadata else 'unnamed'
                 self.status.total_time = trajectory.duration
                 self.status.progress = 0.0
@@ -241,11 +409,13 @@ class Interpolator:
                 
                 # 启动控制线程
                 self.stop_event.clear()
+                self._resume_event.set()
                 self.control_thread = threading.Thread(target=self._control_loop, daemon=True)
                 self.control_thread.start()
                 
                 self.state = InterpolatorState.RUNNING
                 self.status.state = self.state
+                self._publish_status()
                 
                 logger.info(f"开始执行轨迹: {self.status.current_trajectory}, 时长={trajectory.duration:.3f}s")
                 
@@ -267,6 +437,7 @@ class Interpolator:
                 self.state = InterpolatorState.ERROR
                 self.status.state = self.state
                 self.status.last_error = str(e)
+                self._publish_status()
                 return False
     
     def pause(self):
@@ -275,6 +446,8 @@ class Interpolator:
             if self.state == InterpolatorState.RUNNING:
                 self.state = InterpolatorState.PAUSED
                 self.status.state = self.state
+                self._resume_event.clear()
+                self._publish_status()
                 logger.info("轨迹执行已暂停")
     
     def resume(self):
@@ -283,6 +456,8 @@ class Interpolator:
             if self.state == InterpolatorState.PAUSED:
                 self.state = InterpolatorState.RUNNING
                 self.status.state = self.state
+                self._resume_event.set()
+                self._publish_status()
                 logger.info("轨迹执行已恢复")
     
     def stop(self):
@@ -292,8 +467,9 @@ class Interpolator:
                 self.state = InterpolatorState.STOPPING
                 self.status.state = self.state
                 
-                # 停止控制线程
+                # 停止控制线程（同时唤醒睡眠或暂停中的控制线程）
                 self.stop_event.set()
+                self._resume_event.set()
                 if self.control_thread and self.control_thread.is_alive():
                     self.control_thread.join(timeout=1.0)
                 
@@ -301,6 +477,7 @@ class Interpolator:
                 self.status.state = self.state
                 self.status.current_trajectory = None
                 self.status.progress = 0.0
+                self._publish_status()
                 
                 logger.info("轨迹执行已停止")
                 
@@ -316,8 +493,10 @@ class Interpolator:
         with self.state_lock:
             logger.warning("紧急停止触发")
             self.stop_event.set()
+            self._resume_event.set()
             self.state = InterpolatorState.IDLE
             self.status.state = self.state
+            self._publish_status()
             
             # 发布紧急停止事件
             self.message_bus.publish(
@@ -327,72 +506,111 @@ class Interpolator:
             )
     
     def get_status(self) -> InterpolatorStatus:
-        """获取当前状态"""
-        with self.state_lock:
-            # 更新状态信息
-            self.status.current_time = self.current_time
-            self.status.progress = self.trajectory_buffer.get_progress()
-            self.status.buffer_size = self.trajectory_buffer.size()
-            
-            # 计算实际控制频率
-            if len(self.loop_times) > 1:
-                avg_period = sum(self.loop_times) / len(self.loop_times)
-                self.status.control_frequency = 1.0 / avg_period if avg_period > 0 else 0.0
-            
-            return self.status
+        """获取当前状态（最近发布的快照，调用方不应修改）"""
+        return self._status_snapshot
+    
+    def _publish_status(self) -> InterpolatorStatus:
+        """根据工作副本生成新的状态快照并发布"""
+        # 计算实际控制频率
+        count = self._loop_time_count
+        if count > 1:
+            avg_period = self._loop_time_sum / count
+            self.status.control_frequency = 1.0 / avg_period if avg_period > 0 else 0.0
+        
+        status = replace(
+            self.status,
+            current_time=self.current_time,
+            progress=self.trajectory_buffer.get_progress(),
+            buffer_size=self.trajectory_buffer.size()
+        )
+        self._status_snapshot = status
+        return status
     
     def _control_loop(self):
         """控制循环 - 200Hz"""
         logger.info("控制循环启动")
         
-        next_time = time.time()
+        # 循环保持在本进程的线程中运行而不放到子进程：每个周期都要调用 position_callback（驱动串口）
+        # 并向消息总线发布，二者都在主解释器内；放到子进程后仍需主进程线程经队列转发，同样受GIL调度影响
+        # 使用单调时钟按固定相位调度（不受系统时间调整影响，睡眠误差不会累积）
+        deadline = time.monotonic()
+        running = InterpolatorState.RUNNING
         
         try:
             while not self.stop_event.is_set():
-                loop_start = time.time()
+                # 暂停期间阻塞等待恢复或停止，恢复后从当前时刻重新开始调度
+                if not self._resume_event.is_set():
+                    self._resume_event.wait()
+                    deadline = time.monotonic()
+                    continue
                 
-                # 等待到下一个控制周期
-                current_time = time.time()
-                if current_time < next_time:
-                    time.sleep(next_time - current_time)
+                loop_start = time.monotonic()
+                
+                # 等待到下一个控制周期（在停止事件上等待到接近截止时间，剩余部分忙等），停止时立即退出
+                remaining = deadline - loop_start
+                if remaining > 0:
+                    if remaining > self.spin_threshold and self.stop_event.wait(remaining - self.spin_threshold):
+                        break
+                    while time.monotonic() < deadline:
+                        pass
                 
                 # 执行控制步骤
-                if self.state == InterpolatorState.RUNNING:
+                if self.state is running:
                     self._control_step()
                 
                 # 更新时间
-                next_time += self.control_period
+                deadline += self.control_period
+                
+                # 已错过下一周期时跳过错过的周期，而不是连续补跑
+                loop_end = time.monotonic()
+                skipped = 0
+                if loop_end > deadline:
+                    skipped = int((loop_end - deadline) // self.control_period) + 1
+                    deadline += skipped * self.control_period
                 
                 # 记录循环时间
-                loop_end = time.time()
                 loop_duration = loop_end - loop_start
-                self.loop_times.append(loop_duration)
+                self._record_loop_time(loop_duration)
                 
                 # 检查循环时间
                 if loop_duration > self.control_period * 1.5:
-                    logger.warning(f"控制循环超时: {loop_duration*1000:.1f}ms > {self.control_period*1000:.1f}ms")
+                    skipped_info = f", 跳过{skipped}个周期" if skipped else ""
+                    logger.warning(f"控制循环超时: {loop_duration*1000:.1f}ms > {self.control_period*1000:.1f}ms{skipped_info}")
                 
         except Exception as e:
             logger.error(f"控制循环异常: {e}")
             self.state = InterpolatorState.ERROR
             self.status.last_error = str(e)
+            self._publish_status()
         
         logger.info("控制循环结束")
     
+    def _record_loop_time(self, loop_duration: float):
+        """记录一次循环耗时（覆盖环形缓冲中最旧的一条）"""
+        ring = self._loop_time_ring
+        idx = self._loop_time_idx
+        self._loop_time_sum += loop_duration - ring[idx]
+        ring[idx] = loop_duration
+        self._loop_time_idx = (idx + 1) % len(ring)
+        if self._loop_time_count < len(ring):
+            self._loop_time_count += 1
+    
     def _control_step(self):
         """单步控制"""
         try:
             # 更新当前时间
-            self.current_time = time.time() - self.start_time
-            
-            # 获取当前轨迹点
-            current_point = self.trajectory_buffer.get_point_at_time(self.current_time)
+            self.current_time = time.monotonic() - self.start_time
             
-            if current_point is None:
+            # 采样当前位置、速度、加速度（直接写入采样环形缓冲的下一条）
+            ring_t, ring_pva = self._sample_ring
+            head = self._sample_head
+            slot = head % _SAMPLE_RING_SIZE
+            if not self.trajectory_buffer.sample_state(self.current_time, ring_pva[slot]):
                 # 轨迹结束
                 logger.info("轨迹执行完成")
                 self.state = InterpolatorState.IDLE
                 self.status.state = self.state
+                self._publish_status()
                 
                 # 发布完成事件
                 self.message_bus.publish(
@@ -406,45 +624,77 @@ class Interpolator:
                 
                 return
             
-            # 输出位置指令
+            ring_t[slot] = self.current_time
+            self._sample_head = head + 1
+            
+            # 输出位置指令（取整后的整数位置）
             if self.position_callback:
-                # 转换为整数位置
-                positions = [int(round(pos)) for pos in current_point.positions]
-                self.position_callback(positions)
+                np.rint(ring_pva[slot, 0], out=self._pos_out, casting='unsafe')
+                self.position_callback(self._pos_out.tolist())
             
-            # 发布实时状态
-            self.message_bus.publish(
-                Topics.TRAJECTORY_POINT,
-                {
-                    'timestamp': current_point.timestamp,
-                    'positions': current_point.positions,
-                    'velocities': current_point.velocities,
-                    'accelerations': current_point.accelerations
-                },
-                MessagePriority.LOW
-            )
+            # 发布实时状态（按抽取间隔，直接取本周期已写入环形缓冲的采样，不再重复插值）
+            if self._publish_tick % self.publish_decimation == 0:
+                positions, velocities, accelerations = ring_pva[slot].tolist()
+                self.message_bus.publish(
+                    Topics.TRAJECTORY_POINT,
+                    {
+                        'timestamp': float(ring_t[slot]),
+                        'positions': positions,
+                        'velocities': velocities,
+                        'accelerations': accelerations
+                    },
+                    MessagePriority.LOW
+                )
+            self._publish_tick += 1
             
-            # 更新状态回调
+            # 发布状态快照并回调
+            status = self._publish_status()
             if self.status_callback:
-                self.status_callback(self.get_status())
+                self.status_callback(status)
                 
         except Exception as e:
             logger.error(f"控制步骤异常: {e}")
             self.state = InterpolatorState.ERROR
             self.status.last_error = str(e)
+            self._publish_status()
+    
+    def get_recent_samples(self, count: int = _SAMPLE_RING_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        获取最近的控制周期采样（按时间顺序）
+        
+        Args:
+            count: 最多返回的条数（不超过环形缓冲容量）
+            
+        Returns:
+            (timestamps, states)，形状分别为 [n] 和 [n, 3, J]，states 各行依次为位置、速度、加速度
+        """
+        ring_t, ring_pva = self._sample_ring
+        head = self._sample_head
+        n = max(0, min(count, head, _SAMPLE_RING_SIZE))
+        indices = np.arange(head - n, head) % _SAMPLE_RING_SIZE
+        timestamps = ring_t[indices]
+        states = ring_pva[indices]
+        
+        # 复制期间被控制线程覆盖的最旧条目不可信，丢弃
+        overwritten = self._sample_head - _SAMPLE_RING_SIZE - (head - n)
+        if overwritten > 0:
+            timestamps = timestamps[overwritten:]
+            states = states[overwritten:]
+        return timestamps, states
     
     def is_running(self) -> bool:
         """检查是否正在运行"""
-        return self.state == InterpolatorState.RUNNING
+        return self.state is InterpolatorState.RUNNING
     
     def is_idle(self) -> bool:
         """检查是否空闲"""
-        return self.state == InterpolatorState.IDLE
+        return self.state is InterpolatorState.IDLE
     
     def get_control_frequency(self) -> float:
         """获取实际控制频率"""
-        if len(self.loop_times) > 1:
-            avg_period = sum(self.loop_times) / len(self.loop_times)
+        count = self._loop_time_count
+        if count > 1:
+            avg_period = self._loop_time_sum / count
             return 1.0 / avg_period if avg_period > 0 else 0.0
         return 0.0
 
@@ -9,17 +9,78 @@
 - 奇异点检测
 """
 
+import math
 import numpy as np
 from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass
 import time
+from scipy.optimize import least_squares
 
 from core.lazy_kinematics import get_roboticstoolbox, get_spatialmath, is_kinematics_loaded
+from core import _kinematics_kernels
 from utils.logger import get_logger, log_performance
 from utils.config_manager import get_config_manager
 
 logger = get_logger(__name__)
 
+# RPY奇异（俯仰角为±90°）判定阈值，与 spatialmath.tr2rpy 默认值一致
+_RPY_SINGULAR_TOL = 20 * np.finfo(np.float64).eps
+
+# least_squares 逆运动学的 ftol/xtol/gtol 停止判据（相对变化量）
+_LSQ_STOP_TOL = 1e-12
+
+
+def _rpy_to_R(roll: float, pitch: float, yaw: float) -> np.ndarray:
+    """RPY角（zyx顺序，R = Rz(yaw)·Ry(pitch)·Rx(roll)）转换为旋转矩阵 (3, 3)"""
+    cr, sr = math.cos(roll), math.sin(roll)
+    cp, sp = math.cos(pitch), math.sin(pitch)
+    cy, sy = math.cos(yaw), math.sin(yaw)
+    return np.array([
+        [cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr],
+        [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr],
+        [-sp, cp * sr, cp * cr]
+    ])
+
+
+def _se3_from_trans_rpy(x: float, y: float, z: float,
+                        roll: float, pitch: float, yaw: float) -> np.ndarray:
+    """位置与RPY角转换为齐次变换矩阵 (4, 4)，与 SE3.Trans(x, y, z) * SE3.RPY([roll, pitch, yaw]) 一致"""
+    T = np.eye(4)
+    T[:3, :3] = _rpy_to_R(roll, pitch, yaw)
+    T[0, 3] = x
+    T[1, 3] = y
+    T[2, 3] = z
+    return T
+
+
+def _R_to_rpy(R) -> Tuple[float, float, float]:
+    """旋转矩阵（嵌套列表，按 R[i][j] 访问）转换为RPY角（zyx顺序），与 spatialmath.tr2rpy 结果一致"""
+    if abs(abs(R[2][0]) - 1) < _RPY_SINGULAR_TOL:
+        # 奇异：横滚角取0，偏航角吸收横滚分量
+        roll = 0.0
+        if R[2][0] < 0:
+            yaw = -math.atan2(R[0][1], R[0][2])
+        else:
+            yaw = math.atan2(-R[0][1], -R[0][2])
+        pitch = -math.asin(min(max(R[2][0], -1.0), 1.0))
+        return roll, pitch, yaw
+    
+    roll = math.atan2(R[2][1], R[2][2])
+    yaw = math.atan2(R[1][0], R[0][0])
+    
+    # 俯仰角按数值最稳定（分母绝对值最大）的一项计算
+    candidates = (abs(R[0][0]), abs(R[1][0]), abs(R[2][1]), abs(R[2][2]))
+    k = candidates.index(max(candidates))
+    if k == 0:
+        pitch = -math.atan(R[2][0] * math.cos(yaw) / R[0][0])
+    elif k == 1:
+        pitch = -math.atan(R[2][0] * math.sin(yaw) / R[1][0])
+    elif k == 2:
+        pitch = -math.atan(R[2][0] * math.sin(roll) / R[2][1])
+    else:
+        pitch = -math.atan(R[2][0] * math.cos(roll) / R[2][2])
+    return roll, pitch, yaw
+
 
 @dataclass
 class Pose6D:
@@ -31,31 +92,33 @@ class Pose6D:
     pitch: float = 0.0
     yaw: float = 0.0
     
+    def to_matrix(self) -> np.ndarray:
+        """转换为齐次变换矩阵 (4, 4)（直接计算，不构造SE3对象）"""
+        return _se3_from_trans_rpy(self.x, self.y, self.z, self.roll, self.pitch, self.yaw)
+    
     def to_se3(self) -> 'SE3':
         """转换为SE3变换矩阵"""
         if not is_kinematics_loaded():
             raise RuntimeError("Kinematics libraries not loaded")
         SE3 = get_spatialmath().SE3
-        return SE3.Trans(self.x, self.y, self.z) * SE3.RPY([self.roll, self.pitch, self.yaw])
+        return SE3(self.to_matrix(), check=False)
     
     @classmethod
-    def from_se3(cls, T: 'SE3') -> 'Pose6D':
-        """从SE3变换矩阵创建"""
-        if not is_kinematics_loaded():
-            raise RuntimeError("Kinematics libraries not loaded")
+    def from_se3(cls, T) -> 'Pose6D':
+        """从SE3对象或齐次变换矩阵 (4, 4) 创建"""
+        A = T.A if hasattr(T, 'A') else np.asarray(T)
         
-        # 提取位置
-        pos = T.t
-        # 提取欧拉角
-        rpy = T.rpy()
+        # 转为Python列表后逐元素取值，避免逐个访问ndarray元素的开销
+        M = A.tolist()
+        roll, pitch, yaw = _R_to_rpy(M)
         
         return cls(
-            x=float(pos[0]),
-            y=float(pos[1]), 
-            z=float(pos[2]),
-            roll=float(rpy[0]),
-            pitch=float(rpy[1]),
-            yaw=float(rpy[2])
+            x=M[0][3],
+            y=M[1][3],
+            z=M[2][3],
+            roll=roll,
+            pitch=pitch,
+            yaw=yaw
         )
 
 
@@ -84,11 +147,17 @@ class EvoBot10DOF:
         # 构建DH参数
         self.dh_params = self._extract_dh_parameters()
         
+        # 关节限位（只转换一次；另存为数组，供向量化采样与限位检查）
+        self.joint_limits = self._extract_joint_limits()
+        limits = np.asarray(self.joint_limits, dtype=np.float64)
+        self.q_lo = limits[:, 0].copy()
+        self.q_hi = limits[:, 1].copy()
+        
         # 创建机器人模型
         self.robot = self._create_robot_model()
         
-        # 关节限位
-        self.joint_limits = self._extract_joint_limits()
+        # 运动学内核所需的连杆常量（模型创建后不再变化，只计算一次）
+        self._build_chain_constants()
         
         logger.info(f"EvoBot 10DOF模型创建完成: {len(self.dh_params)}个关节")
     
@@ -137,7 +206,7 @@ class EvoBot10DOF:
                 a=dh['a'], 
                 alpha=dh['alpha'],
                 offset=dh['theta'],
-                qlim=self._get_joint_limit(i)
+                qlim=self.joint_limits[i]
             )
             links.append(link)
         
@@ -150,27 +219,167 @@ class EvoBot10DOF:
         
         return robot
     
-    def _get_joint_limit(self, joint_id: int) -> Tuple[float, float]:
-        """获取关节限位"""
-        if joint_id < len(self.joints_config):
-            limits = self.joints_config[joint_id].get('limits', {})
-            min_pos = limits.get('min_position', 0)
-            max_pos = limits.get('max_position', 3000)
+    def _extract_joint_limits(self) -> List[Tuple[float, float]]:
+        """提取所有关节限位（弧度）"""
+        # 未配置的关节使用默认限位
+        min_rad = np.full(10, -np.pi)
+        max_rad = np.full(10, np.pi)
+        
+        configured = self.joints_config[:10]
+        if configured:
+            min_pos = np.array([jc.get('limits', {}).get('min_position', 0) for jc in configured], dtype=np.float64)
+            max_pos = np.array([jc.get('limits', {}).get('max_position', 3000) for jc in configured], dtype=np.float64)
             
-            # 转换为弧度（假设配置中是度或编码器值）
-            min_rad = np.deg2rad(min_pos * 360 / 3000)  # 假设3000对应360度
-            max_rad = np.deg2rad(max_pos * 360 / 3000)
+            # 转换为弧度（假设配置中是度或编码器值，3000对应360度），所有关节一次完成
+            min_rad[:len(configured)] = np.deg2rad(min_pos * 360 / 3000)
+            max_rad[:len(configured)] = np.deg2rad(max_pos * 360 / 3000)
+        
+        return list(zip(min_rad.tolist(), max_rad.tolist()))
+    
+    def fkine(self, q: np.ndarray) -> np.ndarray:
+        """
+        正运动学（与 robot.fkine 结果一致，含基座与工具变换）
+        
+        Args:
+            q: 关节角度 (10,)，弧度
             
-            return (min_rad, max_rad)
+        Returns:
+            末端变换矩阵 (4, 4)
+        """
+        q = np.ascontiguousarray(q, dtype=np.float64)
+        if q.shape != (10,):
+            raise ValueError(f"关节角度数量错误: {q.size} != 10")
         
-        return (-np.pi, np.pi)  # 默认限位
+        return _kinematics_kernels.fkine(q, *self._chain, np.empty((4, 4)))
     
-    def _extract_joint_limits(self) -> List[Tuple[float, float]]:
-        """提取所有关节限位"""
-        limits = []
-        for i in range(10):
-            limits.append(self._get_joint_limit(i))
-        return limits
+    def fkine_batch(self, qs: np.ndarray) -> np.ndarray:
+        """
+        批量正运动学（与 robot.fkine 结果一致，含基座与工具变换）
+        
+        Args:
+            qs: 关节角度矩阵 (B, 10)，弧度
+            
+        Returns:
+            末端变换矩阵 (B, 4, 4)
+        """
+        qs = np.ascontiguousarray(qs, dtype=np.float64)
+        out = np.empty((qs.shape[0], 4, 4))
+        return _kinematics_kernels.fkine_batch(qs, *self._chain, out)
+    
+    def fk_and_jacobian(self, q: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        正运动学与基坐标系几何雅可比（一次遍历连杆链同时得到）
+        
+        Args:
+            q: 关节角度 (10,)，弧度
+            
+        Returns:
+            (末端变换矩阵 (4, 4), 雅可比矩阵 (6, 10))，与 robot.fkine / robot.jacob0 结果一致
+        """
+        q = np.ascontiguousarray(q, dtype=np.float64)
+        if q.shape != (10,):
+            raise ValueError(f"关节角度数量错误: {q.size} != 10")
+        
+        T = np.empty((4, 4))
+        J = np.empty((6, 10))
+        _kinematics_kernels.fk_jacobian(q, *self._chain, T, J)
+        return T, J
+    
+    def ikine_lm(self, T_target: np.ndarray, q0: np.ndarray, damping: float,
+                 lambda_min: float, lambda_max: float, a1: float, a2: float,
+                 max_iterations: int, tol: float) -> Tuple[np.ndarray, bool, int]:
+        """
+        阻尼最小二乘（Levenberg-Marquardt）逆运动学，使用解析几何雅可比与自适应阻尼，
+        迭代中关节角限制在关节限位内
+        
+        Args:
+            T_target: 目标末端变换矩阵 (4, 4)
+            q0: 初始关节角度 (10,)（在限位外时先限制到限位内）
+            damping: 初始阻尼系数 λ
+            lambda_min: 阻尼下限
+            lambda_max: 阻尼上限
+            a1: 误差增大（拒绝该步）时的阻尼放大倍数，>= 1
+            a2: 误差减小（接受该步）时的阻尼缩小倍数，>= 1
+            max_iterations: 最大迭代次数
+            tol: 收敛阈值（位姿误差 0.5·|e|² 小于该值视为收敛）
+            
+        Returns:
+            (关节角度, 是否收敛, 迭代次数)
+        """
+        q = np.empty(10)
+        iterations, success, _ = _kinematics_kernels.ik_lm(
+            np.ascontiguousarray(T_target, dtype=np.float64),
+            np.clip(np.asarray(q0, dtype=np.float64), self.q_lo, self.q_hi),
+            *self._chain, self.q_lo, self.q_hi, float(damping), float(lambda_min), float(lambda_max), float(a1), float(a2),
+            int(max_iterations), float(tol), q
+        )
+        return q, bool(success), int(iterations)
+    
+    def ikine_least_squares(self, T_target: np.ndarray, q0: np.ndarray,
+                            max_iterations: int, tol: float) -> Tuple[np.ndarray, bool, int]:
+        """
+        基于 scipy.optimize.least_squares（dogbox，矩形边界下的狗腿信赖域）的有界逆运动学
+        
+        残差为位姿误差 e(q)，其雅可比取 -J(q)（解析几何雅可比）；关节限位作为边界约束，
+        解必然在限位内。同一关节角度的正运动学与雅可比只计算一次。
+        scipy 的 ftol/xtol/gtol 是相对变化量判据，不能直接用位姿误差阈值代替，否则误差
+        下降变慢时会提前停止；这里取很小的固定值，收敛与否按位姿误差判断。
+        
+        Args:
+            T_target: 目标末端变换矩阵 (4, 4)
+            q0: 初始关节角度 (10,)（在限位外时先限制到限位内）
+            max_iterations: 最大迭代次数（残差函数求值次数上限）
+            tol: 收敛阈值（位姿误差 0.5·|e|² 小于该值视为收敛）
+            
+        Returns:
+            (关节角度, 是否收敛, 迭代次数)
+        """
+        T_target = np.ascontiguousarray(T_target, dtype=np.float64)
+        T = np.empty((4, 4))
+        J = np.empty((6, 10))
+        e = np.empty(6)
+        evaluated_q = np.full(10, np.nan)
+        
+        def evaluate(q):
+            if not np.array_equal(q, evaluated_q):
+                _kinematics_kernels.fk_jacobian(np.ascontiguousarray(q), *self._chain, T, J)
+                _kinematics_kernels.pose_error(T, T_target, e)
+                evaluated_q[:] = q
+        
+        def residual(q):
+            evaluate(q)
+            return e.copy()
+        
+        def jacobian(q):
+            evaluate(q)
+            return -J
+        
+        # least_squares 要求初值位于边界内
+        x0 = np.clip(np.asarray(q0, dtype=np.float64), self.q_lo, self.q_hi)
+        result = least_squares(
+            residual, x0, jac=jacobian, method='dogbox', bounds=(self.q_lo, self.q_hi),
+            ftol=_LSQ_STOP_TOL, xtol=_LSQ_STOP_TOL, gtol=_LSQ_STOP_TOL, max_nfev=max_iterations
+        )
+        success = 0.5 * float(result.fun @ result.fun) < tol
+        return result.x, success, int(result.nfev)
+    
+    def _build_chain_constants(self):
+        """由DH参数与基座/工具变换生成运动学内核的常量参数"""
+        # DH参数按参数类型分行存放（SoA）：各行依次为 d、a、alpha、theta，每行在内存中连续
+        self.dh_array = np.array(
+            [[dh['d'], dh['a'], dh['alpha'], dh['theta']] for dh in self.dh_params],
+            dtype=np.float64
+        ).T.copy()
+        self.cos_alpha = np.cos(self.dh_array[2])
+        self.sin_alpha = np.sin(self.dh_array[2])
+        
+        # 内核参数：(关节偏移, a, d, cos(alpha), sin(alpha), 基座变换, 工具变换)
+        self._chain = (
+            self.dh_array[3], self.dh_array[1], self.dh_array[0],
+            self.cos_alpha, self.sin_alpha,
+            np.ascontiguousarray(self.robot.base.A, dtype=np.float64),
+            np.ascontiguousarray(self.robot.tool.A, dtype=np.float64)
+        )
 
 
 class KinematicsSolver:
@@ -183,6 +392,7 @@ class KinematicsSolver:
         self._initialized = False
         self.config_manager = get_config_manager()
         self.config = self.config_manager.load_config()
+        self._joint_reach: Optional[np.ndarray] = None
         
         logger.info("运动学求解器创建完成（延迟加载模式）")
     
@@ -205,6 +415,17 @@ class KinematicsSolver:
         try:
             self.robot_model = EvoBot10DOF(self.config)
             self.robot = self.robot_model.robot
+            
+            # 模型信息创建后不再变化，只生成一次
+            self._robot_info = {
+                'name': self.robot.name,
+                'num_joints': self.robot.n,
+                'joint_limits': self.robot_model.joint_limits,
+                'dh_parameters': self.robot_model.dh_params,
+                'base_transform': self.robot.base.A.tolist() if hasattr(self.robot, 'base') else None,
+                'tool_transform': self.robot.tool.A.tolist() if hasattr(self.robot, 'tool') else None
+            }
+            
             self.enabled = True
             self._initialized = True
             logger.info("运动学求解器初始化完成")
@@ -217,10 +438,19 @@ class KinematicsSolver:
             'method': 'LM',  # Levenberg-Marquardt
             'max_iterations': 100,
             'tolerance': 1e-6,
+            'damping': 1e-2,
             'lambda_min': 1e-12,
-            'lambda_max': 1e6
+            'lambda_max': 1e6,
+            'a1': 2.0,  # 误差增大时阻尼放大倍数
+            'a2': 3.0,  # 误差减小时阻尼缩小倍数
+            'verify': False,  # 是否对解做正运动学回代验证（关闭时结果位姿直接取目标位姿）
+            'verify_tolerance': 1e-3  # 回代验证允许的末端变换矩阵最大元素误差
         }
         
+        # 逆运动学后端：lm 为内置解析雅可比LM求解（整个迭代在编译内核中完成），
+        # scipy 为 least_squares 有界求解，rtb 为 roboticstoolbox 的 ikine_LM
+        self.ik_backend = self.config.get('kinematics', {}).get('ik_backend', 'lm')
+        
         logger.info("运动学求解器初始化完成")
     
     def is_enabled(self) -> bool:
@@ -257,14 +487,8 @@ class KinematicsSolver:
                     error_message=f"关节角度数量错误: {len(joint_angles)} != 10"
                 )
             
-            # 转换为numpy数组
-            q = np.array(joint_angles)
-            
-            # 计算正运动学
-            T = self.robot.fkine(q)
-            
-            # 转换为Pose6D
-            pose = Pose6D.from_se3(T)
+            # 计算正运动学并转换为Pose6D
+            pose = Pose6D.from_se3(self.robot_model.fkine(joint_angles))
             
             computation_time = time.time() - start_time
             
@@ -283,6 +507,53 @@ class KinematicsSolver:
                 computation_time=time.time() - start_time
             )
     
+    def forward_kinematics_matrix(self, joint_angles) -> Optional[np.ndarray]:
+        """
+        正运动学求解，只返回末端变换矩阵（不提取欧拉角、不构造结果对象）
+        
+        Args:
+            joint_angles: 关节角度 (10,)，弧度
+            
+        Returns:
+            末端变换矩阵 (4, 4)；求解器不可用或求解失败时返回None
+        """
+        self._ensure_initialized()
+        
+        if not self.enabled:
+            return None
+        
+        try:
+            return self.robot_model.fkine(joint_angles)
+        except Exception as e:
+            logger.error(f"正运动学求解失败: {e}")
+            return None
+    
+    def forward_kinematics_batch(self, joint_angles_batch) -> Optional[np.ndarray]:
+        """
+        批量正运动学求解
+        
+        Args:
+            joint_angles_batch: 关节角度矩阵 (N, 10)，弧度
+            
+        Returns:
+            末端变换矩阵 (N, 4, 4)；求解器不可用或求解失败时返回None
+        """
+        self._ensure_initialized()
+        
+        if not self.enabled:
+            return None
+        
+        try:
+            q = np.atleast_2d(np.asarray(joint_angles_batch, dtype=np.float64))
+            if q.ndim != 2 or q.shape[1] != 10:
+                logger.error(f"关节角度数量错误: {q.shape[-1]} != 10")
+                return None
+            
+            return self.robot_model.fkine_batch(q)
+        except Exception as e:
+            logger.error(f"批量正运动学求解失败: {e}")
+            return None
+    
     @log_performance
     def inverse_kinematics(self, target_pose: Pose6D, 
                           initial_guess: Optional[List[float]] = None) -> KinematicsResult:
@@ -308,8 +579,8 @@ class KinematicsSolver:
         start_time = time.time()
         
         try:
-            # 转换目标位姿为SE3
-            T_target = target_pose.to_se3()
+            # 转换目标位姿为变换矩阵
+            T_target = target_pose.to_matrix()
             
             # 初始猜测
             if initial_guess is None:
@@ -320,29 +591,61 @@ class KinematicsSolver:
                         success=False,
                         error_message=f"初始猜测角度数量错误: {len(initial_guess)} != 10"
                     )
-                q0 = np.array(initial_guess)
+                q0 = np.asarray(initial_guess, dtype=np.float64)
             
             # 逆运动学求解
-            solution = self.robot.ikine_LM(
-                T_target,
-                q0=q0,
-                **self.ik_solver_config
-            )
+            if self.ik_backend == 'rtb':
+                solution = self.robot.ikine_LM(
+                    get_spatialmath().SE3(T_target, check=False),
+                    q0=q0,
+                    ilimit=self.ik_solver_config['max_iterations'],
+                    tol=self.ik_solver_config['tolerance']
+                )
+                q, success, iterations = solution.q, solution.success, getattr(solution, 'iterations', 0)
+            elif self.ik_backend == 'scipy':
+                q, success, iterations = self.robot_model.ikine_least_squares(
+                    T_target, q0,
+                    self.ik_solver_config['max_iterations'],
+                    self.ik_solver_config['tolerance']
+                )
+            else:
+                q, success, iterations = self.robot_model.ikine_lm(
+                    T_target, q0,
+                    self.ik_solver_config['damping'],
+                    self.ik_solver_config['lambda_min'],
+                    self.ik_solver_config['lambda_max'],
+                    self.ik_solver_config['a1'],
+                    self.ik_solver_config['a2'],
+                    self.ik_solver_config['max_iterations'],
+                    self.ik_solver_config['tolerance']
+                )
             
             computation_time = time.time() - start_time
             
-            if solution.success:
-                # 验证解的有效性
-                joint_angles = solution.q.tolist()
-                
-                # 检查关节限位
-                if self._check_joint_limits(joint_angles):
+            if success:
+                # 验证解的有效性：检查关节限位
+                if self._check_joint_limits(q):
+                    end_effector_pose = target_pose
+                    
+                    # 可选的正运动学回代验证，通过时结果位姿取实际到达的位姿
+                    if self.ik_solver_config['verify']:
+                        T_reached = self.robot_model.fkine(q)
+                        residual = float(np.abs(T_reached - T_target).max())
+                        computation_time = time.time() - start_time
+                        if residual > self.ik_solver_config['verify_tolerance']:
+                            return KinematicsResult(
+                                success=False,
+                                error_message=f"逆运动学验证失败：末端误差 {residual:.3g}",
+                                computation_time=computation_time
+                            )
+                        end_effector_pose = Pose6D.from_se3(T_reached)
+                    
                     return KinematicsResult(
                         success=True,
-                        joint_angles=joint_angles,
-                        end_effector_pose=target_pose,
+                        joint_angles=q.tolist(),
+                        end_effector_pose=end_effector_pose,
                         computation_time=computation_time,
-                        iterations=solution.iterations if hasattr(solution, 'iterations') else 0
+                        iterations=iterations
                     )
                 else:
                     return KinematicsResult(
@@ -365,17 +668,17 @@ class KinematicsSolver:
                 computation_time=time.time() - start_time
             )
     
-    def _check_joint_limits(self, joint_angles: List[float]) -> bool:
-        """检查关节限位"""
-        for i, angle in enumerate(joint_angles):
-            if i < len(self.robot_model.joint_limits):
-                min_limit, max_limit = self.robot_model.joint_limits[i]
-                if angle < min_limit or angle > max_limit:
-                    logger.warning(f"关节{i}超限: {angle} not in [{min_limit}, {max_limit}]")
-                    return False
-        return True
+    def _check_joint_limits(self, q: np.ndarray) -> bool:
+        """检查关节限位（向量化比较，超限时只对第一个超限关节告警）"""
+        lo, hi = self.robot_model.q_lo, self.robot_model.q_hi
+        out_of_range = (q < lo) | (q > hi)
+        if not out_of_range.any():
+            return True
+        
+        i = int(np.argmax(out_of_range))
+        logger.warning(f"关节{i}超限: {q[i]} not in [{lo[i]}, {hi[i]}]")
+        return False
     
-    @log_performance
     def jacobian(self, joint_angles: List[float]) -> Optional[np.ndarray]:
         """
         计算雅可比矩阵
@@ -390,8 +693,8 @@ class KinematicsSolver:
             return None
         
         try:
-            q = np.array(joint_angles)
-            J = self.robot.jacob0(q)  # 基坐标系雅可比
+            # 基坐标系几何雅可比（解析计算，与 robot.jacob0 一致）
+            _, J = self.robot_model.fk_and_jacobian(joint_angles)
             return J
         except Exception as e:
             logger.error(f"雅可比矩阵计算失败: {e}")
@@ -405,14 +708,14 @@ class KinematicsSolver:
             joint_angles: 关节角度
             
         Returns:
-            可操作性指标
+            可操作性指标（Yoshikawa：sqrt(det(J·J^T))）
         """
         if not self.enabled:
             return 0.0
         
         try:
-            q = np.array(joint_angles)
-            return float(self.robot.manipulability(q))
+            _, J = self.robot_model.fk_and_jacobian(joint_angles)
+            return math.sqrt(max(np.linalg.det(J @ J.T), 0.0))
         except Exception as e:
             logger.error(f"可操作性计算失败: {e}")
             return 0.0
@@ -439,35 +742,22 @@ class KinematicsSolver:
             num_samples: 采样点数量
             
         Returns:
-            工作空间分析结果
+            工作空间分析结果（workspace_points 为 (N, 3) ndarray，min_bounds/max_bounds 为 (3,) ndarray）
         """
         if not self.enabled:
             return {}
         
         try:
-            # 随机采样关节空间
-            workspace_points = []
-            valid_configs = []
-            
-            for _ in range(num_samples):
-                # 在关节限位内随机采样
-                q = []
-                for i in range(10):
-                    min_limit, max_limit = self.robot_model.joint_limits[i]
-                    angle = np.random.uniform(min_limit, max_limit)
-                    q.append(angle)
-                
-                # 计算正运动学
-                result = self.forward_kinematics(q)
-                if result.success:
-                    pose = result.end_effector_pose
-                    workspace_points.append([pose.x, pose.y, pose.z])
-                    valid_configs.append(q)
-            
-            if not workspace_points:
-                return {}
+            # 在关节限位内随机采样关节空间，一次批量求解正运动学
+            qs = np.random.uniform(self.robot_model.q_lo, self.robot_model.q_hi, size=(num_samples, 10))
+            positions = self.robot_model.fkine_batch(qs)[:, :3, 3]
             
-            workspace_points = np.array(workspace_points)
+            # 只统计末端位置（不提取姿态），并只保留数值有效的样本
+            valid = np.isfinite(positions).all(axis=1)
+            num_valid = int(np.count_nonzero(valid))
+            if not num_valid:
+                return {}
+            workspace_points = positions if num_valid == num_samples else positions[valid]
             
             # 计算工作空间边界
             min_bounds = np.min(workspace_points, axis=0)
@@ -477,31 +767,47 @@ class KinematicsSolver:
             volume = np.prod(max_bounds - min_bounds)
             
             return {
-                'num_valid_configs': len(valid_configs),
-                'workspace_points': workspace_points.tolist(),
-                'min_bounds': min_bounds.tolist(),
-                'max_bounds': max_bounds.tolist(),
+                'num_valid_configs': num_valid,
+                'workspace_points': workspace_points,
+                'min_bounds': min_bounds,
+                'max_bounds': max_bounds,
                 'workspace_volume': float(volume),
-                'reachability_ratio': len(valid_configs) / num_samples
+                'reachability_ratio': num_valid / num_samples
             }
             
         except Exception as e:
             logger.error(f"工作空间分析失败: {e}")
             return {}
     
+    def joint_reach(self) -> Optional[np.ndarray]:
+        """
+        各关节轴到末端执行器距离的保守上界
+        
+        关节i转过Δq时末端位移不超过 reach[i]·|Δq|；上界取关节i及其后
+        各连杆 |a|+|d| 之和再加工具偏移，模型不变时只计算一次。
+        
+        Returns:
+            每个关节的可达半径上界（米），求解器不可用时返回None
+        """
+        if not self.enabled:
+            return None
+        
+        if self._joint_reach is None:
+            link_lengths = np.array(
+                [abs(dh['a']) + abs(dh['d']) for dh in self.robot_model.dh_params],
+                dtype=np.float64
+            )
+            tool_offset = float(np.linalg.norm(self.robot.tool.A[:3, 3]))
+            self._joint_reach = np.cumsum(link_lengths[::-1])[::-1] + tool_offset
+        
+        return self._joint_reach
+    
     def get_robot_info(self) -> Dict[str, Any]:
         """获取机器人模型信息"""
         if not self.enabled:
             return {}
         
-        return {
-            'name': self.robot.name,
-            'num_joints': self.robot.n,
-            'joint_limits': self.robot_model.joint_limits,
-            'dh_parameters': self.robot_model.dh_params,
-            'base_transform': self.robot.base.A.tolist() if hasattr(self.robot, 'base') else None,
-            'tool_transform': self.robot.tool.A.tolist() if hasattr(self.robot, 'tool') else None
-        }
+        return self._robot_info
 
 
 # 全局运动学求解器实例
@@ -5,11 +5,21 @@
 - 延迟加载roboticstoolbox和spatialmath
 - 减少启动时间
 - 按需初始化重型库
+- 多线程同时首次访问时只加载一次
+- 可在启动后于后台线程预加载，首次使用运动学功能时无需等待导入
 """
 
+import threading
 import warnings
 from typing import Optional, Any
 
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 运动学库自身发出的警告一律忽略（只在导入本模块时安装一次过滤规则）
+warnings.filterwarnings("ignore", module=r"(roboticstoolbox|spatialmath)(\..*)?$")
+
 class LazyKinematicsLoader:
     """延迟加载运动学库"""
     
@@ -17,17 +27,19 @@ class LazyKinematicsLoader:
         self._roboticstoolbox = None
         self._spatialmath = None
         self._loaded = False
+        self._lock = threading.Lock()
     
     def _load_libraries(self):
         """加载运动学库"""
         if self._loaded:
             return
-            
-        print("📚 正在加载运动学库...")
         
-        # 抑制警告
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
+        with self._lock:
+            # 等待锁期间其他线程可能已完成加载
+            if self._loaded:
+                return
+            
+            logger.info("正在加载运动学库...")
             
             try:
                 import roboticstoolbox as rtb
@@ -37,12 +49,26 @@ class LazyKinematicsLoader:
                 self._spatialmath = sm
                 self._loaded = True
                 
-                print("✅ 运动学库加载完成")
+                logger.info("运动学库加载完成")
                 
             except ImportError as e:
-                print(f"⚠️  运动学库加载失败: {e}")
+                logger.warning(f"运动学库加载失败: {e}")
                 raise
     
+    def preload_async(self):
+        """在后台线程中预加载运动学库（已加载时直接返回）"""
+        if self._loaded:
+            return
+        
+        def _preload():
+            try:
+                self._load_libraries()
+            except ImportError:
+                # 失败已记录日志，首次实际使用时会再次尝试并报告错误
+                pass
+        
+        threading.Thread(target=_preload, name="KinematicsPreload", daemon=True).start()
+    
     @property
     def roboticstoolbox(self):
         """获取roboticstoolbox模块"""
@@ -72,6 +98,10 @@ def get_spatialmath():
     """获取spatialmath模块"""
     return _lazy_loader.spatialmath
 
+def preload_kinematics_async():
+    """在后台线程中预加载运动学库"""
+    _lazy_loader.preload_async()
+
 def is_kinematics_loaded() -> bool:
     """检查运动学库是否已加载"""
     return _lazy_loader.is_loaded()
\ No newline at end of file
@@ -9,8 +9,10 @@
 - 与硬件层集成
 """
 
+import math
 import time
 import threading
+import numpy as np
 from typing import List, Dict, Optional, Callable
 from dataclasses import dataclass
 from enum import Enum
@@ -32,6 +34,10 @@ from hardware.protocol_handler import get_protocol_handler
 
 logger = get_logger(__name__)
 
+# 编码器计数（一圈3000）与关节角度（弧度）换算系数
+_TICK_TO_RAD = 2 * math.pi / 3000.0
+_RAD_TO_TICK = 1.0 / _TICK_TO_RAD
+
 
 class ControlMode(Enum):
     """控制模式"""
@@ -75,6 +81,16 @@ class SafetyChecker:
         self.enable_velocity_limits = self.safety_config.get('enable_velocity_limits', True)
         self.enable_current_limits = self.safety_config.get('enable_current_limits', True)
         
+        # 各关节限值预先提取为数组，检查时整体比较（超出配置关节数的输入不检查）
+        limits = [joint_config.get('limits', {}) for joint_config in self.joints_config]
+        self._joint_names = [
+            joint_config.get('name', f'joint_{i}') for i, joint_config in enumerate(self.joints_config)
+        ]
+        self._min_pos = np.array([l.get('min_position', 0) for l in limits])
+        self._max_pos = np.array([l.get('max_position', 3000) for l in limits])
+        self._max_vel = np.array([l.get('max_velocity', 1000) for l in limits])
+        self._max_current = np.array([l.get('max_current', 2000) for l in limits])
+        
         logger.info("安全检查器初始化完成")
     
     def check_position_limits(self, positions: List[int]) -> tuple[bool, Optional[str]]:
@@ -82,18 +98,13 @@ class SafetyChecker:
         if not self.enable_soft_limits:
             return True, None
         
-        for i, pos in enumerate(positions):
-            if i >= len(self.joints_config):
-                continue
-            
-            joint_config = self.joints_config[i]
-            limits = joint_config.get('limits', {})
-            min_pos = limits.get('min_position', 0)
-            max_pos = limits.get('max_position', 3000)
-            
-            if pos < min_pos or pos > max_pos:
-                joint_name = joint_config.get('name', f'joint_{i}')
-                return False, f"关节{joint_name}位置超限: {pos} (范围: {min_pos}-{max_pos})"
+        n = min(len(positions), len(self._min_pos))
+        pos = np.asarray(positions[:n])
+        out_of_range = (pos < self._min_pos[:n]) | (pos > self._max_pos[:n])
+        if out_of_range.any():
+            i = int(out_of_range.argmax())
+            return False, (f"关节{self._joint_names[i]}位置超限: {pos[i].item()} "
+                           f"(范围: {self._min_pos[i].item()}-{self._max_pos[i].item()})")
         
         return True, None
     
@@ -102,17 +113,12 @@ class SafetyChecker:
         if not self.enable_velocity_limits:
             return True, None
         
-        for i, vel in enumerate(velocities):
-            if i >= len(self.joints_config):
-                continue
-            
-            joint_config = self.joints_config[i]
-            limits = joint_config.get('limits', {})
-            max_vel = limits.get('max_velocity', 1000)
-            
-            if abs(vel) > max_vel:
-                joint_name = joint_config.get('name', f'joint_{i}')
-                return False, f"关节{joint_name}速度超限: {abs(vel):.1f} > {max_vel}"
+        n = min(len(velocities), len(self._max_vel))
+        speed = np.abs(np.asarray(velocities[:n]))
+        over = speed > self._max_vel[:n]
+        if over.any():
+            i = int(over.argmax())
+            return False, f"关节{self._joint_names[i]}速度超限: {speed[i].item():.1f} > {self._max_vel[i].item()}"
         
         return True, None
     
@@ -121,41 +127,26 @@ class SafetyChecker:
         if not self.enable_current_limits:
             return True, None
         
-        for i, current in enumerate(currents):
-            if i >= len(self.joints_config):
-                continue
-            
-            joint_config = self.joints_config[i]
-            limits = joint_config.get('limits', {})
-            max_current = limits.get('max_current', 2000)
-            
-            if current > max_current:
-                joint_name = joint_config.get('name', f'joint_{i}')
-                return False, f"关节{joint_name}电流超限: {current}mA > {max_current}mA"
+        n = min(len(currents), len(self._max_current))
+        current = np.asarray(currents[:n])
+        over = current > self._max_current[:n]
+        if over.any():
+            i = int(over.argmax())
+            return False, f"关节{self._joint_names[i]}电流超限: {current[i].item()}mA > {self._max_current[i].item()}mA"
         
         return True, None
     
     def limit_positions(self, positions: List[int]) -> List[int]:
         """限制位置到安全范围"""
-        limited = []
-        for i, pos in enumerate(positions):
-            if i >= len(self.joints_config):
-                limited.append(pos)
-                continue
-            
-            joint_config = self.joints_config[i]
-            limits = joint_config.get('limits', {})
-            min_pos = limits.get('min_position', 0)
-            max_pos = limits.get('max_position', 3000)
-            
-            limited_pos = max(min_pos, min(max_pos, pos))
-            if limited_pos != pos:
-                joint_name = joint_config.get('name', f'joint_{i}')
-                logger.warning(f"关节{joint_name}位置被限制: {pos} -> {limited_pos}")
-            
-            limited.append(limited_pos)
+        n = min(len(positions), len(self._min_pos))
+        pos = np.asarray(positions[:n])
+        limited = np.clip(pos, self._min_pos[:n], self._max_pos[:n])
+        
+        changed = np.flatnonzero(limited != pos)
+        for i in changed:
+            logger.warning(f"关节{self._joint_names[i]}位置被限制: {pos[i].item()} -> {limited[i].item()}")
         
-        return limited
+        return limited.tolist() + list(positions[n:])
 
 
 class MotionController:
@@ -346,7 +337,7 @@ class MotionController:
                     return False
                 
                 # 转换为整数位置（假设需要转换）
-                target_positions = [int(round(angle * 3000 / (2 * 3.14159))) for angle in ik_result.joint_angles]
+                target_positions = np.rint(np.asarray(ik_result.joint_angles) * _RAD_TO_TICK).astype(np.int32).tolist()
                 
                 # 调用位置控制
                 return self.move_to_position(target_positions, duration, interpolation_type)
@@ -378,7 +369,7 @@ class MotionController:
                     return False
                 
                 # 获取当前位姿
-                current_angles = [pos * 2 * 3.14159 / 3000 for pos in self.current_positions]  # 转换为弧度
+                current_angles = self._current_joint_angles()
                 fk_result = self.kinematics_solver.forward_kinematics(current_angles)
                 if not fk_result.success:
                     logger.error("无法获取当前位姿")
@@ -473,6 +464,10 @@ class MotionController:
             logger.error(f"未知的速度预设: {preset_name}")
             return False
     
+    def _current_joint_angles(self) -> np.ndarray:
+        """当前位置（编码器计数）转换为关节角度（弧度）"""
+        return np.multiply(self.current_positions, _TICK_TO_RAD)
+    
     def get_current_pose(self) -> Optional[Pose6D]:
         """
         获取当前末端执行器位姿
@@ -484,8 +479,7 @@ class MotionController:
             return None
         
         try:
-            # 转换当前位置为弧度
-            current_angles = [pos * 2 * 3.14159 / 3000 for pos in self.current_positions]
+            current_angles = self._current_joint_angles()
             
             # 正运动学求解
             fk_result = self.kinematics_solver.forward_kinematics(current_angles)
@@ -510,7 +504,7 @@ class MotionController:
             return 0.0
         
         try:
-            current_angles = [pos * 2 * 3.14159 / 3000 for pos in self.current_positions]
+            current_angles = self._current_joint_angles()
             return self.kinematics_solver.manipulability(current_angles)
         except Exception as e:
             logger.error(f"计算可操作性失败: {e}")
@@ -527,7 +521,7 @@ class MotionController:
             return False
         
         try:
-            current_angles = [pos * 2 * 3.14159 / 3000 for pos in self.current_positions]
+            current_angles = self._current_joint_angles()
             return self.kinematics_solver.is_singular(current_angles)
         except Exception as e:
             logger.error(f"奇异点检测失败: {e}")
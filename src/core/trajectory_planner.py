@@ -10,7 +10,7 @@
 """
 
 import numpy as np
-from scipy import interpolate
+from scipy.linalg import solveh_banded
 from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
@@ -30,6 +30,7 @@ class InterpolationType(Enum):
     TRAPEZOIDAL = "trapezoidal"
     S_CURVE = "s_curve"
     BEZIER = "bezier"
+    NATURAL_SPLINE = "natural_spline"  # 多点规划时经过全部路径点整体拟合（路径点之间不再是直线，可能过冲）
 
 
 class VelocityProfile(Enum):
@@ -183,7 +184,8 @@ class TrajectoryPlanner:
         # 根据插值类型生成轨迹
         if interpolation_type == InterpolationType.LINEAR:
             points = self._generate_linear_trajectory(start_positions, end_positions, duration)
-        elif interpolation_type == InterpolationType.CUBIC_SPLINE:
+        elif interpolation_type in (InterpolationType.CUBIC_SPLINE, InterpolationType.NATURAL_SPLINE):
+            # 两点的自然三次样条即为三次样条
             points = self._generate_cubic_spline_trajectory(start_positions, end_positions, duration)
         elif interpolation_type == InterpolationType.QUINTIC:
             points = self._generate_quintic_trajectory(start_positions, end_positions, duration)
@@ -242,25 +244,34 @@ class TrajectoryPlanner:
                 durations.append(duration)
         
         # 生成连续轨迹
-        all_points = []
-        current_time = 0.0
-        
-        for i in range(len(waypoints) - 1):
-            segment_duration = durations[i]
+        if interpolation_type == InterpolationType.NATURAL_SPLINE:
+            # 自然三次样条：经过全部路径点整体拟合，保证路径点处加速度连续（需显式选择）
+            all_points = self._generate_multi_point_cubic_spline(waypoints, durations)
+            total_duration = float(sum(durations))
+        else:
+            all_points = []
+            current_time = 0.0
             
-            # 生成段轨迹
-            segment_trajectory = self.plan_point_to_point(
-                waypoints[i], waypoints[i + 1], segment_duration, interpolation_type, constraints
-            )
+            for i in range(len(waypoints) - 1):
+                segment_duration = durations[i]
+                
+                # 生成段轨迹
+                segment_trajectory = self.plan_point_to_point(
+                    waypoints[i], waypoints[i + 1], segment_duration, interpolation_type, constraints
+                )
+                
+                # 调整时间戳
+                for point in segment_trajectory.points:
+                    point.timestamp += current_time
+                    all_points.append(point)
+                
+                current_time += segment_duration
             
-            # 调整时间戳
-            for point in segment_trajectory.points:
-                point.timestamp += current_time
-                all_points.append(point)
+            total_duration = current_time
             
-            current_time += segment_duration
-        
-        total_duration = current_time
+            # 段内按控制周期采样，段时长不是周期整数倍时最后一个采样点落在终点之前；补上终点，保证停在最后一个路径点
+            if all_points and all_points[-1].timestamp < total_duration - 1e-9:
+                all_points.append(TrajectoryPoint(total_duration, list(waypoints[-1])))
         
         trajectory = Trajectory(
             points=all_points,
@@ -332,41 +343,120 @@ class TrajectoryPlanner:
         return points
     
     def _generate_cubic_spline_trajectory(self, start: List[float], end: List[float], duration: float) -> List[TrajectoryPoint]:
-        """生成三次样条插值轨迹"""
+        """生成三次样条插值轨迹（全部关节一次拟合、一次求值）"""
         control_frequency = self.config.get('control', {}).get('frequency', 200)
         dt = 1.0 / control_frequency
         num_points = int(duration / dt) + 1
         
-        # 时间节点
-        t_nodes = np.array([0.0, duration])
+        knots = np.array([0.0, duration])
+        coefficients, _ = self._fit_natural_cubic(np.array([start, end], dtype=np.float64), knots[1:])
         
-        points = []
-        for joint_idx in range(len(start)):
-            # 位置节点
-            pos_nodes = np.array([start[joint_idx], end[joint_idx]])
-            
-            # 创建三次样条插值
-            cs = interpolate.CubicSpline(t_nodes, pos_nodes, bc_type='natural')
-            
-            # 生成轨迹点
-            for i in range(num_points):
-                t = i * dt
-                t = min(t, duration)
-                
-                if joint_idx == 0:  # 第一个关节时创建点
-                    points.append(TrajectoryPoint(t, [], [], []))
-                
-                # 计算位置、速度、加速度
-                pos = float(cs(t))
-                vel = float(cs(t, 1))  # 一阶导数
-                acc = float(cs(t, 2))  # 二阶导数
-                
-                points[i].positions.append(pos)
-                points[i].velocities.append(vel)
-                points[i].accelerations.append(acc)
+        t = np.minimum(np.arange(num_points) * dt, duration)
+        positions, velocities, accelerations = self._evaluate_cubic(coefficients, knots, t)
+        
+        return [
+            TrajectoryPoint(ti, pos, vel, acc)
+            for ti, pos, vel, acc in zip(t.tolist(), positions.tolist(),
+                                         velocities.tolist(), accelerations.tolist())
+        ]
+    
+    def _generate_multi_point_cubic_spline(self, waypoints: List[List[float]],
+                                           durations: List[float]) -> List[TrajectoryPoint]:
+        """
+        生成经过全部路径点的自然三次样条轨迹
+        
+        全部关节共用一次三对角求解与一次向量化求值，终点精确落在最后一个路径点。
+        """
+        control_frequency = self.config.get('control', {}).get('frequency', 200)
+        dt = 1.0 / control_frequency
+        
+        Y = np.asarray(waypoints, dtype=np.float64)   # (N, 关节数)
+        h = np.asarray(durations, dtype=np.float64)   # (N-1,)
+        knots = np.concatenate(([0.0], np.cumsum(h)))
+        total_duration = knots[-1]
+        
+        coefficients, M = self._fit_natural_cubic(Y, h)
+        
+        # 按控制周期采样，终点单独添加
+        t = np.arange(int(total_duration / dt) + 1) * dt
+        t = t[t < total_duration - 1e-9]
+        positions, velocities, accelerations = self._evaluate_cubic(coefficients, knots, t)
+        
+        points = [
+            TrajectoryPoint(ti, pos, vel, acc)
+            for ti, pos, vel, acc in zip(t.tolist(), positions.tolist(),
+                                         velocities.tolist(), accelerations.tolist())
+        ]
+        
+        _, b, c, d = coefficients
+        h_last = h[-1]
+        end_velocity = b[-1] + h_last * (2.0 * c[-1] + 3.0 * h_last * d[-1])
+        points.append(TrajectoryPoint(float(total_duration), Y[-1].tolist(),
+                                      end_velocity.tolist(), M[-1].tolist()))
         
         return points
     
+    def _fit_natural_cubic(self, Y: np.ndarray, h: np.ndarray) -> Tuple[Tuple[np.ndarray, ...], np.ndarray]:
+        """
+        所有关节一次拟合自然三次样条
+        
+        节点二阶导数 M 由三对角系统求解（两端 M=0，各关节作为多列右端项），
+        每段 S(τ) = a + b·τ + c·τ² + d·τ³。
+        
+        Args:
+            Y: 节点值 (N, 关节数)
+            h: 各段时长 (N-1,)
+            
+        Returns:
+            ((a, b, c, d), M)，系数形状均为 (N-1, 关节数)，M 为 (N, 关节数)
+        """
+        slopes = np.diff(Y, axis=0) / h[:, None]
+        M = np.zeros_like(Y)
+        if len(Y) > 2:
+            M[1:-1] = self._solve_natural_cubic(h, 6.0 * np.diff(slopes, axis=0))
+        
+        a = Y[:-1]
+        b = slopes - h[:, None] * (2.0 * M[:-1] + M[1:]) / 6.0
+        c = M[:-1] / 2.0
+        d = np.diff(M, axis=0) / (6.0 * h[:, None])
+        return (a, b, c, d), M
+    
+    def _evaluate_cubic(self, coefficients: Tuple[np.ndarray, ...], knots: np.ndarray,
+                        t: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """在一组时间点上对全部关节求位置、速度、加速度，返回形状均为 (len(t), 关节数)"""
+        a, b, c, d = coefficients
+        seg = np.clip(np.searchsorted(knots, t, side='right') - 1, 0, len(a) - 1)
+        tau = (t - knots[seg])[:, None]
+        a, b, c, d = a[seg], b[seg], c[seg], d[seg]
+        
+        positions = a + tau * (b + tau * (c + tau * d))
+        velocities = b + tau * (2.0 * c + 3.0 * tau * d)
+        accelerations = 2.0 * c + 6.0 * tau * d
+        return positions, velocities, accelerations
+    
+    def _solve_natural_cubic(self, h: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+        """
+        求解自然三次样条内部节点的二阶导数
+        
+        系统 h[i-1]·M[i-1] + 2(h[i-1]+h[i])·M[i] + h[i]·M[i+1] = rhs[i] 为对称正定
+        三对角矩阵，按带状存储用 solveh_banded（带状Cholesky）求解，O(N) 时间和内存，
+        多列右端项共用一次分解。
+        
+        Args:
+            h: 各段时长 (N-1,)
+            rhs: 右端项 (N-2,) 或 (N-2, 列数)
+            
+        Returns:
+            内部节点二阶导数，形状与 rhs 相同
+        """
+        n = len(h) - 1
+        ab = np.zeros((2, n), dtype=np.float64)
+        ab[0, 1:] = h[1:n]                  # 上对角线
+        ab[1] = 2.0 * (h[:-1] + h[1:])      # 主对角线
+        if n == 1:
+            return rhs / ab[1, 0]
+        return solveh_banded(ab, rhs)
+    
     def _generate_quintic_trajectory(self, start: List[float], end: List[float], duration: float) -> List[TrajectoryPoint]:
         """生成五次多项式轨迹"""
         control_frequency = self.config.get('control', {}).get('frequency', 200)
@@ -207,7 +207,7 @@ class WorkspaceVisualizationWidget(QWidget):
                 return
             
             # 获取工作空间点
-            self.workspace_points = np.array(workspace_data['workspace_points'])
+            self.workspace_points = workspace_data['workspace_points']
             
             # 清除旧的点云
             self.clear_workspace()
@@ -358,7 +358,7 @@ class KinematicsPanel(QWidget):
         
         algorithm_layout.addWidget(QLabel("算法:"))
         self.algorithm_combo = QComboBox()
-        self.algorithm_combo.addItems(["RRT", "RRT*", "A*"])
+        self.algorithm_combo.addItems(["RRT", "RRT-Connect", "RRT*", "A*"])
         algorithm_layout.addWidget(self.algorithm_combo)
         
         layout.addWidget(algorithm_group)
@@ -552,6 +552,7 @@ class KinematicsPanel(QWidget):
             algorithm_name = self.algorithm_combo.currentText()
             algorithm_map = {
                 "RRT": PlanningAlgorithm.RRT,
+                "RRT-Connect": PlanningAlgorithm.RRT_CONNECT,
                 "RRT*": PlanningAlgorithm.RRT_STAR,
                 "A*": PlanningAlgorithm.A_STAR
             }
@@ -218,6 +218,8 @@ class ConfigManager:
             },
             "control": {
                 "frequency": 200,
+                "spin_threshold": 0.0005,
+                "publish_decimation": 5,
                 "trajectory_buffer_size": 200,
                 "buffer_low_watermark": 50,
                 "buffer_high_watermark": 500,
@@ -225,6 +227,9 @@ class ConfigManager:
                 "enable_feedforward": True,
                 "enable_pid": False,
             },
+            "kinematics": {
+                "ik_backend": "lm",
+            },
             "trajectory": {
                 "default_duration": 1.0,
                 "default_max_velocity": 500,
@@ -142,12 +142,17 @@ def log_performance(func):
     """
     性能监控装饰器
 
+    仅在设置环境变量 EVOBOT_PERF_LOG 时生效；未设置时直接返回原函数，
+    热路径上不产生计时与日志开销。该变量在装饰（模块导入）时读取。
+
     Args:
         func: 被装饰的函数
 
     Returns:
         装饰后的函数
     """
+    if not os.environ.get("EVOBOT_PERF_LOG"):
+        return func
 
     @wraps(func)
     def wrapper(*args, **kwargs):
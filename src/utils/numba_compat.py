@@ -0,0 +1,27 @@
+"""
+Numba兼容层
+
+功能：
+- 可选加载numba，未安装时程序照常运行
+- 提供统一的 njit / prange 接口
+- 未安装numba时 njit 原样返回函数，prange 退化为 range
+"""
+
+from typing import Any, Callable
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args: Any, **kwargs: Any) -> Any:
+        """numba.njit 的占位实现：不编译，直接返回原函数"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func: Callable) -> Callable:
+            return func
+
+        return decorator
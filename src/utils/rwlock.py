@@ -0,0 +1,81 @@
+"""
+读写锁
+
+功能：
+- 多个读者可同时持有读锁
+- 写者独占，且有写者等待时新读者让行（避免写饥饿）
+- gen_rlock() / gen_wlock() 返回可直接用于 with 语句的锁对象
+"""
+
+import threading
+from types import TracebackType
+from typing import Callable, Literal, Optional, Type
+
+
+class _LockGuard:
+    """with 语句适配：进入时加锁，退出时解锁"""
+
+    __slots__ = ("_acquire", "_release")
+
+    def __init__(self, acquire: Callable[[], None], release: Callable[[], None]) -> None:
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self) -> "_LockGuard":
+        self._acquire()
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> Literal[False]:
+        self._release()
+        return False
+
+
+class RWLock:
+    """写者优先的读写锁"""
+
+    def __init__(self) -> None:
+        """初始化读写锁"""
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+        self._rlock = _LockGuard(self.acquire_read, self.release_read)
+        self._wlock = _LockGuard(self.acquire_write, self.release_write)
+
+    def acquire_read(self) -> None:
+        """获取读锁"""
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        """释放读锁"""
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        """获取写锁"""
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        """释放写锁"""
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    def gen_rlock(self) -> _LockGuard:
+        """读锁（用于 with 语句）"""
+        return self._rlock
+
+    def gen_wlock(self) -> _LockGuard:
+        """写锁（用于 with 语句）"""
+        return self._wlock
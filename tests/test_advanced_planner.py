@@ -0,0 +1,216 @@
+"""
+高级路径规划器测试
+"""
+
+import pytest
+import sys
+from pathlib import Path
+import numpy as np
+
+# 添加src目录到Python路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core import _rrt_kernels
+from core.advanced_planner import AdvancedMotionPlanner, Obstacle, PlanningAlgorithm, RRTTree
+
+
+class _StubKinematicsSolver:
+    """桩运动学求解器：末端位置取前三个关节值，使碰撞检测真实执行"""
+
+    def __init__(self, joint_limits):
+        self.joint_limits = joint_limits
+
+    def is_enabled(self):
+        return True
+
+    def forward_kinematics_batch(self, configs):
+        configs = np.atleast_2d(configs)
+        transforms = np.tile(np.eye(4), (len(configs), 1, 1))
+        transforms[:, :3, 3] = configs[:, :3]
+        return transforms
+
+    def joint_reach(self):
+        reach = np.zeros(len(self.joint_limits))
+        reach[:3] = 1.0
+        return reach
+
+    def get_robot_info(self):
+        return {'joint_limits': self.joint_limits}
+
+
+def _make_planner(dof=3, limit=1.0, seed=0):
+    planner = AdvancedMotionPlanner()
+    solver = _StubKinematicsSolver([(-limit, limit)] * dof)
+    planner.kinematics_solver = solver
+    planner.collision_checker.kinematics_solver = solver
+    planner.rrt_planner.kinematics_solver = solver
+    planner.rrt_planner._rng = np.random.default_rng(seed)
+    return planner
+
+
+class TestRRTTree:
+    """RRT树存储测试类"""
+
+    def test_grow_keeps_nodes(self):
+        """测试容量倍增后节点与父索引保持不变"""
+        tree = RRTTree(dof=3, initial_capacity=2)
+        tree.reset(np.zeros(3))
+        for i in range(1, 10):
+            tree.add_node(np.full(3, float(i)), i - 1, float(i))
+
+        assert tree.node_count == 10
+        branch = tree.branch(9)
+        assert len(branch) == 10
+        assert branch[0] == [0.0, 0.0, 0.0]
+        assert branch[-1] == [9.0, 9.0, 9.0]
+
+    def test_reset_with_new_dof_after_growth(self):
+        """测试树扩容后以不同自由度重置，仍可继续添加节点"""
+        tree = RRTTree(dof=10, initial_capacity=4)
+        tree.reset(np.zeros(10))
+        for i in range(6):
+            tree.add_node(np.full(10, float(i)), 0, 1.0)
+
+        tree.reset(np.zeros(6))
+        for i in range(10):
+            tree.add_node(np.full(6, float(i)), i, 1.0)
+
+        assert tree.node_count == 11
+        assert tree.configs.shape[1] == 6
+        assert len(tree.configs) == len(tree.parents) == len(tree.costs)
+        assert tree.branch(10)[-1] == [9.0] * 6
+
+    def test_nearest(self):
+        """测试最近邻查询（含KD树索引与未索引节点）"""
+        rng = np.random.default_rng(0)
+        points = rng.uniform(-1.0, 1.0, (300, 4))
+        tree = RRTTree(dof=4, initial_capacity=8)
+        tree.reset(points[0])
+        for p in points[1:]:
+            tree.add_node(p, 0, 0.0)
+
+        for target in rng.uniform(-1.0, 1.0, (20, 4)):
+            expected = int(np.argmin(np.sum((points - target) ** 2, axis=1)))
+            assert tree.nearest(target) == expected
+
+
+class TestRRTConnect:
+    """RRT-Connect双向规划测试类"""
+
+    def _box_planner(self, obstacles, max_iterations=5000):
+        planner = _make_planner()
+        planner.set_obstacles(obstacles)
+        planner.rrt_planner.max_iterations = max_iterations
+        return planner
+
+    @staticmethod
+    def _tree_for(rrt, root):
+        """与规划入口相同：缓存限位、按维数选择内核后以 root 重置起点树"""
+        rrt._cache_joint_limits(len(root))
+        rrt._distance_kernel, rrt._steer_kernel = _rrt_kernels.kernels_for_dof(len(root))
+        rrt._tree.reset(np.asarray(root, dtype=np.float64))
+        return rrt._tree
+
+    @staticmethod
+    def _enclosure(center, inner, thickness):
+        """围住 center 的六块板状障碍物（内部边长 2*inner）"""
+        outer = 2 * (inner + thickness)
+        obstacles = []
+        for axis in range(3):
+            for sign in (-1.0, 1.0):
+                offset = np.zeros(3)
+                offset[axis] = sign * (inner + thickness / 2)
+                size = np.full(3, outer)
+                size[axis] = thickness
+                obstacles.append(Obstacle(type="box", center=(np.asarray(center) + offset).tolist(), size=size.tolist()))
+        return obstacles
+
+    def test_free_space(self):
+        """测试无障碍时规划成功，路径从起点出发、到达目标"""
+        planner = _make_planner()
+        start, goal = [-0.8, 0.5, -0.3], [0.7, -0.6, 0.4]
+
+        result = planner.plan_joint_path(start, goal, PlanningAlgorithm.RRT_CONNECT)
+
+        assert result.success
+        np.testing.assert_allclose(result.path[0], start)
+        np.testing.assert_allclose(result.path[-1], goal)
+        steps = np.linalg.norm(np.diff(np.array(result.path), axis=0), axis=1)
+        assert np.all(steps <= planner.rrt_planner.step_size + 1e-9)
+
+    def test_segments_avoid_obstacle(self):
+        """测试绕障路径的每一段都通过碰撞检测（直连起点与目标会碰撞）"""
+        planner = self._box_planner([Obstacle(type="box", center=[0.0, 0.0, 0.0], size=[0.8, 0.8, 2.0])])
+        checker = planner.collision_checker
+        start, goal = [-0.8, -0.8, 0.0], [0.8, 0.8, 0.0]
+        assert checker.check_segment_collision(start, goal, num_checks=100)
+
+        result = planner.plan_joint_path(start, goal, PlanningAlgorithm.RRT_CONNECT)
+
+        assert result.success
+        np.testing.assert_allclose(result.path[0], start)
+        np.testing.assert_allclose(result.path[-1], goal)
+        for config1, config2 in zip(result.path[:-1], result.path[1:]):
+            assert not checker.check_segment_collision(config1, config2, num_checks=20)
+
+    def test_enclosed_goal_fails(self):
+        """测试目标被障碍物完全包围时报告规划失败"""
+        planner = self._box_planner(self._enclosure([0.5, 0.5, 0.5], inner=0.2, thickness=0.1), max_iterations=300)
+
+        result = planner.plan_joint_path([-0.5, -0.5, -0.5], [0.5, 0.5, 0.5], PlanningAlgorithm.RRT_CONNECT)
+
+        assert not result.success
+        assert result.path is None
+        assert result.error_message == "超过最大迭代次数"
+        assert result.iterations == 300
+
+    def test_connect_stops_at_obstacle(self):
+        """测试连续扩展遇障停止于障碍物之前，无障碍时恰好到达目标"""
+        planner = self._box_planner([Obstacle(type="box", center=[0.0, 0.0, 0.0], size=[0.2, 2.0, 2.0])])
+        rrt = planner.rrt_planner
+        tree = self._tree_for(rrt, [-0.8, 0.0, 0.0])
+
+        node_id, reached = rrt._connect(tree, np.array([0.8, 0.0, 0.0]))
+        assert not reached
+        assert -0.1 - rrt.step_size <= tree.configs[node_id][0] < -0.1
+
+        node_id, reached = rrt._connect(tree, np.array([-0.8, 0.9, 0.0]))
+        assert reached
+        np.testing.assert_array_equal(tree.configs[node_id], [-0.8, 0.9, 0.0])
+
+    def test_extend_blocked_returns_negative(self):
+        """测试单步扩展受阻时返回-1且不添加节点"""
+        planner = self._box_planner([Obstacle(type="box", center=[0.0, 0.0, 0.0], size=[0.2, 2.0, 2.0])])
+        rrt = planner.rrt_planner
+        tree = self._tree_for(rrt, [-0.12, 0.0, 0.0])
+
+        assert rrt._extend(tree, np.array([0.8, 0.0, 0.0])) == -1
+        assert tree.node_count == 1
+        assert rrt._extend(tree, np.array([-0.8, 0.0, 0.0])) == 1
+
+
+class TestPathToTrajectory:
+    """路径转轨迹测试类"""
+
+    def test_rrt_path_trajectory_stays_within_limits(self):
+        """测试贴近限位绕障的RRT路径（优化后仅剩少数拐点）生成的轨迹不超出关节限位与路径点范围"""
+        planner = _make_planner()
+        planner.set_obstacles([Obstacle(type="box", center=[0.0, 0.0, 0.0], size=[1.6, 1.6, 2.0])])
+        start, goal = [-0.9, -0.9, 0.0], [0.9, 0.9, 0.0]
+
+        result = planner.plan_joint_path(start, goal, PlanningAlgorithm.RRT)
+        assert result.success
+        path = planner.optimize_path(result.path)
+
+        trajectory = planner.path_to_trajectory(path, total_duration=2.0)
+        assert trajectory is not None
+        P = np.array([p.positions for p in trajectory.points])
+        W = np.array(path)
+
+        assert np.all(np.abs(P) <= 1.0)
+        assert np.all(P >= W.min(axis=0) - 1e-9) and np.all(P <= W.max(axis=0) + 1e-9)
+        np.testing.assert_allclose(P[0], start)
+        np.testing.assert_allclose(P[-1], goal)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,240 @@
+"""
+插值引擎测试
+"""
+
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+import numpy as np
+
+# 添加src目录到Python路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core import _interp_kernels
+from core.interpolator import Interpolator, TrajectoryBuffer, _SAMPLE_RING_SIZE
+from core.trajectory_planner import (
+    TrajectoryPlanner, InterpolationType, TrajectoryConstraints, TrajectoryPoint, Trajectory
+)
+from utils.message_bus import Topics
+
+
+def _make_trajectory(points, interpolation_type):
+    return Trajectory(
+        points=list(points),
+        duration=points[-1].timestamp,
+        interpolation_type=interpolation_type,
+        constraints=TrajectoryConstraints([1000.0] * 2, [1000.0] * 2)
+    )
+
+
+def _quintic(start, end, duration, t):
+    """五次多项式点到点轨迹的解析位置（与规划器相同的边界条件）"""
+    tau = np.clip(t / duration, 0.0, 1.0)
+    s = 10 * tau**3 - 15 * tau**4 + 6 * tau**5
+    return start + s * (end - start)
+
+
+class TestLocate:
+    """轨迹区间查找测试类"""
+
+    @pytest.mark.parametrize('locate', [_interp_kernels._locate_np, _interp_kernels._locate_jit])
+    def test_locate_matches_interval(self, locate):
+        """测试任意起点下找到的区间都包含查询时间（含时长为0的区间、回退与大幅跳跃）"""
+        rng = np.random.default_rng(0)
+        ts = np.cumsum(rng.choice([0.0, 0.05, 0.1, 0.3], size=200))
+        n = len(ts)
+
+        for _ in range(2000):
+            t = rng.uniform(ts[0], ts[-1])
+            last_i = int(rng.integers(0, n))
+            i = locate(ts, t, last_i)
+
+            assert 0 <= i <= n - 2
+            assert ts[i] <= t <= ts[i + 1]
+
+    @pytest.mark.parametrize('locate', [_interp_kernels._locate_np, _interp_kernels._locate_jit])
+    def test_locate_sequential(self, locate):
+        """测试时间递增时从上次区间向后推进"""
+        ts = np.arange(0.0, 10.0, 0.1)
+        i = 0
+        for t in np.arange(0.0, ts[-1], 0.037):
+            i = locate(ts, t, i)
+            assert ts[i] <= t <= ts[i + 1]
+
+
+class TestHermiteInterpolation:
+    """三次Hermite位置插值测试类"""
+
+    def setup_method(self):
+        """测试前设置"""
+        self.planner = TrajectoryPlanner()
+        self.start = np.array([1000.0, 1200.0, 1500.0, 1800.0, 2000.0, 1500.0, 1000.0, 1200.0, 1800.0, 2000.0])
+        self.end = np.array([2000.0, 1800.0, 1000.0, 1200.0, 1500.0, 2000.0, 1800.0, 1500.0, 1000.0, 1200.0])
+
+    def _load(self, trajectory):
+        buffer = TrajectoryBuffer()
+        assert buffer.add_trajectory(trajectory)
+        return buffer
+
+    def test_knots_and_boundary_continuity(self):
+        """测试轨迹点处取原值，且区间边界两侧位置连续"""
+        trajectory = self.planner.plan_point_to_point(
+            self.start.tolist(), self.end.tolist(), duration=2.0,
+            interpolation_type=InterpolationType.QUINTIC
+        )
+        buffer = self._load(trajectory)
+        eps = 1e-6
+
+        for point in trajectory.points[1:-1]:
+            t = point.timestamp
+            at = np.array(buffer.get_point_at_time(t).positions)
+            before = np.array(buffer.get_point_at_time(t - eps).positions)
+            after = np.array(buffer.get_point_at_time(t + eps).positions)
+
+            np.testing.assert_allclose(at, point.positions, atol=1e-2)
+            np.testing.assert_allclose(before, at, atol=1e-2)
+            np.testing.assert_allclose(after, at, atol=1e-2)
+
+    def test_agrees_with_planner_curve(self):
+        """测试区间中点的插值位置与规划器的解析曲线一致，且明显优于线性插值"""
+        duration = 2.0
+        trajectory = self.planner.plan_point_to_point(
+            self.start.tolist(), self.end.tolist(), duration=duration,
+            interpolation_type=InterpolationType.QUINTIC
+        )
+        buffer = self._load(trajectory)
+        ts = np.array([p.timestamp for p in trajectory.points])
+        P = np.array([p.positions for p in trajectory.points])
+        mids = 0.5 * (ts[:-1] + ts[1:])
+
+        hermite = np.array([buffer.get_point_at_time(t).positions for t in mids])
+        linear = P[:-1] + 0.5 * (P[1:] - P[:-1])
+        expected = np.array([_quintic(self.start, self.end, duration, t) for t in mids])
+
+        hermite_error = np.abs(hermite - expected).max()
+        linear_error = np.abs(linear - expected).max()
+        assert hermite_error < 0.1
+        assert hermite_error < linear_error / 10
+
+    def test_linear_trajectory_unchanged(self):
+        """测试线性轨迹仍按区间线性插值"""
+        trajectory = self.planner.plan_point_to_point(
+            self.start.tolist(), self.end.tolist(), duration=2.0,
+            interpolation_type=InterpolationType.LINEAR
+        )
+        buffer = self._load(trajectory)
+        ts = np.array([p.timestamp for p in trajectory.points])
+        P = np.array([p.positions for p in trajectory.points])
+
+        for t in np.linspace(ts[0], ts[-1], 57):
+            expected = [np.interp(t, ts, P[:, j]) for j in range(P.shape[1])]
+            np.testing.assert_allclose(buffer.get_point_at_time(t).positions, expected, atol=1e-2)
+
+    def test_zero_length_segment(self):
+        """测试时长为0的区间取区间起点，两侧插值正常"""
+        points = [
+            TrajectoryPoint(0.0, [0.0, 10.0], [0.0, 0.0]),
+            TrajectoryPoint(1.0, [100.0, 20.0], [50.0, 5.0]),
+            TrajectoryPoint(1.0, [200.0, 30.0], [50.0, 5.0]),
+            TrajectoryPoint(2.0, [300.0, 40.0], [0.0, 0.0]),
+        ]
+        buffer = self._load(_make_trajectory(points, InterpolationType.CUBIC_SPLINE))
+
+        at = buffer.get_point_at_time(1.0)
+        assert at.positions in (points[1].positions, points[2].positions)
+
+        before = buffer.get_point_at_time(0.5).positions
+        after = buffer.get_point_at_time(1.5).positions
+        assert all(np.isfinite(before)) and all(np.isfinite(after))
+        assert 0.0 < before[0] < 100.0
+        assert 200.0 < after[0] < 300.0
+
+
+class TestTrajectoryBufferSampling:
+    """轨迹缓冲区采样测试类"""
+
+    def _buffer(self):
+        points = [TrajectoryPoint(0.1 * i, [float(i), float(2 * i)], [10.0, 20.0]) for i in range(101)]
+        buffer = TrajectoryBuffer()
+        buffer.add_trajectory(_make_trajectory(points, InterpolationType.LINEAR))
+        return buffer
+
+    def test_get_point_at_time_keeps_segment_hint(self):
+        """测试按时间查询不改变控制循环的区间推进位置"""
+        buffer = self._buffer()
+        out = np.empty((3, 2))
+        buffer.sample_state(5.05, out)
+        last_i = buffer._last_i
+
+        buffer.get_point_at_time(0.55)
+        buffer.get_point_at_time(9.95)
+        assert buffer._last_i == last_i
+
+    def test_concurrent_get_point_at_time(self):
+        """测试多个线程同时查询互不影响"""
+        buffer = self._buffer()
+        times = np.linspace(0.0, 10.0, 401)
+        expected = {t: buffer.get_point_at_time(t).positions for t in times}
+        errors = []
+
+        def worker(order):
+            for t in order:
+                if buffer.get_point_at_time(t).positions != expected[t]:
+                    errors.append(t)
+
+        threads = [threading.Thread(target=worker, args=(times[::step],)) for step in (1, -1, 3, -3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+
+    def test_empty_buffer(self):
+        """测试空缓冲区查询返回空"""
+        buffer = TrajectoryBuffer()
+        assert buffer.get_point_at_time(0.0) is None
+        assert not buffer.sample_state(0.0, np.empty((3, 10)))
+
+
+class _RecordingBus:
+    """记录发布消息的消息总线替身"""
+
+    def __init__(self):
+        self.published = []
+
+    def publish(self, topic, data, priority=None):
+        self.published.append((topic, data))
+
+
+class TestControlStep:
+    """控制步骤测试类"""
+
+    def test_published_point_matches_ring_sample(self):
+        """测试实时轨迹点直接取自本周期环形缓冲采样，与缓冲区插值结果一致"""
+        points = [TrajectoryPoint(0.1 * i, [float(i), float(2 * i)], [10.0, 20.0]) for i in range(101)]
+        interpolator = Interpolator()
+        interpolator.message_bus = _RecordingBus()
+        interpolator.publish_decimation = 1
+        assert interpolator.trajectory_buffer.add_trajectory(_make_trajectory(points, InterpolationType.LINEAR))
+        interpolator._pos_out = np.empty(2, dtype=np.int32)
+        interpolator._sample_ring = (np.zeros(_SAMPLE_RING_SIZE), np.zeros((_SAMPLE_RING_SIZE, 3, 2)))
+        interpolator.start_time = time.monotonic()
+
+        for _ in range(3):
+            interpolator._control_step()
+
+        published = [data for topic, data in interpolator.message_bus.published if topic == Topics.TRAJECTORY_POINT]
+        ring_t, ring_pva = interpolator.get_recent_samples(3)
+        assert len(published) == 3
+        for data, t, pva in zip(published, ring_t, ring_pva):
+            assert data['timestamp'] == t
+            assert [data['positions'], data['velocities'], data['accelerations']] == pva.tolist()
+            expected = interpolator.trajectory_buffer.get_point_at_time(t)
+            np.testing.assert_allclose(data['positions'], expected.positions)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
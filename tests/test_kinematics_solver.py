@@ -381,5 +381,138 @@ class TestKinematicsIntegration:
         pass
 
 
+
+# 空间构型（各关节扭角不同），避免平面模型下雅可比退化掩盖错误
+SPATIAL_CONFIG = {
+    'joints': [
+        {
+            'id': i,
+            'name': f'joint_{i}',
+            'dh_params': {
+                'd': 0.05 * (i % 3),
+                'a': 0.08 + 0.01 * i,
+                'alpha': [np.pi / 2, -np.pi / 2, 0.3][i % 3],
+                'theta': 0.1 * i
+            },
+            'limits': {
+                'min_position': 300,
+                'max_position': 2700
+            }
+        } for i in range(10)
+    ]
+}
+
+KERNEL_NAMES = ('fkine', 'fkine_batch', 'fk_jacobian', 'pose_error', 'ik_lm')
+
+
+@pytest.fixture(params=['np', 'jit'])
+def kernel_variant(request, monkeypatch):
+    """分别使用NumPy实现与编译实现（未安装numba时为未编译的同一代码）"""
+    from core import _kinematics_kernels
+    for name in KERNEL_NAMES:
+        monkeypatch.setattr(_kinematics_kernels, name, getattr(_kinematics_kernels, f'_{name}_{request.param}'))
+    return request.param
+
+
+@pytest.fixture(scope='module')
+def spatial_robot():
+    """真实的空间构型机器人模型（需要roboticstoolbox）"""
+    pytest.importorskip('roboticstoolbox')
+    from core.lazy_kinematics import get_roboticstoolbox, get_spatialmath
+    get_roboticstoolbox()
+    get_spatialmath()
+    return EvoBot10DOF(SPATIAL_CONFIG)
+
+
+def _random_configs(robot, count, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(robot.q_lo, robot.q_hi, (count, 10)) * 0.9
+
+
+class TestKinematicsKernels:
+    """运动学内核与roboticstoolbox结果对照测试"""
+    
+    def test_fkine_matches_rtb(self, spatial_robot, kernel_variant):
+        """测试正运动学与RTB fkine一致"""
+        for q in _random_configs(spatial_robot, 20):
+            expected = spatial_robot.robot.fkine(q).A
+            np.testing.assert_allclose(spatial_robot.fkine(q), expected, atol=1e-12)
+    
+    def test_fkine_batch_matches_single(self, spatial_robot, kernel_variant):
+        """测试批量正运动学与逐个计算一致"""
+        qs = _random_configs(spatial_robot, 20, seed=1)
+        batch = spatial_robot.fkine_batch(qs)
+        
+        assert batch.shape == (20, 4, 4)
+        for q, T in zip(qs, batch):
+            np.testing.assert_allclose(T, spatial_robot.robot.fkine(q).A, atol=1e-12)
+    
+    def test_jacobian_matches_rtb(self, spatial_robot, kernel_variant):
+        """测试解析雅可比与RTB jacob0一致"""
+        for q in _random_configs(spatial_robot, 20, seed=2):
+            T, J = spatial_robot.fk_and_jacobian(q)
+            np.testing.assert_allclose(T, spatial_robot.robot.fkine(q).A, atol=1e-12)
+            np.testing.assert_allclose(J, spatial_robot.robot.jacob0(q), atol=1e-12)
+    
+    def test_wrong_joint_count(self, spatial_robot):
+        """测试关节角度数量错误时拒绝计算"""
+        with pytest.raises(ValueError):
+            spatial_robot.fkine(np.zeros(9))
+        with pytest.raises(ValueError):
+            spatial_robot.fk_and_jacobian(np.zeros(11))
+    
+    def test_ik_lm_converges_within_limits(self, spatial_robot, kernel_variant):
+        """测试LM逆运动学收敛且解在关节限位内"""
+        rng = np.random.default_rng(3)
+        for q in _random_configs(spatial_robot, 10, seed=3):
+            T_target = spatial_robot.fkine(q)
+            q0 = q + rng.normal(0.0, 0.3, 10)
+            solution, success, _ = spatial_robot.ikine_lm(T_target, q0, 1e-2, 1e-12, 1e6, 2.0, 3.0, 100, 1e-10)
+            
+            assert success
+            assert np.all(solution >= spatial_robot.q_lo) and np.all(solution <= spatial_robot.q_hi)
+            np.testing.assert_allclose(spatial_robot.fkine(solution), T_target, atol=1e-4)
+    
+    def test_least_squares_converges(self, spatial_robot, kernel_variant):
+        """测试scipy有界逆运动学在扰动初值下收敛"""
+        rng = np.random.default_rng(4)
+        for q in _random_configs(spatial_robot, 15, seed=4):
+            T_target = spatial_robot.fkine(q)
+            q0 = q + rng.normal(0.0, 0.3, 10)
+            solution, success, _ = spatial_robot.ikine_least_squares(T_target, q0, 100, 1e-10)
+            
+            assert success
+            assert np.all(solution >= spatial_robot.q_lo) and np.all(solution <= spatial_robot.q_hi)
+            np.testing.assert_allclose(spatial_robot.fkine(solution), T_target, atol=1e-4)
+
+
+class TestInverseKinematicsBackends:
+    """逆运动学各后端经正运动学回代的往返测试"""
+    
+    @pytest.mark.parametrize('backend', ['lm', 'scipy', 'rtb'])
+    def test_ik_round_trip(self, spatial_robot, backend):
+        """测试逆运动学解经正运动学回代到达目标位姿"""
+        mock_manager = Mock()
+        mock_manager.load_config.return_value = {**SPATIAL_CONFIG, 'kinematics': {'ik_backend': backend}}
+        
+        with patch('core.kinematics_solver.get_config_manager', return_value=mock_manager):
+            solver = KinematicsSolver()
+            solver.forward_kinematics(np.zeros(10))
+        
+        assert solver.is_enabled()
+        assert solver.ik_backend == backend
+        
+        rng = np.random.default_rng(5)
+        for q in _random_configs(spatial_robot, 10, seed=5):
+            target = solver.forward_kinematics(q).end_effector_pose
+            q0 = np.clip(q + rng.normal(0.0, 0.2, 10), spatial_robot.q_lo, spatial_robot.q_hi)
+            result = solver.inverse_kinematics(target, q0.tolist())
+            
+            assert result.success, result.error_message
+            # 收敛判据为 0.5·|e|² < 1e-6，即位姿误差约在 1.4e-3 以内
+            reached = solver.forward_kinematics(result.joint_angles).end_effector_pose
+            np.testing.assert_allclose(reached.to_matrix(), target.to_matrix(), atol=2e-3)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""
+读写锁测试
+"""
+
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 添加src目录到Python路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.rwlock import RWLock
+
+
+def _start(target):
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+class TestRWLock:
+    """读写锁测试类"""
+
+    def setup_method(self):
+        """测试前设置"""
+        self.lock = RWLock()
+
+    def test_concurrent_readers(self):
+        """测试多个读者可同时持有读锁"""
+        readers = 4
+        barrier = threading.Barrier(readers, timeout=2.0)
+        errors = []
+
+        def reader():
+            with self.lock.gen_rlock():
+                try:
+                    # 所有读者都在读锁内时才能通过屏障
+                    barrier.wait()
+                except threading.BrokenBarrierError as e:
+                    errors.append(e)
+
+        threads = [_start(reader) for _ in range(readers)]
+        for thread in threads:
+            thread.join(timeout=5.0)
+
+        assert not errors
+
+    def test_writer_excludes_readers_and_writers(self):
+        """测试写者独占：持有写锁时读者与其他写者都需等待"""
+        entered = []
+
+        def reader():
+            with self.lock.gen_rlock():
+                entered.append('reader')
+
+        def writer():
+            with self.lock.gen_wlock():
+                entered.append('writer')
+
+        with self.lock.gen_wlock():
+            threads = [_start(reader), _start(writer)]
+            time.sleep(0.1)
+            assert entered == []
+
+        for thread in threads:
+            thread.join(timeout=2.0)
+        assert sorted(entered) == ['reader', 'writer']
+
+    def test_writer_waits_for_readers(self):
+        """测试写者等待已有读者全部释放"""
+        entered = threading.Event()
+
+        def writer():
+            with self.lock.gen_wlock():
+                entered.set()
+
+        self.lock.acquire_read()
+        thread = _start(writer)
+        assert not entered.wait(0.1)
+
+        self.lock.release_read()
+        thread.join(timeout=2.0)
+        assert entered.is_set()
+
+    def test_writer_preference(self):
+        """测试有写者等待时新读者让行，写者先于新读者获得锁"""
+        order = []
+
+        def writer():
+            with self.lock.gen_wlock():
+                order.append('writer')
+
+        def reader():
+            with self.lock.gen_rlock():
+                order.append('reader')
+
+        self.lock.acquire_read()
+        writer_thread = _start(writer)
+        # 等待写者进入等待状态
+        deadline = time.monotonic() + 2.0
+        while not self.lock._writers_waiting and time.monotonic() < deadline:
+            time.sleep(0.001)
+        assert self.lock._writers_waiting == 1
+
+        reader_thread = _start(reader)
+        time.sleep(0.1)
+        assert order == []
+
+        self.lock.release_read()
+        writer_thread.join(timeout=2.0)
+        reader_thread.join(timeout=2.0)
+        assert order == ['writer', 'reader']
+
+    def test_release_on_exception(self):
+        """测试with语句内抛出异常时锁被释放"""
+        with pytest.raises(RuntimeError):
+            with self.lock.gen_wlock():
+                raise RuntimeError("test")
+
+        acquired = threading.Event()
+        thread = _start(lambda: self.lock.acquire_read() or acquired.set())
+        thread.join(timeout=2.0)
+        assert acquired.is_set()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
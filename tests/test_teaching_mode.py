@@ -0,0 +1,138 @@
+"""
+示教序列测试
+"""
+
+import pytest
+import sys
+import time
+from pathlib import Path
+import numpy as np
+
+# 添加src目录到Python路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from application.teaching_mode import KeyFrame, TeachingModeManager, TeachingSequence
+from utils.message_bus import Message, Topics
+
+
+class TestTeachingSequenceNpz:
+    """示教序列NPZ格式测试类"""
+
+    def _make_sequence(self):
+        keyframes = [
+            KeyFrame(
+                timestamp=0.1 * i + 1e-9,
+                positions=[1500 + i] * 9 + [1234.5],
+                velocities=[12.3456789 * (i + 1)] * 10,
+                currents=[100 + i] * 9 + [99.75],
+                name=f"kf{i}",
+                teaching_mode="manual" if i % 2 else None
+            )
+            for i in range(5)
+        ]
+        return TeachingSequence(
+            name="seq",
+            description="测试序列",
+            keyframes=keyframes,
+            created_at=1.0,
+            modified_at=2.0,
+            metadata={"k": "v"}
+        )
+
+    def test_npz_round_trip_is_lossless(self, tmp_path):
+        """测试NPZ保存/加载无损往返"""
+        sequence = self._make_sequence()
+        # 触发连续存储构建，确认写出时不经过窄类型数组
+        sequence.velocities_array()
+
+        filepath = tmp_path / "seq.npz"
+        sequence.save_npz(filepath)
+        loaded = TeachingSequence.load_npz(filepath)
+
+        assert loaded.name == sequence.name
+        assert loaded.metadata == sequence.metadata
+        assert len(loaded.keyframes) == len(sequence.keyframes)
+        for original, restored in zip(sequence.keyframes, loaded.keyframes):
+            assert restored.timestamp == original.timestamp
+            assert restored.positions == original.positions
+            assert restored.velocities == original.velocities
+            assert restored.currents == original.currents
+            assert restored.name == original.name
+            assert restored.teaching_mode == original.teaching_mode
+
+    def test_npz_keeps_integer_channels_integer(self, tmp_path):
+        """测试整数位置/电流加载后仍为整数"""
+        sequence = self._make_sequence()
+        for kf in sequence.keyframes:
+            kf.positions = [1500] * 10
+            kf.currents = [100] * 10
+
+        filepath = tmp_path / "seq.npz"
+        sequence.save_npz(filepath)
+        loaded = TeachingSequence.load_npz(filepath)
+
+        assert all(type(v) is int for kf in loaded.keyframes for v in kf.positions + kf.currents)
+
+    def test_array_accessors_are_read_only(self):
+        """测试数组访问器返回只读视图，且不影响之后继续追加关键帧"""
+        sequence = self._make_sequence()
+        arrays = [sequence.timestamps_array(), sequence.positions_array(),
+                  sequence.velocities_array(), sequence.currents_array()]
+
+        for array in arrays:
+            with pytest.raises(ValueError):
+                array[0] = 0
+
+        sequence.record_state(1.0, np.full(10, 1600), np.zeros(10), np.zeros(10))
+        assert sequence.positions_array()[-1].tolist() == [1600] * 10
+        assert sequence.keyframes[0].positions == [1500] * 9 + [1234.5]
+
+
+class TestAutoRecordThreshold:
+    """自动录制变化阈值测试类"""
+
+    @pytest.fixture
+    def manager(self, tmp_path, monkeypatch):
+        # 序列目录按工作目录创建，切换到临时目录避免写入仓库
+        monkeypatch.chdir(tmp_path)
+        manager = TeachingModeManager()
+        manager.recording_interval = 0.0
+        yield manager
+        manager.message_bus.unsubscribe(Topics.ROBOT_STATE, manager._on_robot_state_update)
+
+    @staticmethod
+    def _feed(manager, positions):
+        joints = [{'id': i, 'position': int(p), 'velocity': 0.0, 'current': 0} for i, p in enumerate(positions)]
+        manager._on_robot_state_update(Message(Topics.ROBOT_STATE, {'joints': joints}, time.time()))
+
+    def _feed_jitter(self, manager, updates=200, amplitude=3):
+        """静止状态下各关节编码器在 ±amplitude 内抖动"""
+        rng = np.random.default_rng(0)
+        for _ in range(updates):
+            self._feed(manager, 1500 + rng.integers(-amplitude, amplitude + 1, 10))
+
+    def test_recording_ignores_jitter(self, manager):
+        """测试录制时静止抖动不累计，不录制新关键帧"""
+        assert manager.start_recording("seq")
+        self._feed_jitter(manager)
+        assert len(manager.current_sequence.keyframes) == 1
+
+        # 真实运动仍会触发录制
+        self._feed(manager, [1600] * 10)
+        assert len(manager.current_sequence.keyframes) == 2
+
+    def test_drag_ignores_jitter(self, manager):
+        """测试拖拽示教时激活关节的静止抖动不录制关键帧，非激活关节的运动也不触发录制"""
+        assert manager.start_drag_teaching("seq", active_joints=[0, 1])
+        self._feed_jitter(manager)
+        assert len(manager.current_sequence.keyframes) == 1
+
+        self._feed(manager, [1500, 1500] + [1800] * 8)
+        assert len(manager.current_sequence.keyframes) == 1
+
+        self._feed(manager, [1600, 1600] + [1800] * 8)
+        assert len(manager.current_sequence.keyframes) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
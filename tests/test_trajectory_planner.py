@@ -118,6 +118,36 @@ class TestTrajectoryPlanner:
         assert first_point.positions == waypoints[0]
         assert last_point.positions == waypoints[-1]
     
+    def test_multi_point_cubic_spline_natural(self):
+        """测试多点三次样条与自然边界三次样条一致"""
+        from scipy.interpolate import CubicSpline
+        
+        waypoints = [
+            [1500] * 10,
+            [2000] * 5 + [1200] * 5,
+            [1000] * 10,
+            [1800] * 5 + [1500] * 5,
+            [1500] * 10
+        ]
+        durations = [0.5, 0.8, 0.6, 1.0]
+        
+        trajectory = self.planner.plan_multi_point(
+            waypoints,
+            durations=durations,
+            interpolation_type=InterpolationType.NATURAL_SPLINE
+        )
+        
+        knots = np.concatenate(([0.0], np.cumsum(durations)))
+        reference = CubicSpline(knots, np.array(waypoints, dtype=float), bc_type='natural')
+        
+        times = np.array([point.timestamp for point in trajectory.points])
+        positions = np.array([point.positions for point in trajectory.points])
+        accelerations = np.array([point.accelerations for point in trajectory.points])
+        
+        assert times[-1] == pytest.approx(sum(durations))
+        assert np.allclose(positions, reference(times))
+        assert np.allclose(accelerations, reference(times, 2))
+    
     def test_trajectory_constraints(self):
         """测试轨迹约束"""
         constraints = TrajectoryConstraints(